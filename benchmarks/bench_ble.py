@@ -0,0 +1,72 @@
+"""
+BLE output throughput (frames/sec) for 40- and 80-cell display frames.
+No adapter needed: a fake GATT client models each write-without-response as taking
+`latency` seconds to be accepted by the link (roughly one connection event).
+It compares one write in flight at a time against pipelined windows, at the minimum
+MTU (23) and a typical negotiated one (185).
+Run: python benchmarks/bench_ble.py [seconds_per_case] [latency_ms]
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from unison_io_braille.ble_transport import BLETransport  # noqa: E402
+from unison_io_braille.drivers.encoding import CellReportEncoder  # noqa: E402
+from unison_io_braille.translator import cells_from_packed  # noqa: E402
+
+
+class LinkModel:
+    """Writes complete `latency` after issue; up to `slots` are accepted concurrently by the controller."""
+
+    def __init__(self, mtu: int, latency: float, slots: int = 8) -> None:
+        self.mtu_size = mtu
+        self.latency = latency
+        self.services = None
+        self._controller = asyncio.Semaphore(slots)
+
+    async def connect(self):
+        pass
+
+    async def disconnect(self):
+        pass
+
+    async def start_notify(self, uuid, callback):
+        pass
+
+    async def stop_notify(self, uuid):
+        pass
+
+    async def write_gatt_char(self, uuid, data, response=False):
+        async with self._controller:
+            await asyncio.sleep(self.latency)
+
+
+async def run_case(cells: int, mtu: int, window: int, seconds: float, latency: float) -> float:
+    frame = bytes(CellReportEncoder(0x08, cells).encode(cells_from_packed(bytes(range(cells)))))
+    transport = BLETransport(LinkModel(mtu, latency), window=window, notify_char=None)
+    await transport.open()
+    sent = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        await transport.send(frame)
+        sent += 1
+    await transport.drain()
+    return sent / (time.perf_counter() - start)
+
+
+def main() -> None:
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 2.0) / 1000
+    print(f"simulated write latency {latency * 1000:.1f} ms")
+    for cells in (40, 80):
+        for mtu in (23, 185):
+            results = {window: asyncio.run(run_case(cells, mtu, window, seconds, latency)) for window in (1, 4, 8)}
+            row = "  ".join(f"window={w}: {fps:7.1f} frames/s" for w, fps in results.items())
+            print(f"{cells:2d} cells  mtu={mtu:3d}  {row}")
+
+
+if __name__ == "__main__":
+    main()
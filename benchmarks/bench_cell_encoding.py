@@ -0,0 +1,56 @@
+"""
+Display frame encoding throughput (frames/sec) for an 80-cell display.
+
+Compares the shared CellReportEncoder (per-cell dots and pre-packed input)
+against the original per-driver bit loop. Run: python benchmarks/bench_cell_encoding.py
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from unison_io_braille.drivers.encoding import CellReportEncoder  # noqa: E402
+from unison_io_braille.interfaces import BrailleCells  # noqa: E402
+from unison_io_braille.translator_loader import TableTranslator  # noqa: E402
+
+
+def legacy_encode(cells: BrailleCells) -> bytes:
+    report = bytearray([0x08, len(cells.cells)])
+    report.append(0xFF if cells.cursor_position is None else int(cells.cursor_position))
+    for cell in cells.cells:
+        mask = 0
+        for i, v in enumerate(cell.dots):
+            if v:
+                mask |= 1 << i
+        report.append(mask)
+    return bytes(report)
+
+
+def rate(fn, cells: BrailleCells, seconds: float = 0.5) -> float:
+    n = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        for _ in range(100):
+            fn(cells)
+        n += 100
+    return n / (time.perf_counter() - start)
+
+
+def main() -> None:
+    text = ("the quick brown fox jumps over the lazy dog " * 2)[:80]
+    cells = TableTranslator("ueb_grade1").text_to_cells(text)
+    unpacked = BrailleCells(rows=cells.rows, cols=cells.cols, cells=cells.cells, cursor_position=cells.cursor_position)
+    encoder = CellReportEncoder(0x08, capacity=80)
+    assert legacy_encode(unpacked) == bytes(encoder.encode(cells)) == bytes(encoder.encode(unpacked))
+    legacy = rate(legacy_encode, unpacked)
+    dots = rate(encoder.encode, unpacked)
+    packed = rate(encoder.encode, cells)
+    print(f"80 cells  legacy {legacy:>12,.0f} f/s")
+    print(f"80 cells  dots   {dots:>12,.0f} f/s  ({dots / legacy:.1f}x)")
+    print(f"80 cells  packed {packed:>12,.0f} f/s  ({packed / legacy:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
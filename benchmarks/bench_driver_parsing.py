@@ -0,0 +1,72 @@
+"""
+Input-report parsing throughput (reports/sec) for the vendor drivers.
+
+Compares the table-driven parsing core against the original per-byte parser
+(inlined below as the baseline). Run: python benchmarks/bench_driver_parsing.py
+"""
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from unison_io_braille.drivers.focus import FocusBrailleDriver  # noqa: E402
+from unison_io_braille.drivers.handytech import HandyTechDriver  # noqa: E402
+from unison_io_braille.drivers.hims import HimsBrailleDriver  # noqa: E402
+from unison_io_braille.interfaces import BrailleEvent, DeviceInfo  # noqa: E402
+
+
+def legacy_parse(nav_map, chords: bool, device_id: str, report: bytes) -> List[BrailleEvent]:
+    if not report:
+        return []
+    report_id = report[0]
+    payload = report[1:] if len(report) > 1 else b""
+    events: List[BrailleEvent] = []
+    if report_id == 0x01:
+        for b in payload:
+            if b in nav_map:
+                etype, keys = nav_map[b]
+                events.append(BrailleEvent(type=etype, keys=list(keys), device_id=device_id))
+            elif chords and b & 0x80 and (b & 0x7F):
+                dots = [f"dot{i + 1}" for i in range(8) if (b & 0x7F) & (1 << i)]
+                events.append(BrailleEvent(type="chord", keys=dots, device_id=device_id))
+            elif 32 <= b <= 126:
+                events.append(BrailleEvent(type="text", keys=[], text=chr(b), device_id=device_id))
+    elif report_id == 0x02:
+        for idx in payload:
+            events.append(BrailleEvent(type="routing", keys=[f"cell-{idx}"], device_id=device_id))
+    return events
+
+
+REPORTS = [
+    bytes([0x01]) + b"hello world",
+    bytes([0x01, 0x0D, 0x8D, 0x83, 0x25]),
+    bytes([0x02, 3]),
+    bytes([0x02]) + bytes(range(40)),
+]
+
+
+def rate(fn, seconds: float = 0.5) -> float:
+    n = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        for r in REPORTS:
+            fn(r)
+        n += len(REPORTS)
+    return n / (time.perf_counter() - start)
+
+
+def main() -> None:
+    print(f"{'driver':<20}{'legacy r/s':>14}{'table r/s':>14}{'speedup':>10}")
+    for cls, chords in ((FocusBrailleDriver, True), (HandyTechDriver, False), (HimsBrailleDriver, False)):
+        drv = cls()
+        drv.open(DeviceInfo(id="bench", transport="usb"))
+        legacy = rate(lambda r: legacy_parse(cls.NAV_MAP, chords, "bench", r))
+        table = rate(drv.on_packet)
+        print(f"{cls.__name__:<20}{legacy:>14,.0f}{table:>14,.0f}{table / legacy:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+braille.input envelope construction + serialization throughput (envelopes/sec).
+  - legacy: nested dict, datetime.now().isoformat(), stdlib json (what httpx did)
+  - dict:   braille_input_event (cheap timestamp) + stdlib json
+  - fast:   encode_input_event (cached fragments, orjson/msgspec when installed)
+Run: python benchmarks/bench_envelopes.py
+"""
+import json
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from unison_io_braille import events  # noqa: E402
+from unison_io_braille.events import braille_input_event, encode_input_event  # noqa: E402
+from unison_io_braille.interfaces import BrailleEvent  # noqa: E402
+
+EVENTS = [
+    BrailleEvent(type="text", keys=(), text="a", device_id="focus-1"),
+    BrailleEvent(type="chord", keys=("dot1", "dot4", "dot5"), text=None, device_id="focus-1"),
+    BrailleEvent(type="routing", keys=("cell-12",), text=None, device_id="focus-1"),
+    BrailleEvent(type="nav", keys=("next",), text=None, device_id="focus-1"),
+]
+
+
+def legacy(evt: BrailleEvent, person_id: str) -> bytes:
+    env = {
+        "schema_version": "2.0",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "source": "unison-io-braille",
+        "event_type": "braille.input",
+        "intent": {
+            "type": "input.command",
+            "command": "braille",
+            "payload": {"keys": list(evt.keys), "text": evt.text, "event_type": evt.type},
+        },
+        "person": {"id": person_id} if person_id else None,
+        "auth_scope": "braille.input.read",
+        "metadata": {"device_id": evt.device_id},
+    }
+    return json.dumps(env).encode("utf-8")
+
+
+def via_dict(evt: BrailleEvent, person_id: str) -> bytes:
+    return json.dumps(braille_input_event(evt, person_id=person_id)).encode("utf-8")
+
+
+def bench(name: str, fn, seconds: float = 1.0) -> float:
+    n = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for evt in EVENTS:
+            fn(evt, "local-user")
+        n += len(EVENTS)
+    rate = n / (time.perf_counter() - start)
+    print(f"{name:<8} {rate:>12,.0f} envelopes/s")
+    return rate
+
+
+def main() -> None:
+    encoder = "orjson" if events.orjson else ("msgspec" if events.msgspec else "json")
+    print(f"encoder: {encoder}")
+    base = bench("legacy", legacy)
+    bench("dict", via_dict)
+    fast = bench("fast", encode_input_event)
+    print(f"speedup  {fast / base:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Renderer → display latency: POST /braille/focus over HTTP vs. the shared-memory framebuffer.
+One uvicorn server runs the service with a simulated 40-cell display attached.
+HTTP: a focus update's round trip (parse, translate, serialize, respond).
+Framebuffer: the time from a renderer's write to the frame reaching the display driver's writer.
+Run: python benchmarks/bench_framebuffer.py [frames]
+"""
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+os.environ["UNISON_BRAILLE_FRAMEBUFFER_DIR"] = tempfile.mkdtemp(prefix="braille-fb-")
+os.environ.setdefault("UNISON_BRAILLE_HOTPLUG", "false")
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+
+from unison_io_braille import server  # noqa: E402
+from unison_io_braille.framebuffer import FramebufferClient  # noqa: E402
+from unison_io_braille.translator_loader import get_translator  # noqa: E402
+
+HEADERS = {"X-Test-Bypass": "1"}
+
+
+class ArrivalWriter:
+    """Display writer that timestamps each frame it is handed."""
+
+    def __init__(self) -> None:
+        self.arrived = threading.Event()
+        self.at = 0.0
+
+    def write(self, data: bytes) -> None:
+        self.at = time.perf_counter()
+        self.arrived.set()
+
+
+def percentiles(samples):
+    samples.sort()
+    return statistics.median(samples), samples[max(0, int(len(samples) * 0.99) - 1)]
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    writer = ArrivalWriter()
+    server._manager.writer_factory = lambda device: writer
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    uv = uvicorn.Server(uvicorn.Config(server.app, log_level="warning"))
+    threading.Thread(target=uv.run, kwargs={"sockets": [sock]}, daemon=True).start()
+    while not uv.started:
+        time.sleep(0.01)
+    base = f"http://127.0.0.1:{port}"
+    texts = [f"line {i} of the focused document" for i in range(count)]
+    with httpx.Client(base_url=base, headers=HEADERS) as client:
+        attached = client.post("/braille/devices/attach", json={"device": {"id": "fb-1", "transport": "sim", "capabilities": {"driver_key": "focus-generic", "cells": 40}}}).json()
+        samples = []
+        for text in texts:
+            start = time.perf_counter()
+            client.post("/braille/focus", json={"text": text, "device_id": "fb-1"})
+            samples.append((time.perf_counter() - start) * 1e6)
+        http_p50, http_p99 = percentiles(samples)
+
+    translator = get_translator("ueb_grade1")
+    frames = [translator.text_to_cells(text).packed for text in texts]
+    samples = []
+    with FramebufferClient(attached["framebuffer"]) as fb:
+        for packed in frames:
+            writer.arrived.clear()
+            start = time.perf_counter()
+            fb.write(packed, cursor=0)
+            writer.arrived.wait(1.0)
+            samples.append((writer.at - start) * 1e6)
+    fb_p50, fb_p99 = percentiles(samples)
+    print(f"http POST /braille/focus    p50={http_p50:8.1f}us p99={http_p99:8.1f}us")
+    print(f"framebuffer write→driver   p50={fb_p50:8.1f}us p99={fb_p99:8.1f}us  (poll every {server._framebuffers.interval * 1000:.0f} ms)")
+    uv.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
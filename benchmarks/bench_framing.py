@@ -0,0 +1,98 @@
+"""
+Stream reassembly throughput (frames/sec) for each vendor's framing rule.
+A synthetic report stream is cut into random read-sized chunks (1..300 bytes, as
+serial reads and BLE notifications arrive) and reassembled by `FrameAssembler`
+and by a naive reassembler that appends to a bytearray and slices frames off the
+front as bytes.
+Run: python benchmarks/bench_framing.py [reports]
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from unison_io_braille.drivers.focus import FocusBrailleDriver  # noqa: E402
+from unison_io_braille.drivers.framing import Delimited, FrameAssembler, LengthPrefixed  # noqa: E402
+from unison_io_braille.drivers.handytech import HandyTechDriver  # noqa: E402
+from unison_io_braille.drivers.hims import HimsBrailleDriver  # noqa: E402
+
+
+def reports(rng: random.Random, count: int, fixed: bool):
+    out = []
+    for _ in range(count):
+        kind = rng.choice([0x01, 0x02, 0x03])
+        if kind == 0x03:
+            out.append(bytes([0x03, rng.randrange(256), rng.randrange(2)]))
+        elif fixed:
+            out.append(bytes([kind, rng.randrange(256)]))
+        else:
+            out.append(bytes([kind]) + bytes(rng.randrange(256) for _ in range(rng.randrange(1, 6))))
+    return out
+
+
+def encode(rule, report: bytes) -> bytes:
+    if isinstance(rule, LengthPrefixed):
+        return bytes([len(report)]) + report
+    if isinstance(rule, Delimited):
+        return rule.encode(report)
+    return report
+
+
+def chunks(rng: random.Random, data: bytes):
+    out, i = [], 0
+    while i < len(data):
+        n = rng.randint(1, 300)
+        out.append(data[i : i + n])
+        i += n
+    return out
+
+
+class NaiveAssembler:
+    """Accumulate into a bytearray, copy each frame out and delete it from the front."""
+
+    def __init__(self, rule) -> None:
+        self.rule = rule
+        self.buf = bytearray()
+
+    def feed(self, data: bytes):
+        buf = self.buf
+        buf += data
+        frames = []
+        while buf:
+            span = self.rule.next_frame(buf, 0, len(buf))
+            if span is None:
+                break
+            start, end, consumed = span
+            if end > start:
+                frame = bytes(buf[start:end])
+                frames.append(self.rule.unescape(memoryview(frame)) if isinstance(self.rule, Delimited) else frame)
+            del buf[:consumed]
+        return frames
+
+
+def run(assembler, parts) -> float:
+    start = time.perf_counter()
+    frames = 0
+    for part in parts:
+        for _ in assembler.feed(part):
+            frames += 1
+    return frames / (time.perf_counter() - start)
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    rng = random.Random(1)
+    print(f"{'driver':<20} {'rule':<15} {'naive':>12} {'ring':>12}  frames/sec")
+    for driver in (FocusBrailleDriver, HandyTechDriver, HimsBrailleDriver):
+        rule = driver.STREAM_FRAMING
+        stream = b"".join(encode(rule, r) for r in reports(rng, count, fixed=driver is FocusBrailleDriver))
+        parts = chunks(rng, stream)
+        naive = run(NaiveAssembler(rule), parts)
+        ring = run(FrameAssembler(rule), parts)
+        print(f"{driver.__name__:<20} {type(rule).__name__:<15} {naive:>12,.0f} {ring:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Driver throughput from packet traces (packets/sec), as-fast-as-possible replay.
+Without arguments a synthetic trace per vendor is generated with the load
+generator's report mix; pass recorded traces (UNISON_BRAILLE_TRACE_DIR) to
+replay those through the driver they were recorded with.
+Run: python benchmarks/bench_replay.py [trace.ubt ...]
+"""
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from unison_io_braille.driver_registry import BrailleDeviceDriverRegistry  # noqa: E402
+from unison_io_braille.interfaces import DeviceInfo  # noqa: E402
+from unison_io_braille.loadgen import VENDORS, vendor_packet  # noqa: E402
+from unison_io_braille.packet_trace import TraceReader, TraceWriter, replay  # noqa: E402
+
+PACKETS = 200_000
+
+
+def synthetic_traces(directory: Path):
+    rng = random.Random(3)
+    for key in VENDORS:
+        path = directory / f"{key}.ubt"
+        with TraceWriter(str(path), f"bench-{key}", key) as writer:
+            for _ in range(PACKETS):
+                writer.record(vendor_packet(key, rng))
+        yield str(path)
+
+
+def main() -> None:
+    registry = BrailleDeviceDriverRegistry()
+    paths = sys.argv[1:] or list(synthetic_traces(Path(tempfile.mkdtemp(prefix="braille-traces-"))))
+    for path in paths:
+        with TraceReader(path) as reader:
+            driver = registry.get(reader.driver or "generic-hid")()
+            driver.open(DeviceInfo(id=reader.device_id, transport="replay"))
+            stats = replay(reader, driver)
+            driver.close()
+        print(f"{reader.driver or '-':<14} {stats.packets:>8} packets {stats.events:>8} events  {stats.packets_per_second:>12,.0f} packets/s")
+
+
+if __name__ == "__main__":
+    main()
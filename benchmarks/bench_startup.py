@@ -0,0 +1,79 @@
+"""
+Service startup cost: `import unison_io_braille.server` time and time from
+process launch to the first successful `/health` response, each the median of
+several fresh interpreter runs. Exits non-zero when a median exceeds its
+threshold, so it can gate CI.
+Run: python benchmarks/bench_startup.py [--runs N] [--max-import-ms MS] [--max-health-ms MS]
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+ENV = {
+    **os.environ,
+    "PYTHONPATH": str(SRC),
+    "UNISON_BRAILLE_DISCOVERY_INTERVAL": "0",
+    "UNISON_BRAILLE_HOTPLUG": "false",
+}
+
+
+def import_ms() -> float:
+    code = "import time; t = time.perf_counter(); import unison_io_braille.server; print((time.perf_counter() - t) * 1000)"
+    out = subprocess.run([sys.executable, "-c", code], env=ENV, capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def first_health_ms() -> float:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "unison_io_braille.server"],
+        env={**ENV, "BRAILLE_PORT": str(port)},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        with httpx.Client(timeout=0.5) as client:
+            while True:
+                try:
+                    if client.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                        return (time.perf_counter() - start) * 1000
+                except httpx.HTTPError:
+                    pass
+                if proc.poll() is not None:
+                    raise RuntimeError("server exited during startup")
+                time.sleep(0.005)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-import-ms", type=float, default=1500.0)
+    parser.add_argument("--max-health-ms", type=float, default=3000.0)
+    args = parser.parse_args()
+    imports = [import_ms() for _ in range(args.runs)]
+    health = [first_health_ms() for _ in range(args.runs)]
+    failed = False
+    for name, samples, limit in (("import", imports, args.max_import_ms), ("first /health", health, args.max_health_ms)):
+        median = statistics.median(samples)
+        ok = median <= limit
+        failed |= not ok
+        print(f"{name:<14} median={median:8.1f}ms  min={min(samples):8.1f}ms  limit={limit:.0f}ms  {'ok' if ok else 'REGRESSION'}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Text → cells translation throughput (strings/sec), YAML tables vs. liblouis.
+
+The liblouis rows run only when the `louis` bindings are importable; pass
+--no-louis to force the YAML-only run. Includes the original per-call liblouis
+path (translate + nested 8-bit decode loop) as the baseline.
+Run: python benchmarks/bench_translation.py [--no-louis]
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from unison_io_braille import louis_backend  # noqa: E402
+from unison_io_braille.translator import _make_dots  # noqa: E402
+from unison_io_braille.translator_loader import TableTranslator  # noqa: E402
+
+TEXTS = ["OK", "Cancel", "Settings", "the quick brown fox jumps over the lazy dog", "Braille display connected: Focus 40 Blue"]
+
+
+def legacy_louis(table: str, text: str):
+    louis = louis_backend.louis
+    out = louis.translate([table], text, mode=louis.dotsIO)[0]
+    cells = []
+    for c in out:
+        code = ord(c)
+        bits = [i for i in range(1, 9) if code & (1 << (i - 1))]
+        cells.append(_make_dots(bits, 6))
+    return cells
+
+
+def rate(fn, seconds: float = 0.5) -> float:
+    n = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        for text in TEXTS:
+            fn(text)
+        n += len(TEXTS)
+    return n / (time.perf_counter() - start)
+
+
+def main() -> None:
+    use_louis = "--no-louis" not in sys.argv and louis_backend.available()
+    for table in ("ueb_grade1", "ueb_grade2"):
+        yaml_tr = TableTranslator(table, use_louis=False)
+        print(f"{table:<12} yaml              {rate(yaml_tr.text_to_cells):>12,.0f} str/s")
+        if not use_louis:
+            continue
+        louis_tr = TableTranslator(table)
+        if louis_tr._louis is None:
+            print(f"{table:<12} liblouis          table not available; skipped")
+            continue
+        louis_table = louis_tr._louis.tables[0]
+        print(f"{table:<12} liblouis legacy   {rate(lambda t: legacy_louis(louis_table, t)):>12,.0f} str/s")
+        print(f"{table:<12} liblouis packed   {rate(louis_tr.text_to_cells):>12,.0f} str/s")
+        batch_rate = rate(lambda t: louis_tr.translate_many(TEXTS))
+        print(f"{table:<12} liblouis batch    {batch_rate * len(TEXTS):>12,.0f} str/s")
+    if not use_louis:
+        print("liblouis not installed (or --no-louis): YAML path only")
+
+
+if __name__ == "__main__":
+    main()
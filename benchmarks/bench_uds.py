@@ -0,0 +1,70 @@
+"""
+Round-trip latency to a co-located peer: TCP loopback vs. Unix domain socket.
+One uvicorn server listens on both; requests go through the same pooled httpx
+clients `post_event` uses (POST /event) and a plain GET for the raw HTTP cost.
+Run: python benchmarks/bench_uds.py [requests]
+"""
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import uvicorn  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+from unison_io_braille.events import braille_input_event  # noqa: E402
+from unison_io_braille.interfaces import BrailleEvent  # noqa: E402
+from unison_io_braille.transport import _client, bind_unix_socket, orchestrator_url, post_event  # noqa: E402
+
+stub = FastAPI()
+
+
+@stub.get("/health")
+def health():
+    return {"status": "ok"}
+
+
+@stub.post("/event")
+def event(envelope: dict):
+    return {"accepted": True}
+
+
+def measure(fn, count: int):
+    for _ in range(20):
+        fn()
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return statistics.median(samples), samples[max(0, int(count * 0.99) - 1)]
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    tcp = socket.socket()
+    tcp.bind(("127.0.0.1", 0))
+    port = str(tcp.getsockname()[1])
+    path = str(Path(tempfile.mkdtemp(prefix="braille-uds-")) / "orch.sock")
+    server = uvicorn.Server(uvicorn.Config(stub, log_level="warning"))
+    threading.Thread(target=server.run, kwargs={"sockets": [tcp, bind_unix_socket(path)]}, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    envelope = braille_input_event(BrailleEvent(type="text", keys=(), text="a", device_id="bench"), person_id="bench")
+    for name, host in (("tcp", "127.0.0.1"), ("uds", f"unix://{path}")):
+        url, uds = orchestrator_url(host, port, "/health")
+        client = _client(uds)
+        get_p50, get_p99 = measure(lambda: client.get(url), count)
+        post_p50, post_p99 = measure(lambda: post_event(host, port, "/event", envelope), count)
+        print(f"{name}  GET /health p50={get_p50:7.1f}us p99={get_p99:7.1f}us   POST /event p50={post_p50:7.1f}us p99={post_p99:7.1f}us")
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Per-event orchestrator delivery latency: one POST /event per envelope vs. the
+streaming uplink, against a local stub orchestrator (FastAPI on uvicorn, which
+needs the `websockets` package for the stream endpoint).
+Latency is measured from submit to receipt by the stub; events are sent one at
+a time, like keypresses.
+Run: python benchmarks/bench_uplink.py [events]
+"""
+import asyncio
+import json
+import socket
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import uvicorn  # noqa: E402
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect  # noqa: E402
+
+from unison_io_braille.events import braille_input_event  # noqa: E402
+from unison_io_braille.interfaces import BrailleEvent  # noqa: E402
+from unison_io_braille.transport import post_event  # noqa: E402
+from unison_io_braille.uplink import EventUplink, websockets  # noqa: E402
+
+received = {}
+stub = FastAPI()
+
+
+@stub.post("/event")
+async def event(envelope: dict):
+    received[envelope["metadata"]["n"]] = time.perf_counter()
+    return {"ok": True}
+
+
+@stub.websocket("/event/stream")
+async def stream(ws: WebSocket):
+    await ws.accept()
+    acked = 0
+    try:
+        hello = json.loads(await ws.receive_text())
+        await ws.send_text(json.dumps({"op": "welcome", "acked": 0, "stream": hello["stream"]}))
+        while True:
+            msg = json.loads(await ws.receive_text())
+            received[msg["event"]["metadata"]["n"]] = time.perf_counter()
+            acked = msg["seq"]
+            await ws.send_text(json.dumps({"ack": acked}))
+    except WebSocketDisconnect:
+        pass
+
+
+def envelope(n: int) -> dict:
+    env = braille_input_event(BrailleEvent(type="text", keys=(), text="a", device_id="bench"), person_id="bench")
+    env["metadata"]["n"] = n
+    return env
+
+
+def report(name: str, submitted: dict) -> None:
+    lat = sorted((received[n] - t) * 1000 for n, t in submitted.items())
+    p99 = lat[max(0, int(len(lat) * 0.99) - 1)]
+    print(f"{name:<8} p50={statistics.median(lat):7.3f}ms  p99={p99:7.3f}ms  mean={statistics.fmean(lat):7.3f}ms")
+
+
+def bench_post(port: int, count: int) -> None:
+    received.clear()
+    submitted = {}
+    for n in range(count):
+        submitted[n] = time.perf_counter()
+        post_event("127.0.0.1", str(port), "/event", envelope(n))
+    report("post", submitted)
+
+
+async def bench_stream(port: int, count: int) -> None:
+    received.clear()
+    uplink = EventUplink(host="127.0.0.1", port=str(port), token=None)
+    await uplink.start()
+    while not uplink.connected:
+        await asyncio.sleep(0.01)
+    submitted = {}
+    for n in range(count):
+        submitted[n] = time.perf_counter()
+        uplink.submit(envelope(n))
+        while n not in received:
+            await asyncio.sleep(0)
+    await uplink.stop()
+    report("stream", submitted)
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(stub, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    bench_post(port, count)
+    if websockets is None:
+        print("stream   skipped (install `websockets`)")
+    else:
+        asyncio.run(bench_stream(port, count))
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
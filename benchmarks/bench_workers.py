@@ -0,0 +1,99 @@
+"""
+/braille/focus throughput with 1..N uvicorn workers sharing state over the
+Unix-socket broker. Each run starts a real server process, drives it with
+concurrent httpx clients, and checks that /metrics aggregates every worker.
+Run: python benchmarks/bench_workers.py [max_workers] [seconds] [concurrency]
+"""
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+TEXTS = ["OK", "Cancel", "Settings", "Open file", "Braille display connected"]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def drive(base: str, seconds: float, concurrency: int):
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + seconds
+
+    async def client(i: int) -> None:
+        nonlocal errors
+        async with httpx.AsyncClient(base_url=base, headers={"X-Test-Bypass": "1"}) as http:
+            n = i
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    resp = await http.post("/braille/focus", json={"text": TEXTS[n % len(TEXTS)], "table": "ueb_grade1"})
+                    resp.raise_for_status()
+                    latencies.append(time.perf_counter() - start)
+                except Exception:
+                    errors += 1
+                n += 1
+
+    await asyncio.gather(*(client(i) for i in range(concurrency)))
+    return latencies, errors
+
+
+def run(workers: int, seconds: float, concurrency: int) -> None:
+    port = free_port()
+    sock = os.path.join(tempfile.mkdtemp(prefix="braille-bench-"), "state.sock")
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(SRC),
+        "UNISON_BRAILLE_STATE_SOCKET": sock,
+        "UNISON_BRAILLE_STATE_METRICS_INTERVAL": "0.2",
+        "UNISON_BRAILLE_DISCOVERY_INTERVAL": "0",
+        "UNISON_BRAILLE_HOTPLUG": "false",
+        "UNISON_ORCH_HOST": "127.0.0.1",
+        "UNISON_ORCH_PORT": "9",
+    }
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "unison_io_braille.server:app", "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        env=env,
+    )
+    base = f"http://127.0.0.1:{port}"
+    try:
+        for _ in range(200):
+            try:
+                if httpx.get(f"{base}/health", timeout=0.5).status_code == 200:
+                    break
+            except httpx.HTTPError:
+                time.sleep(0.05)
+        time.sleep(0.5 * workers)  # let every worker connect to the broker
+        latencies, errors = asyncio.run(drive(base, seconds, concurrency))
+        time.sleep(0.5)
+        metrics = httpx.get(f"{base}/metrics", headers={"X-Test-Bypass": "1"}).json()
+        counted = sum(int(line.rsplit(" ", 1)[1]) for line in metrics.splitlines() if 'endpoint="/braille/focus"' in line)
+        p50 = statistics.median(latencies) * 1000
+        p99 = sorted(latencies)[int(len(latencies) * 0.99) - 1] * 1000
+        print(f"workers={workers:<3} {len(latencies) / seconds:>9,.0f} req/s  p50={p50:6.2f}ms  p99={p99:6.2f}ms  errors={errors}  metrics={counted}/{len(latencies)}")
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def main() -> None:
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 3.0
+    concurrency = int(sys.argv[3]) if len(sys.argv) > 3 else 32
+    for workers in range(1, max_workers + 1):
+        run(workers, seconds, concurrency)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,9 @@
+import asyncio
 import base64
 import json
 import time
 from typing import Set, Optional, Dict, Any
 
-import httpx
-from jose import jwt, jwk
-from jose.utils import base64url_decode
-
 from .settings import AUTH_JWKS_URL, AUTH_INTROSPECT_URL, AUTH_CLIENT_ID, AUTH_CLIENT_SECRET
 
 
@@ -15,6 +12,8 @@ class AuthValidator:
     Minimal auth/scope validator.
     Prefers JWT verification against JWKS if configured, otherwise falls back to
     introspection endpoint or scope string parsing. JWKS is cached with a short TTL.
+    httpx and python-jose are imported the first time they are needed, so
+    deployments without JWKS/introspection never load them.
     """
 
     def __init__(self, jwks: Optional[Dict[str, Any]] = None, jwks_url: str | None = AUTH_JWKS_URL, introspect_url: str | None = AUTH_INTROSPECT_URL) -> None:
@@ -72,6 +71,9 @@ class AuthValidator:
         if not self.jwks:
             return None
         try:
+            from jose import jwt, jwk
+            from jose.utils import base64url_decode
+
             header = jwt.get_unverified_header(token)
             kid = header.get("kid")
             alg = header.get("alg") or "RS256"
@@ -97,6 +99,8 @@ class AuthValidator:
             data["client_id"] = AUTH_CLIENT_ID
             data["client_secret"] = AUTH_CLIENT_SECRET
         try:
+            import httpx
+
             resp = httpx.post(self.introspect_url, data=data, timeout=2.0)
             if resp.status_code >= 200 and resp.status_code < 300:
                 body = resp.json()
@@ -120,6 +124,8 @@ class AuthValidator:
         if self.jwks_cached_at and (now - self.jwks_cached_at) < self.jwks_backoff_seconds and not self.jwks:
             return
         try:
+            import httpx
+
             resp = httpx.get(self.jwks_url, timeout=2.0)
             resp.raise_for_status()
             self.jwks = resp.json()
@@ -135,7 +141,7 @@ class AuthValidator:
         self._refreshing = True
         try:
             while True:
-                self._ensure_jwks()
+                await asyncio.to_thread(self._ensure_jwks)
                 await asyncio.sleep(self.jwks_ttl)
         finally:
             self._refreshing = False
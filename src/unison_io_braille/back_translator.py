@@ -0,0 +1,163 @@
+import threading
+import time
+from typing import Dict, Iterable, List, Mapping, Optional
+
+from .interfaces import BrailleEvent
+
+# "dot1".."dot8" → bit
+KEY_BITS: Dict[str, int] = {f"dot{i}": 1 << (i - 1) for i in range(1, 9)}
+
+
+def keys_to_mask(keys: Iterable[str]) -> int:
+    mask = 0
+    for key in keys:
+        mask |= KEY_BITS.get(key, 0)
+    return mask
+
+
+class _Node:
+    __slots__ = ("children", "text")
+
+    def __init__(self) -> None:
+        self.children: Dict[int, "_Node"] = {}
+        self.text: Optional[str] = None
+
+
+class ReverseTrie:
+    """Precompiled cell-sequence → text trie (cells as dot masks), for contractions spanning cells."""
+
+    def __init__(self, entries: Mapping[str, bytes]) -> None:
+        self.root = _Node()
+        self.depth = 0
+        for text, seq in entries.items():
+            if not seq:
+                continue
+            node = self.root
+            for mask in seq:
+                node = node.children.setdefault(mask, _Node())
+            node.text = text
+            self.depth = max(self.depth, len(seq))
+
+
+class IncrementalBackTranslator:
+    """
+    Back-translates one cell (chord) at a time.
+    Only the undecided tail is kept: a chord commits as soon as no longer
+    contraction can start with the pending cells, otherwise it waits for the next
+    chord (or `flush`). On a dead end the longest matching prefix is committed
+    and the rest re-read, so work per keystroke is bounded by the trie depth.
+    """
+
+    def __init__(self, trie: ReverseTrie, unknown: str = "?") -> None:
+        self.trie = trie
+        self.unknown = unknown
+        self._pending = bytearray()
+
+    @property
+    def pending(self) -> bytes:
+        return bytes(self._pending)
+
+    def feed(self, mask: int) -> str:
+        self._pending.append(mask & 0xFF)
+        return self._drain(final=False)
+
+    def feed_many(self, masks: Iterable[int]) -> str:
+        return "".join(self.feed(m) for m in masks) + self.flush()
+
+    def flush(self) -> str:
+        return self._drain(final=True)
+
+    def reset(self) -> None:
+        self._pending.clear()
+
+    def _drain(self, final: bool) -> str:
+        out: List[str] = []
+        pending = self._pending
+        root = self.trie.root
+        while pending:
+            node: Optional[_Node] = root
+            accept_len = 0
+            accept_text: Optional[str] = None
+            for i, mask in enumerate(pending):
+                node = node.children.get(mask)
+                if node is None:
+                    break
+                if node.text is not None:
+                    accept_len, accept_text = i + 1, node.text
+            if node is not None and node.children and not final:
+                break  # still a prefix of a longer contraction: wait
+            if accept_text is None:
+                out.append(self.unknown)
+                del pending[:1]
+            else:
+                out.append(accept_text)
+                del pending[:accept_len]
+        return "".join(out)
+
+
+class BackTranslationSessions:
+    """
+    Per-device incremental back-translation of chord events.
+    `process` passes events through and appends a `text` event whenever chords
+    commit text; a space chord (or HIMS-style `space` nav key) commits any pending
+    contraction first.
+    """
+
+    def __init__(self, trie_for, table_for) -> None:
+        self._trie_for = trie_for
+        self._table_for = table_for
+        self._states: Dict[str, IncrementalBackTranslator] = {}
+        self._tables: Dict[str, str] = {}
+        self._last_input: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _state(self, device_id: str) -> IncrementalBackTranslator:
+        table = self._table_for(device_id)
+        state = self._states.get(device_id)
+        if state is None or self._tables.get(device_id) != table:
+            state = IncrementalBackTranslator(self._trie_for(table))
+            self._states[device_id] = state
+            self._tables[device_id] = table
+        return state
+
+    def feed(self, device_id: str, mask: int) -> str:
+        with self._lock:
+            self._last_input[device_id] = time.monotonic()
+            return self._state(device_id).feed(mask)
+
+    def flush(self, device_id: str) -> str:
+        with self._lock:
+            state = self._states.get(device_id)
+            return state.flush() if state else ""
+
+    def flush_idle(self, idle_seconds: float) -> Dict[str, str]:
+        """Commit pending contractions for devices idle longer than `idle_seconds`."""
+        now = time.monotonic()
+        out: Dict[str, str] = {}
+        with self._lock:
+            for device_id, state in self._states.items():
+                if state.pending and now - self._last_input.get(device_id, now) >= idle_seconds:
+                    text = state.flush()
+                    if text:
+                        out[device_id] = text
+        return out
+
+    def forget(self, device_id: str) -> None:
+        with self._lock:
+            self._states.pop(device_id, None)
+            self._tables.pop(device_id, None)
+            self._last_input.pop(device_id, None)
+
+    def process(self, device_id: str, events: Iterable[BrailleEvent]) -> List[BrailleEvent]:
+        out: List[BrailleEvent] = []
+        for evt in events:
+            out.append(evt)
+            if evt.type == "chord" and "space" not in evt.keys:
+                text = self.feed(device_id, keys_to_mask(evt.keys))
+            elif evt.type == "nav" and tuple(evt.keys) == ("space",):
+                text = self.feed(device_id, 0)
+            else:
+                continue
+            if text:
+                out.append(BrailleEvent(type="text", keys=(), text=text, timestamp=evt.timestamp, device_id=device_id))
+        return out
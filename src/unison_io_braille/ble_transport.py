@@ -0,0 +1,261 @@
+import asyncio
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from .interfaces import DeviceInfo
+from .lazy import load_optional
+from .settings import BLE_CONNECT_TIMEOUT_SECONDS, BLE_WINDOW
+
+logger = logging.getLogger("unison-io-braille.ble")
+
+# Nordic UART Service, the serial-over-GATT profile most BLE displays expose.
+# Override per device with the `ble_write_char` / `ble_notify_char` capabilities.
+NUS_SERVICE = "6e400001-b5a3-f393-e0a9-e50e24dcca9e"
+NUS_RX = "6e400002-b5a3-f393-e0a9-e50e24dcca9e"  # central → display, write without response
+NUS_TX = "6e400003-b5a3-f393-e0a9-e50e24dcca9e"  # display → central, notifications
+ATT_HEADER = 3  # opcode + handle in every ATT write
+DEFAULT_MTU = 23  # the BLE minimum, until a larger one is negotiated
+
+
+def _bleak_client():
+    return load_optional(globals(), "BleakClient", "bleak", "BleakClient")
+
+
+def __getattr__(name: str):
+    if name == "BleakClient":
+        return _bleak_client()
+    raise AttributeError(name)
+
+
+def packetize(frame: bytes, size: int) -> List[memoryview]:
+    """Split a report into write-sized chunks (views into `frame`, no copies)."""
+    view = memoryview(frame)
+    return [view[i : i + size] for i in range(0, len(view), size)] or [view]
+
+
+class BLETransport:
+    """
+    GATT I/O for one display, on one asyncio loop.
+    `open` connects, sizes chunks from the negotiated MTU and subscribes to input
+    notifications. `send` splits a report into chunks and pipelines them as
+    writes without response, keeping at most `window` in flight; chunks are
+    issued strictly in order. Once a chunk fails, the rest of that frame is
+    skipped rather than sent as a torn frame.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        write_char: str = NUS_RX,
+        notify_char: str | None = NUS_TX,
+        window: int = BLE_WINDOW,
+        on_input: Callable[[bytes], None] | None = None,
+    ) -> None:
+        self.client = client
+        self.write_char = write_char
+        self.notify_char = notify_char
+        self.window = max(1, window)
+        self.on_input = on_input
+        self.chunk_size = DEFAULT_MTU - ATT_HEADER
+        self.stats = {"frames": 0, "chunks": 0, "failed": 0, "torn": 0, "notifications": 0}
+        self._slots: asyncio.Semaphore | None = None
+        self._inflight: Set[asyncio.Task] = set()  # the loop only keeps weak references
+
+    async def open(self, timeout: float = BLE_CONNECT_TIMEOUT_SECONDS) -> None:
+        self._slots = asyncio.Semaphore(self.window)
+        await asyncio.wait_for(self.client.connect(), timeout)
+        self.chunk_size = await self._negotiate_chunk_size()
+        if self.notify_char:
+            await self.client.start_notify(self.notify_char, self._notified)
+
+    async def _negotiate_chunk_size(self) -> int:
+        client = self.client
+        # BlueZ only learns the MTU once it is explicitly acquired.
+        acquire = getattr(getattr(client, "_backend", None), "_acquire_mtu", None)
+        if acquire:
+            try:
+                await acquire()
+            except Exception as exc:  # pragma: no cover
+                logger.debug("ble_mtu_acquire_failed %s", exc)
+        services = getattr(client, "services", None)
+        char = services.get_characteristic(self.write_char) if services is not None else None
+        size = getattr(char, "max_write_without_response_size", None)
+        if not size:
+            size = int(getattr(client, "mtu_size", None) or DEFAULT_MTU) - ATT_HEADER
+        return max(1, int(size))
+
+    def _notified(self, _sender: Any, data: bytearray) -> None:
+        self.stats["notifications"] += 1
+        if self.on_input:
+            try:
+                self.on_input(bytes(data))
+            except Exception as exc:
+                logger.warning("ble_input_failed %s", exc)
+
+    async def send(self, frame: bytes) -> None:
+        """Issue every chunk of `frame`; returns once the last chunk is in flight."""
+        slots = self._slots
+        loop = asyncio.get_running_loop()
+        torn = asyncio.Event()
+        for chunk in packetize(frame, self.chunk_size):
+            await slots.acquire()
+            if torn.is_set():
+                slots.release()
+                break
+            task = loop.create_task(self._write(chunk, torn))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+        self.stats["frames"] += 1
+
+    async def _write(self, chunk: memoryview, torn: asyncio.Event) -> None:
+        try:
+            if torn.is_set():
+                return  # an earlier chunk of this frame failed
+            await self.client.write_gatt_char(self.write_char, chunk, response=False)
+            self.stats["chunks"] += 1
+        except Exception as exc:
+            self.stats["failed"] += 1
+            if not torn.is_set():
+                self.stats["torn"] += 1
+                torn.set()
+            logger.warning("ble_write_failed %s", exc)
+        finally:
+            self._slots.release()
+
+    async def drain(self) -> None:
+        """Wait until no write is in flight."""
+        for _ in range(self.window):
+            await self._slots.acquire()
+        for _ in range(self.window):
+            self._slots.release()
+
+    async def close(self) -> None:
+        try:
+            if self._slots is not None:
+                await asyncio.wait_for(self.drain(), 2.0)
+            if self.notify_char:
+                await self.client.stop_notify(self.notify_char)
+        except Exception:
+            pass
+        try:
+            await self.client.disconnect()
+        except Exception:
+            pass
+
+
+class BLEWriter:
+    """
+    Output writer for a BLE display (the `write`/`write_async`/`close` shape of
+    `HIDWriter`), running its transport on a dedicated event-loop thread.
+    `write_async` keeps only the newest frame not yet sent: display frames
+    supersede each other, so a slow link skips stale frames instead of queueing.
+    """
+
+    def __init__(self, transport: BLETransport, name: str = "ble") -> None:
+        self.transport = transport
+        self.name = name
+        self.dropped = 0
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name=f"braille-ble-{name}", daemon=True)
+        self._thread.start()
+        self._pending: Optional[bytes] = None
+        self._sending = False
+        self._send_lock = asyncio.Lock()  # one frame's chunks at a time, from `write` or the pump
+        self._wake: asyncio.Event | None = None
+        self._pump: asyncio.Future | None = None
+
+    def open(self, timeout: float = BLE_CONNECT_TIMEOUT_SECONDS) -> None:
+        asyncio.run_coroutine_threadsafe(self.transport.open(timeout), self._loop).result(timeout + 1.0)
+        self._pump = asyncio.run_coroutine_threadsafe(self._run(), self._loop)
+
+    async def _run(self) -> None:
+        self._wake = asyncio.Event()
+        if self._pending is not None:
+            self._wake.set()
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            frame, self._pending = self._pending, None
+            if frame is not None:
+                self._sending = True
+                try:
+                    await self._send(frame)
+                finally:
+                    self._sending = False
+
+    async def _send(self, frame: bytes) -> None:
+        async with self._send_lock:
+            await self.transport.send(frame)
+
+    def _offer(self, data: bytes) -> None:
+        if self._pending is not None:
+            self.dropped += 1
+        self._pending = data
+        if self._wake is not None:
+            self._wake.set()
+
+    def write(self, data: bytes) -> None:
+        """Send one frame and wait until all its chunks are in flight."""
+        asyncio.run_coroutine_threadsafe(self._send(bytes(data)), self._loop).result(BLE_CONNECT_TIMEOUT_SECONDS)
+
+    def write_async(self, data: bytes) -> None:
+        if self._loop.is_closed():
+            logger.warning("ble_write_async_after_close %s", self.name)
+            return
+        self._loop.call_soon_threadsafe(self._offer, bytes(data))
+
+    def flush(self, timeout: float = 2.0) -> None:
+        """Wait for the pending frame and in-flight chunks (tests, benchmarks)."""
+
+        async def settle() -> None:
+            while self._pending is not None or self._sending:
+                await asyncio.sleep(0)
+            await self.transport.drain()
+
+        asyncio.run_coroutine_threadsafe(settle(), self._loop).result(timeout)
+
+    def close(self, timeout: float = 2.0) -> None:
+        if self._loop.is_closed():
+            return
+        if self._pump is not None:
+            self._pump.cancel()
+        try:
+            asyncio.run_coroutine_threadsafe(self.transport.close(), self._loop).result(timeout)
+        except Exception as exc:  # pragma: no cover
+            logger.warning("ble_close_failed %s %s", self.name, exc)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+        if not self._thread.is_alive():
+            self._loop.close()
+
+
+def open_ble_writer(
+    device: DeviceInfo,
+    on_input: Callable[[bytes], None] | None = None,
+    client_factory: Callable[[str], Any] | None = None,
+) -> Optional[BLEWriter]:
+    """Connect to a BLE display (id `bt:<address>`); None when bleak is missing or the connect fails."""
+    caps: Dict[str, Any] = device.capabilities or {}
+    address = caps.get("address") or (device.id[3:] if device.id.startswith("bt:") else device.id)
+    if client_factory is None:
+        BleakClient = _bleak_client()
+        if BleakClient is None:
+            logger.info("bleak_not_available; no BLE output for %s", device.id)
+            return None
+        client_factory = BleakClient
+    transport = BLETransport(
+        client_factory(address),
+        write_char=caps.get("ble_write_char") or NUS_RX,
+        notify_char=caps.get("ble_notify_char", NUS_TX),
+        window=int(caps.get("ble_window") or BLE_WINDOW),
+        on_input=on_input,
+    )
+    writer = BLEWriter(transport, name=address)
+    try:
+        writer.open()
+    except Exception as exc:
+        logger.warning("ble_open_failed %s %s", device.id, exc)
+        writer.close()
+        return None
+    return writer
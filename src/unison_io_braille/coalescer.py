@@ -0,0 +1,120 @@
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .interfaces import BrailleEvent
+from .settings import COALESCE_WINDOW_SECONDS
+
+# Events of the same kind within a window merge; None = never merged (chords, status).
+Signature = Optional[Tuple]
+
+
+def _signature(evt: BrailleEvent) -> Signature:
+    if evt.type == "nav":
+        return ("nav", tuple(evt.keys))
+    if evt.type in ("routing", "text"):
+        return (evt.type,)
+    return None
+
+
+@dataclass
+class _Lane:
+    signature: Signature = None
+    closes_at: float = 0.0
+    pending: Optional[BrailleEvent] = None
+
+
+class EventCoalescer:
+    """
+    Shrinks bursts of input events per device before they are forwarded.
+    The first event of a burst goes out immediately (no added latency); further
+    events of the same kind within `window` seconds are folded into one pending
+    event that is released when the window closes:
+      - identical nav presses (held keys) become one event with `repeat` = count;
+      - text characters are concatenated;
+      - routing presses (a sweep over the routing keys) keep only the latest.
+    Any other event, or a different kind, flushes the pending event first, so
+    order is preserved. A window that released something stays open for another
+    window, so a held key yields about one event per window. `flush` releases
+    windows that have closed; call it when `deadline` passes. `window=0` disables
+    coalescing. Thread-safe.
+    """
+
+    def __init__(self, window: float = COALESCE_WINDOW_SECONDS, clock: Callable[[], float] = time.monotonic) -> None:
+        self.window = window
+        self.clock = clock
+        self.stats = {"in": 0, "out": 0}
+        self._lanes: Dict[str, _Lane] = {}
+        self._lock = threading.Lock()
+
+    def push(self, device_id: str, events: List[BrailleEvent], now: float | None = None) -> List[BrailleEvent]:
+        """Coalesce one device's events; returns those to forward now."""
+        if self.window <= 0 or not events:
+            return events
+        now = self.clock() if now is None else now
+        out: List[BrailleEvent] = []
+        with self._lock:
+            lane = self._lanes.get(device_id)
+            if lane is None:
+                lane = self._lanes[device_id] = _Lane()
+            for evt in events:
+                signature = _signature(evt)
+                if signature is not None and signature == lane.signature:
+                    if now < lane.closes_at:
+                        lane.pending = self._merge(lane.pending, evt)
+                        continue
+                    if lane.pending is not None:
+                        # Window closed before the timer flushed it: same as a flush, then keep folding.
+                        self._release(lane, out)
+                        lane.pending, lane.closes_at = evt, now + self.window
+                        continue
+                self._release(lane, out)
+                out.append(evt)
+                if signature is None:
+                    lane.signature = None
+                else:
+                    lane.signature, lane.closes_at = signature, now + self.window
+            self.stats["in"] += len(events)
+            self.stats["out"] += len(out)
+        return out
+
+    @staticmethod
+    def _merge(pending: Optional[BrailleEvent], evt: BrailleEvent) -> BrailleEvent:
+        if pending is None:
+            return evt
+        if evt.type == "nav":
+            return replace(pending, repeat=pending.repeat + evt.repeat, timestamp=evt.timestamp)
+        if evt.type == "text":
+            return replace(pending, text=(pending.text or "") + (evt.text or ""), timestamp=evt.timestamp)
+        return evt  # routing: the later press supersedes the earlier one
+
+    @staticmethod
+    def _release(lane: _Lane, out: List[BrailleEvent]) -> None:
+        if lane.pending is not None:
+            out.append(lane.pending)
+            lane.pending = None
+
+    @property
+    def deadline(self) -> Optional[float]:
+        """When the earliest window with a pending event closes."""
+        with self._lock:
+            times = [lane.closes_at for lane in self._lanes.values() if lane.pending is not None]
+        return min(times) if times else None
+
+    def flush(self, now: float | None = None, force: bool = False) -> Dict[str, List[BrailleEvent]]:
+        """Release pending events whose window has closed (all of them with `force`)."""
+        now = self.clock() if now is None else now
+        out: Dict[str, List[BrailleEvent]] = {}
+        with self._lock:
+            for device_id, lane in list(self._lanes.items()):
+                if not force and now < lane.closes_at:
+                    continue
+                if lane.pending is None:
+                    del self._lanes[device_id]
+                    continue
+                out[device_id] = [lane.pending]
+                lane.pending = None
+                lane.closes_at = now + self.window
+                self.stats["out"] += 1
+        return out
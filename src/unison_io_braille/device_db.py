@@ -0,0 +1,84 @@
+import importlib.resources as pkg_resources
+import logging
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger("unison-io-braille.device_db")
+
+
+def _as_id(value: Any) -> Optional[int]:
+    """Normalize a VID/PID given as int or hex string ("0x05f3")."""
+    if value is None:
+        return None
+    if isinstance(value, int):
+        return value
+    return int(str(value), 16)
+
+
+@dataclass(frozen=True)
+class DeviceEntry:
+    driver_key: str
+    name: str | None = None
+    capabilities: Dict[str, int] = field(default_factory=dict)
+
+
+class DeviceDatabase:
+    """
+    USB device database indexed by (vid, pid) with a per-vendor fallback.
+    Lookups are two dict probes regardless of table size, so the data file can
+    grow to BRLTTY-scale without slowing enumeration.
+    """
+
+    def __init__(self, entries: Iterable[Dict[str, Any]] = ()) -> None:
+        self._products: Dict[Tuple[int, int], DeviceEntry] = {}
+        self._vendors: Dict[int, DeviceEntry] = {}
+        for raw in entries:
+            self.add(raw)
+
+    def add(self, raw: Dict[str, Any]) -> None:
+        vid = _as_id(raw.get("vid"))
+        if vid is None or not raw.get("driver"):
+            logger.warning("device_db_entry_skipped %s", raw)
+            return
+        caps = {k: int(raw[k]) for k in ("cells", "rows", "cols") if raw.get(k) is not None}
+        if "cells" in caps:
+            caps.setdefault("rows", 1)
+            caps.setdefault("cols", caps["cells"])
+        entry = DeviceEntry(driver_key=str(raw["driver"]), name=raw.get("name"), capabilities=caps)
+        pid = _as_id(raw.get("pid"))
+        if pid is None:
+            self._vendors[vid] = entry
+        else:
+            self._products[(vid, pid)] = entry
+
+    def lookup(self, vid: int | str | None, pid: int | str | None = None) -> Optional[DeviceEntry]:
+        vid_i = _as_id(vid)
+        if vid_i is None:
+            return None
+        pid_i = _as_id(pid)
+        if pid_i is not None:
+            entry = self._products.get((vid_i, pid_i))
+            if entry is not None:
+                return entry
+        return self._vendors.get(vid_i)
+
+    def __len__(self) -> int:
+        return len(self._products) + len(self._vendors)
+
+    @classmethod
+    def load(cls, name: str = "usb_devices") -> "DeviceDatabase":
+        """Load a bundled device data file by name."""
+        import yaml  # deferred: only needed on the first USB lookup
+
+        try:
+            with pkg_resources.files("unison_io_braille.data").joinpath(f"{name}.yaml").open("r", encoding="utf-8") as fh:
+                data = yaml.safe_load(fh) or {}
+        except FileNotFoundError:
+            data = {}
+        return cls(data.get("devices") or [])
+
+
+@lru_cache(maxsize=1)
+def default_database() -> DeviceDatabase:
+    return DeviceDatabase.load()
@@ -1,76 +1,64 @@
+import asyncio
 import logging
-from typing import Iterable, List, Tuple, Dict
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterable, List, Optional, Set, Tuple, Dict
 
+from .device_db import DeviceDatabase, default_database
+from .lazy import load_optional
 from .interfaces import DeviceInfo
+from .settings import DISCOVERY_INTERVAL_SECONDS, DISCOVERY_BT_TIMEOUT_SECONDS, DISCOVERY_BT_STALE_SECONDS
 
 logger = logging.getLogger("unison-io-braille.discovery")
 
-try:
-    import hid  # type: ignore
-except Exception:  # pragma: no cover
-    hid = None
-
-try:
-    from bleak import BleakScanner  # type: ignore
-except Exception:  # pragma: no cover
-    BleakScanner = None
-
-
-# Known VID/PID → driver key (placeholder; to be filled with real devices)
-KNOWN_USB_DEVICES: List[Tuple[str, str | None, str]] = [
-    # Freedom Scientific (Focus Blue line; sourced from public BRLTTY tables)
-    ("0x05f3", "0x0007", "focus-generic"),  # Focus 14 Blue (14 cells)
-    ("0x05f3", "0x0008", "focus-generic"),  # Focus 40 Blue
-    ("0x05f3", "0x0009", "focus-generic"),  # Focus 80 Blue
-    ("0x05f3", None, "focus-generic"),
-    # Handy Tech Elektronik (generic fallback)
-    ("0x1fe4", None, "handytech"),
-    # HIMS (various models)
-    ("0x2001", None, "hims"),
-    # HumanWare / Brailliant (treated as HandyTech-compatible for now)
-    ("0x1c71", None, "handytech"),
-]
-
-# Capability hints (cells, rows, columns) for known PIDs
-CAPABILITY_HINTS: Dict[str, Dict[str, int]] = {
-    "0x0007": {"cells": 14, "rows": 1, "cols": 14},
-    "0x0008": {"cells": 40, "rows": 1, "cols": 40},
-    "0x0009": {"cells": 80, "rows": 1, "cols": 80},
-    "0x1004": {"cells": 32, "rows": 1, "cols": 32},  # HandyTech 32 (example)
-    "0x2001": {"cells": 20, "rows": 1, "cols": 20},  # HIMS small display
-    "0x2002": {"cells": 32, "rows": 1, "cols": 32},  # HIMS 32
-    "0x2003": {"cells": 40, "rows": 1, "cols": 40},  # HIMS 40
-    "0x1c71": {"cells": 32, "rows": 1, "cols": 32},  # Brailliant BI 32
-}
-
-
-def enumerate_usb() -> Iterable[DeviceInfo]:
+
+# hidapi and bleak are imported on the first scan, not at service start.
+def _hid():
+    return load_optional(globals(), "hid", "hid")
+
+
+def _bleak_scanner():
+    return load_optional(globals(), "BleakScanner", "bleak", "BleakScanner")
+
+
+def __getattr__(name: str):
+    if name == "hid":
+        return _hid()
+    if name == "BleakScanner":
+        return _bleak_scanner()
+    raise AttributeError(name)
+
+
+def enumerate_usb(db: DeviceDatabase | None = None) -> Iterable[DeviceInfo]:
+    hid = _hid()
     if hid is None:
         logger.info("hidapi_not_available; skipping USB scan")
         return []
+    db = db or default_database()
     devices = []
     try:
         for d in hid.enumerate():  # type: ignore[attr-defined]
             vid = f"0x{d['vendor_id']:04x}"
             pid = f"0x{d['product_id']:04x}"
-            name = d.get("product_string") or "unknown"
-            key = next((k for v, p, k in KNOWN_USB_DEVICES if v == vid and (p is None or p == pid)), None)
-            caps = {"driver_key": key}
-            if pid in CAPABILITY_HINTS:
-                caps.update(CAPABILITY_HINTS[pid])
+            entry = db.lookup(d["vendor_id"], d["product_id"])
+            name = d.get("product_string") or (entry.name if entry else None) or "unknown"
+            caps: Dict[str, Any] = {"driver_key": entry.driver_key if entry else None}
+            if entry:
+                caps.update(entry.capabilities)
             devices.append(DeviceInfo(id=f"usb:{vid}:{pid}", transport="usb", vid=vid, pid=pid, name=name, capabilities=caps))
     except Exception as exc:  # pragma: no cover
         logger.warning("usb_scan_failed %s", exc)
     return devices
 
 
-async def enumerate_bluetooth() -> Iterable[DeviceInfo]:
+async def enumerate_bluetooth(timeout: float = 4.0) -> Iterable[DeviceInfo]:
+    BleakScanner = _bleak_scanner()
     if BleakScanner is None:
         logger.info("bleak_not_available; skipping BT scan")
         return []
     devices = []
     try:
-        found = await BleakScanner.discover(timeout=4.0)
+        found = await BleakScanner.discover(timeout=timeout)
         for d in found:
             key = None
             name = (d.name or "").lower()
@@ -84,3 +72,208 @@ async def enumerate_bluetooth() -> Iterable[DeviceInfo]:
     except Exception as exc:  # pragma: no cover
         logger.warning("bt_scan_failed %s", exc)
     return devices
+
+
+@dataclass
+class DiscoveredDevice:
+    device: DeviceInfo
+    first_seen: float
+    last_seen: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**self.device.__dict__, "first_seen": self.first_seen, "last_seen": self.last_seen}
+
+
+# (added, removed) device lists for one scan
+DiscoveryListener = Callable[[List[DeviceInfo], List[DeviceInfo]], Any]
+
+
+class DiscoveryService:
+    """
+    Background USB/Bluetooth discovery with a cached device table.
+    USB (blocking hidapi enumerate, run in a thread) and BT scans run concurrently
+    every `interval` seconds. Readers get the cached table instantly; `refresh`
+    forces a scan and `wait_for_change` long-polls on the table version.
+    USB entries drop as soon as a scan misses them; BT entries expire after
+    `bt_stale_after` seconds since BLE advertisements are easily missed.
+    """
+
+    def __init__(
+        self,
+        interval: float = DISCOVERY_INTERVAL_SECONDS,
+        bt_timeout: float = DISCOVERY_BT_TIMEOUT_SECONDS,
+        bt_stale_after: float = DISCOVERY_BT_STALE_SECONDS,
+        usb_scan: Callable[[], Iterable[DeviceInfo]] = enumerate_usb,
+        bt_scan: Callable[[float], Awaitable[Iterable[DeviceInfo]]] = enumerate_bluetooth,
+    ) -> None:
+        self.interval = interval
+        self.bt_timeout = bt_timeout
+        self.bt_stale_after = bt_stale_after
+        self._usb_scan = usb_scan
+        self._bt_scan = bt_scan
+        self._devices: Dict[str, DiscoveredDevice] = {}
+        self._listeners: List[DiscoveryListener] = []
+        self._task: Optional[asyncio.Task] = None
+        self._scan_lock: Optional[asyncio.Lock] = None
+        self._changed: Optional[asyncio.Condition] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Rescan queued while a scan was running: (transports, future of its result).
+        self._rescan: Optional[Tuple[Set[str], "asyncio.Future[bool]"]] = None
+        self.version = 0
+        self.scanned_at: float | None = None
+
+    def add_listener(self, listener: DiscoveryListener) -> None:
+        self._listeners.append(listener)
+
+    def devices(self) -> List[DeviceInfo]:
+        return [d.device for d in self._devices.values()]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "scanned_at": self.scanned_at,
+            "devices": [d.to_dict() for d in self._devices.values()],
+        }
+
+    def _primitives(self) -> Tuple[asyncio.Lock, asyncio.Condition]:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._scan_lock is None or self._changed is None:
+            self._loop = loop
+            self._scan_lock = asyncio.Lock()
+            self._changed = asyncio.Condition()
+            self._rescan = None
+        return self._scan_lock, self._changed
+
+    async def _scan_usb(self) -> List[DeviceInfo]:
+        return list(await asyncio.to_thread(self._usb_scan))
+
+    async def _scan_bt(self) -> List[DeviceInfo]:
+        return list(await self._bt_scan(self.bt_timeout))
+
+    async def _scan(self, transports: Set[str]) -> Tuple[List[DeviceInfo], List[DeviceInfo]]:
+        """Scan and merge under the scan lock; returns (added, removed)."""
+        scans = {}
+        if "usb" in transports:
+            scans["usb"] = self._scan_usb()
+        if "bt" in transports:
+            scans["bt"] = self._scan_bt()
+        results = dict(zip(scans, await asyncio.gather(*scans.values(), return_exceptions=True)))
+        now = time.time()
+        found: List[DeviceInfo] = []
+        scanned = set()
+        for transport, result in results.items():
+            if isinstance(result, BaseException):
+                if isinstance(result, asyncio.CancelledError):
+                    raise result
+                logger.warning("%s_scan_failed %s", transport, result)
+                continue
+            scanned.add(transport)
+            found.extend(result)
+        added: List[DeviceInfo] = []
+        for dev in found:
+            entry = self._devices.get(dev.id)
+            if entry is None:
+                self._devices[dev.id] = DiscoveredDevice(device=dev, first_seen=now, last_seen=now)
+                added.append(dev)
+            else:
+                entry.device = dev
+                entry.last_seen = now
+        seen = {d.id for d in found}
+        removed: List[DeviceInfo] = []
+        for dev_id, entry in list(self._devices.items()):
+            transport = entry.device.transport
+            if dev_id in seen or transport not in scanned:
+                continue
+            if transport == "bt" and now - entry.last_seen < self.bt_stale_after:
+                continue
+            removed.append(self._devices.pop(dev_id).device)
+        self.scanned_at = now
+        return added, removed
+
+    async def scan_once(self, usb: bool = True, bt: bool = True) -> bool:
+        """
+        Run one concurrent scan of the selected transports and merge it; returns True
+        if the table changed. Entries of a transport that was skipped or failed are kept.
+        A call that arrives while a scan is running may be reacting to a change that scan
+        already missed, so it queues one rescan after it, shared by every such caller,
+        and returns that rescan's result.
+        """
+        lock, _ = self._primitives()
+        requested = {t for t, on in (("usb", usb), ("bt", bt)) if on}
+        if not lock.locked():
+            async with lock:
+                added, removed = await self._scan(requested)
+            return await self._publish(added, removed)
+        if self._rescan is None:
+            self._rescan = (set(), asyncio.get_running_loop().create_future())
+        self._rescan[0].update(requested)
+        pending = self._rescan
+        async with lock:
+            run = self._rescan is pending
+            if run:
+                self._rescan = None
+                try:
+                    added, removed = await self._scan(pending[0])
+                except BaseException:
+                    pending[1].set_result(False)
+                    raise
+        if not run:
+            return await asyncio.shield(pending[1])  # another waiter ran the rescan
+        result = await self._publish(added, removed)
+        pending[1].set_result(result)
+        return result
+
+    async def _publish(self, added: List[DeviceInfo], removed: List[DeviceInfo]) -> bool:
+        """Bump the version and notify listeners of a merged scan; False if nothing changed."""
+        if not added and not removed:
+            return False
+        _, changed = self._primitives()
+        async with changed:
+            self.version += 1
+            changed.notify_all()
+        for listener in list(self._listeners):
+            try:
+                result = listener(added, removed)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as exc:  # pragma: no cover
+                logger.warning("discovery_listener_failed %s", exc)
+        return True
+
+    async def refresh(self) -> Dict[str, Any]:
+        """Force a scan now (after the one in flight, if any) and return the fresh snapshot."""
+        await self.scan_once()
+        return self.snapshot()
+
+    async def wait_for_change(self, since: int, timeout: float) -> bool:
+        """Long-poll until the table version moves past `since`; False on timeout."""
+        _, changed = self._primitives()
+        async with changed:
+            try:
+                await asyncio.wait_for(changed.wait_for(lambda: self.version > since), timeout)
+            except asyncio.TimeoutError:
+                return False
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.scan_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # pragma: no cover
+                logger.warning("discovery_scan_failed %s", exc)
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task:
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
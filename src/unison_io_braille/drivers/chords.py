@@ -0,0 +1,155 @@
+import time
+from dataclasses import replace
+from typing import Callable, Iterable, List, Optional, Set, Tuple
+
+from ..interfaces import BrailleEvent
+from ..settings import CHORD_HOLD_SECONDS, CHORD_REPEAT_DELAY_SECONDS, CHORD_REPEAT_INTERVAL_SECONDS
+from .parsing import DOT_KEYS
+
+SPACE = "space"
+# Key-state report shared by the vendor drivers: the full set of keys held right now.
+#   byte 0: report ID 0x03
+#   byte 1: dot mask (bit0=dot1 .. bit7=dot8)
+#   byte 2 (optional): bit0 = space
+KEY_STATE_REPORT = 0x03
+_DOT_ORDER = {key: i for i, key in enumerate(DOT_KEYS)}
+
+
+def chord_event(keys: Iterable[str], device_id: str | None = None) -> BrailleEvent:
+    """
+    Map a committed key set to an event: dots alone are a `chord`, space alone is
+    `nav` space (a word break), space plus dots is a `chord` with `space` in its keys
+    (a command, not text). Keys are ordered dot1..dot8, space, then others.
+    """
+    keys = set(keys)
+    dots = tuple(sorted((k for k in keys if k in _DOT_ORDER), key=_DOT_ORDER.__getitem__))
+    others = tuple(sorted(k for k in keys if k not in _DOT_ORDER and k != SPACE))
+    if SPACE in keys:
+        if not dots and not others:
+            return BrailleEvent(type="nav", keys=(SPACE,), device_id=device_id)
+        return BrailleEvent(type="chord", keys=dots + (SPACE,) + others, device_id=device_id)
+    return BrailleEvent(type="chord" if dots and not others else "nav", keys=dots + others, device_id=device_id)
+
+
+class ChordRecognizer:
+    """
+    Assembles chords from individual key press/release reports.
+    Keys pressed since the chord started accumulate; the chord is emitted at the
+    first release (from then on it can only shrink, so it is unambiguous) rather
+    than after all keys are up. Keys still held after that are ignored until
+    released; a new press starts the next chord. A chord held unchanged for
+    `hold_seconds` is emitted without waiting for a release and then autorepeats
+    every `repeat_interval` after `repeat_delay` while all its keys stay down.
+    Not thread-safe: drivers call it under their device lock. Timestamps come from
+    `clock` unless passed explicitly, so timing can be simulated in tests.
+    """
+
+    def __init__(
+        self,
+        device_id: str | None = None,
+        hold_seconds: float = CHORD_HOLD_SECONDS,
+        repeat_delay: float = CHORD_REPEAT_DELAY_SECONDS,
+        repeat_interval: float = CHORD_REPEAT_INTERVAL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.device_id = device_id
+        self.hold_seconds = hold_seconds
+        self.repeat_delay = repeat_delay
+        self.repeat_interval = repeat_interval
+        self.clock = clock
+        self._down: Set[str] = set()
+        self._chord: Set[str] = set()
+        self._committed = False
+        self._changed_at = 0.0
+        self._repeat: Optional[Tuple[float, BrailleEvent]] = None
+
+    def bind(self, device_id: str | None) -> None:
+        self.device_id = device_id
+        self.reset()
+
+    def reset(self) -> None:
+        self._down.clear()
+        self._chord.clear()
+        self._committed = False
+        self._repeat = None
+
+    @property
+    def held(self) -> Set[str]:
+        return set(self._down)
+
+    @property
+    def deadline(self) -> Optional[float]:
+        """When `poll` next has something to do (hold commit or autorepeat), if anything."""
+        if self._repeat is not None:
+            return self._repeat[0]
+        if self._chord and not self._committed:
+            return self._changed_at + self.hold_seconds
+        return None
+
+    def press(self, key: str, now: float | None = None) -> List[BrailleEvent]:
+        now = self.clock() if now is None else now
+        out = self.poll(now)
+        if key in self._down:
+            return out  # device-side autorepeat of a held key; our own timer handles repeats
+        if self._committed:
+            # Rolling input: the previous chord is done, leftovers stay excluded.
+            self._chord.clear()
+            self._committed = False
+            self._repeat = None
+        self._down.add(key)
+        self._chord.add(key)
+        self._changed_at = now
+        return out
+
+    def release(self, key: str, now: float | None = None) -> List[BrailleEvent]:
+        now = self.clock() if now is None else now
+        out = self.poll(now)
+        if key not in self._down:
+            return out
+        self._down.discard(key)
+        self._repeat = None
+        if not self._committed and key in self._chord:
+            out.append(self._commit())
+        if not self._down:
+            self._chord.clear()
+            self._committed = False
+        return out
+
+    def update(self, pressed: Iterable[str], now: float | None = None) -> List[BrailleEvent]:
+        """Apply a full key-state snapshot: releases first, then presses."""
+        now = self.clock() if now is None else now
+        pressed = set(pressed)
+        out: List[BrailleEvent] = []
+        for key in sorted(self._down - pressed):
+            out.extend(self.release(key, now))
+        for key in sorted(pressed - self._down):
+            out.extend(self.press(key, now))
+        return out or self.poll(now)
+
+    def on_report(self, data: bytes | bytearray | memoryview, now: float | None = None) -> List[BrailleEvent]:
+        """Parse a KEY_STATE_REPORT and feed it as a snapshot."""
+        dots = data[1] if len(data) > 1 else 0
+        pressed = [DOT_KEYS[i] for i in range(8) if dots & (1 << i)]
+        if len(data) > 2 and data[2] & 0x01:
+            pressed.append(SPACE)
+        return self.update(pressed, now)
+
+    def poll(self, now: float | None = None) -> List[BrailleEvent]:
+        """Emit hold-timeout commits and autorepeats that are due."""
+        now = self.clock() if now is None else now
+        if self._repeat is not None:
+            due, event = self._repeat
+            if now < due:
+                return []
+            following = due + self.repeat_interval
+            self._repeat = (following if following > now else now + self.repeat_interval, event)
+            return [replace(event)]
+        if self._chord and not self._committed and now - self._changed_at >= self.hold_seconds:
+            event = self._commit()
+            self._repeat = (now + self.repeat_delay, event)
+            return [event]
+        return []
+
+    def _commit(self) -> BrailleEvent:
+        self._committed = True
+        return chord_event(self._chord, self.device_id)
@@ -0,0 +1,75 @@
+from typing import Dict, Sequence, Tuple
+
+from ..interfaces import BrailleCells
+
+
+HEADER_SIZE = 3  # report id, cell count, cursor
+NO_CURSOR = 0xFF
+
+_BITS = tuple(1 << i for i in range(8))
+_MASK_CACHE: Dict[Tuple[bool, ...], int] = {}
+
+
+def dots_mask(dots: Sequence[bool]) -> int:
+    """Dot states → bitmask (bit0=dot1, bit7=dot8), cached per distinct pattern."""
+    key = tuple(dots)
+    mask = _MASK_CACHE.get(key)
+    if mask is None:
+        mask = 0
+        for i, v in enumerate(key[:8]):
+            if v:
+                mask |= _BITS[i]
+        _MASK_CACHE[key] = mask
+    return mask
+
+
+def pack_cells(cells: BrailleCells) -> bytes:
+    """One mask byte per cell; uses the translator's packed buffer when present."""
+    if cells.packed is not None:
+        return cells.packed
+    return bytes(dots_mask(cell.dots) for cell in cells.cells)
+
+
+class CellReportEncoder:
+    """
+    Encodes `BrailleCells` into the shared vendor display frame layout:
+      - Byte 0: report ID
+      - Byte 1: total cells
+      - Byte 2: cursor position (0-based) or 0xFF for none
+      - Bytes 3..N: per-cell dot bitmask
+    Frames are written into one preallocated buffer per device; the returned
+    memoryview is only valid until the next `encode` call.
+    """
+
+    def __init__(self, report_id: int, capacity: int = 80) -> None:
+        self.report_id = report_id
+        self._buf = bytearray(HEADER_SIZE + capacity)
+        self._buf[0] = report_id
+
+    @property
+    def capacity(self) -> int:
+        return len(self._buf) - HEADER_SIZE
+
+    def reserve(self, cells: int) -> None:
+        if cells > self.capacity:
+            # Replace rather than extend: a caller may still hold a view of the old frame.
+            buf = bytearray(HEADER_SIZE + cells)
+            buf[0] = self.report_id
+            self._buf = buf
+
+    def encode(self, cells: BrailleCells) -> memoryview:
+        packed = cells.packed
+        count = len(packed) if packed is not None else len(cells.cells)
+        self.reserve(count)
+        buf = self._buf
+        buf[1] = count
+        buf[2] = NO_CURSOR if cells.cursor_position is None else int(cells.cursor_position)
+        end = HEADER_SIZE + count
+        if packed is not None:
+            buf[HEADER_SIZE:end] = packed
+        else:
+            i = HEADER_SIZE
+            for cell in cells.cells:
+                buf[i] = dots_mask(cell.dots)
+                i += 1
+        return memoryview(buf)[:end]
@@ -1,6 +1,10 @@
-from typing import Iterable, List
+from typing import Iterable
 
 from ..interfaces import BrailleDeviceDriver, DeviceInfo, BrailleEvent, BrailleCells, BrailleCell
+from .chords import KEY_STATE_REPORT, ChordRecognizer
+from .encoding import CellReportEncoder
+from .framing import FixedSize
+from .parsing import DOT_KEYS, ROUTING_TABLE, ReportParser, key_table
 
 
 class FocusBrailleDriver(BrailleDeviceDriver):
@@ -9,8 +13,10 @@ class FocusBrailleDriver(BrailleDeviceDriver):
     Parses simple HID-like input reports:
       - Report ID 0x01, payload bytes representing keycodes.
       - Report ID 0x02, payload bytes representing routing key index.
+      - Report ID 0x03, key state (dot mask, space) assembled into chords.
       - ASCII range -> text events; bitmask -> chorded dot keys.
       - NAV_MAP for common navigation/panning keys.
+    On stream transports reports are fixed-size per report ID (one key per report).
     Extend with real report maps/output reports as specs become available.
     """
 
@@ -26,19 +32,32 @@ class FocusBrailleDriver(BrailleDeviceDriver):
         0x5D: ("nav", ["pan-right"]),
     }
 
-    DOT_KEYS = tuple(f"dot{i}" for i in range(1, 9))
+    DOT_KEYS = DOT_KEYS
+
+    REPORT_TABLES = {0x01: key_table(NAV_MAP, chords=True), 0x02: ROUTING_TABLE}
+
+    STREAM_FRAMING = FixedSize({0x01: 2, 0x02: 2, KEY_STATE_REPORT: 3})
 
     def __init__(self) -> None:
         self.device: DeviceInfo | None = None
-        self.last_output: bytes | None = None
+        # View of the encoder's frame buffer: valid until the next send_cells.
+        self.last_output: memoryview | None = None
         self.writer = None
+        self._parser = ReportParser(self.REPORT_TABLES)
+        self._chords = ChordRecognizer()
+        self._encoder = CellReportEncoder(0x08)
 
     def open(self, device: DeviceInfo) -> None:
         self.device = device
+        self._parser.bind(device.id)
+        self._chords.bind(device.id)
+        self._encoder.reserve(int((device.capabilities or {}).get("cells") or 0))
 
     def close(self) -> None:
         self.device = None
         self.writer = None
+        self._parser.bind(None)
+        self._chords.bind(None)
 
     def set_output_writer(self, writer) -> None:
         self.writer = writer
@@ -51,50 +70,25 @@ class FocusBrailleDriver(BrailleDeviceDriver):
           - Byte 2: cursor position (0-based) or 0xFF for none
           - Bytes 3..N: per-cell dot bitmask (bit0=dot1, bit7=dot8)
         """
-        report = bytearray()
-        report.append(0x08)
-        report.append(len(cells.cells))
-        cursor = 0xFF if cells.cursor_position is None else int(cells.cursor_position)
-        report.append(cursor)
-        for cell in cells.cells:
-            mask = 0
-            for i, v in enumerate(cell.dots):
-                if v:
-                    mask |= 1 << i
-            report.append(mask)
-        self.last_output = bytes(report)
+        self.last_output = self._encoder.encode(cells)
         if self.writer:
             # Prefer async writes to avoid blocking the event loop
             write = getattr(self.writer, "write_async", None) or getattr(self.writer, "write", None)
             if write:
                 write(self.last_output)
 
-    def _make_event(self, etype: str, keys: List[str], text: str | None = None) -> BrailleEvent:
-        return BrailleEvent(type=etype, keys=keys, text=text, device_id=self.device.id if self.device else None)
-
-    def _decode_dots(self, mask: int) -> List[str]:
-        return [self.DOT_KEYS[i] for i in range(8) if mask & (1 << i)]
-
     def _parse_report(self, report: bytes) -> Iterable[BrailleEvent]:
-        if not report:
-            return []
-        report_id = report[0]
-        payload = report[1:] if len(report) > 1 else b""
-        events: List[BrailleEvent] = []
-        if report_id == 0x01:
-            for b in payload:
-                if b in self.NAV_MAP:
-                    etype, keys = self.NAV_MAP[b]
-                    events.append(self._make_event(etype, list(keys)))
-                elif b & 0x80 and (b & 0x7F):  # high bit set -> chord mask, remaining bits = dots
-                    dots = self._decode_dots(b & 0x7F)
-                    events.append(self._make_event("chord", dots))
-                elif 32 <= b <= 126:
-                    events.append(self._make_event("text", [], text=chr(b)))
-        elif report_id == 0x02:
-            for idx in payload:
-                events.append(self._make_event("routing", [f"cell-{idx}"]))
-        return events
+        return self._parser.parse(report)
 
     def on_packet(self, data: bytes) -> Iterable[BrailleEvent]:
+        if data and data[0] == KEY_STATE_REPORT:
+            return self._chords.on_report(data)
         return self._parse_report(data)
+
+    def poll(self, now: float | None = None) -> Iterable[BrailleEvent]:
+        """Chords committed by hold timeout or autorepeat since the last report."""
+        return self._chords.poll(now)
+
+    @property
+    def input_deadline(self) -> float | None:
+        return self._chords.deadline
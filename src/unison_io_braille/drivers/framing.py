@@ -0,0 +1,163 @@
+from typing import Dict, Iterator, Mapping, Optional, Protocol, Tuple, Union
+
+# (frame start, frame end, next read position) within the assembler's buffer
+FrameSpan = Tuple[int, int, int]
+
+SLIP_END = 0xC0
+SLIP_ESC = 0xDB
+SLIP_ESC_END = 0xDC
+SLIP_ESC_ESC = 0xDD
+
+
+class FramingRule(Protocol):
+    """Finds the first complete frame in buf[start:stop]; None if more bytes are needed."""
+
+    def next_frame(self, buf: bytearray, start: int, stop: int) -> Optional[FrameSpan]: ...
+
+
+class FixedSize:
+    """
+    Fixed-size frames: either one size for every frame or a size per report ID
+    (first byte). An unknown report ID skips one byte to resynchronise.
+    """
+
+    def __init__(self, sizes: Union[int, Mapping[int, int]]) -> None:
+        self._size = sizes if isinstance(sizes, int) else 0
+        self._sizes = tuple((sizes.get(i, 0) if not isinstance(sizes, int) else sizes) for i in range(256))
+
+    def next_frame(self, buf: bytearray, start: int, stop: int) -> Optional[FrameSpan]:
+        size = self._size or self._sizes[buf[start]]
+        if not size:
+            return (start, start, start + 1)  # empty span: garbage byte
+        end = start + size
+        return (start, end, end) if end <= stop else None
+
+
+class LengthPrefixed:
+    """Frames preceded by their length (u8, or u16 little-endian); the prefix is not part of the frame."""
+
+    def __init__(self, length_size: int = 1) -> None:
+        if length_size not in (1, 2):
+            raise ValueError("length_size must be 1 or 2")
+        self.length_size = length_size
+
+    def next_frame(self, buf: bytearray, start: int, stop: int) -> Optional[FrameSpan]:
+        body = start + self.length_size
+        if body > stop:
+            return None
+        length = buf[start] if self.length_size == 1 else buf[start] | (buf[start + 1] << 8)
+        end = body + length
+        return (body, end, end) if end <= stop else None
+
+
+class Delimited:
+    """
+    Frames terminated by `end`. With `escape`, a frame may carry the end/escape
+    bytes as `escape` + code (`escapes` maps code → byte, SLIP by default); such
+    frames are unescaped into a copy, all others are returned in place.
+    """
+
+    def __init__(self, end: int = SLIP_END, escape: int | None = SLIP_ESC, escapes: Mapping[int, int] | None = None) -> None:
+        self.end = end
+        self.escape = escape
+        self.escapes: Dict[int, int] = dict(escapes or {SLIP_ESC_END: SLIP_END, SLIP_ESC_ESC: SLIP_ESC})
+
+    def next_frame(self, buf: bytearray, start: int, stop: int) -> Optional[FrameSpan]:
+        end = buf.find(self.end, start, stop)
+        if end < 0:
+            return None
+        return (start, end, end + 1)
+
+    def unescape(self, frame: memoryview) -> Union[memoryview, bytes]:
+        if self.escape is None or self.escape not in frame:
+            return frame
+        out = bytearray()
+        data = bytes(frame)
+        i = 0
+        while i < len(data):
+            b = data[i]
+            if b == self.escape and i + 1 < len(data):
+                i += 1
+                b = self.escapes.get(data[i], data[i])
+            out.append(b)
+            i += 1
+        return bytes(out)
+
+    def encode(self, frame: bytes) -> bytes:
+        """Escape and terminate one frame (for simulators and tests)."""
+        if self.escape is None:
+            return bytes(frame) + bytes([self.end])
+        codes = {byte: code for code, byte in self.escapes.items()}
+        out = bytearray()
+        for b in frame:
+            if b in codes:
+                out += bytes([self.escape, codes[b]])
+            else:
+                out.append(b)
+        out.append(self.end)
+        return bytes(out)
+
+
+class FrameAssembler:
+    """
+    Reassembles reports from a byte stream (serial ports, BLE notifications)
+    where one read may hold part of a report or several.
+    Incoming bytes are copied once into a fixed `capacity` buffer; `feed` yields
+    complete frames as memoryviews into it, with no per-frame copy. A frame is
+    only valid until the next one is requested, so consume (or copy) each as it
+    comes and exhaust the iterator. Consumed space is reclaimed by wrapping the
+    write position back to the start, moving at most one partial frame. A partial
+    frame that outgrows the buffer is discarded (`stats["overflows"]`).
+    """
+
+    def __init__(self, rule: FramingRule, capacity: int = 4096) -> None:
+        self.rule = rule
+        self.capacity = capacity
+        self.stats = {"frames": 0, "skipped": 0, "overflows": 0}
+        self._buf = bytearray(capacity)
+        self._view = memoryview(self._buf)
+        self._read = 0
+        self._write = 0
+        self._unescape = getattr(rule, "unescape", None)
+
+    @property
+    def pending(self) -> int:
+        return self._write - self._read
+
+    def reset(self) -> None:
+        self._read = self._write = 0
+
+    def feed(self, data: Union[bytes, bytearray, memoryview]) -> Iterator[Union[memoryview, bytes]]:
+        data = memoryview(data)
+        while data:
+            if self._read == self._write:
+                self._read = self._write = 0
+            elif self.capacity - self._write < len(data) and self._read:
+                # Wrap: move the partial frame (the only unconsumed bytes) to the front.
+                pending = self._write - self._read
+                self._buf[:pending] = self._view[self._read : self._write]
+                self._read, self._write = 0, pending
+            room = self.capacity - self._write
+            if not room:
+                self.stats["overflows"] += 1
+                self._read = self._write = 0
+                room = self.capacity
+            take = min(room, len(data))
+            self._buf[self._write : self._write + take] = data[:take]
+            self._write += take
+            data = data[take:]
+            yield from self._drain()
+
+    def _drain(self) -> Iterator[Union[memoryview, bytes]]:
+        buf, view, rule, unescape, stats = self._buf, self._view, self.rule, self._unescape, self.stats
+        while self._read < self._write:
+            span = rule.next_frame(buf, self._read, self._write)
+            if span is None:
+                break
+            start, end, self._read = span
+            if end > start:
+                stats["frames"] += 1
+                frame = view[start:end]
+                yield unescape(frame) if unescape else frame
+            else:
+                stats["skipped"] += 1
@@ -1,6 +1,10 @@
-from typing import Iterable, List
+from typing import Iterable
 
 from ..interfaces import BrailleDeviceDriver, DeviceInfo, BrailleEvent, BrailleCells
+from .chords import KEY_STATE_REPORT, ChordRecognizer
+from .encoding import CellReportEncoder
+from .framing import LengthPrefixed
+from .parsing import ROUTING_TABLE, ReportParser, key_table
 
 
 class HandyTechDriver(BrailleDeviceDriver):
@@ -9,6 +13,8 @@ class HandyTechDriver(BrailleDeviceDriver):
     Parses a lightweight packet format:
       - 0x01 -> key payload (ASCII or nav codes)
       - 0x02 -> routing key index
+      - 0x03 -> key state (dot mask, space), assembled into chords
+    On stream transports each report is preceded by its length byte.
     Real HandyTech protocols (HTCom) are richer; this provides a template for wiring.
     """
 
@@ -18,55 +24,51 @@ class HandyTechDriver(BrailleDeviceDriver):
         0x09: ("nav", ["tab"]),
     }
 
+    REPORT_TABLES = {0x01: key_table(NAV_MAP), 0x02: ROUTING_TABLE}
+
+    STREAM_FRAMING = LengthPrefixed()
+
     def __init__(self) -> None:
         self.device: DeviceInfo | None = None
-        self.last_output: bytes | None = None
+        # View of the encoder's frame buffer: valid until the next send_cells.
+        self.last_output: memoryview | None = None
         self.writer = None
+        self._parser = ReportParser(self.REPORT_TABLES)
+        self._chords = ChordRecognizer()
+        self._encoder = CellReportEncoder(0x20)
 
     def open(self, device: DeviceInfo) -> None:
         self.device = device
+        self._parser.bind(device.id)
+        self._chords.bind(device.id)
+        self._encoder.reserve(int((device.capabilities or {}).get("cells") or 0))
 
     def close(self) -> None:
         self.device = None
         self.writer = None
+        self._parser.bind(None)
+        self._chords.bind(None)
 
     def set_output_writer(self, writer) -> None:
         self.writer = writer
 
     def send_cells(self, cells: BrailleCells) -> None:
         # HandyTech displays accept dot bitmasks per cell; represent with report 0x20 as placeholder.
-        report = bytearray([0x20, len(cells.cells)])
-        cursor = 0xFF if cells.cursor_position is None else int(cells.cursor_position)
-        report.append(cursor)
-        for cell in cells.cells:
-            mask = 0
-            for i, v in enumerate(cell.dots):
-                if v:
-                    mask |= 1 << i
-            report.append(mask)
-        self.last_output = bytes(report)
+        self.last_output = self._encoder.encode(cells)
         if self.writer:
             write = getattr(self.writer, "write_async", None) or getattr(self.writer, "write", None)
             if write:
                 write(self.last_output)
 
-    def _make_event(self, etype: str, keys: List[str], text: str | None = None) -> BrailleEvent:
-        return BrailleEvent(type=etype, keys=keys, text=text, device_id=self.device.id if self.device else None)
-
     def on_packet(self, data: bytes) -> Iterable[BrailleEvent]:
-        if not data:
-            return []
-        report_id = data[0]
-        payload = data[1:]
-        events: List[BrailleEvent] = []
-        if report_id == 0x01:
-            for b in payload:
-                if b in self.NAV_MAP:
-                    etype, keys = self.NAV_MAP[b]
-                    events.append(self._make_event(etype, list(keys)))
-                elif 32 <= b <= 126:
-                    events.append(self._make_event("text", [], text=chr(b)))
-        elif report_id == 0x02:
-            for idx in payload:
-                events.append(self._make_event("routing", [f"cell-{idx}"]))
-        return events
+        if data and data[0] == KEY_STATE_REPORT:
+            return self._chords.on_report(data)
+        return self._parser.parse(data)
+
+    def poll(self, now: float | None = None) -> Iterable[BrailleEvent]:
+        """Chords committed by hold timeout or autorepeat since the last report."""
+        return self._chords.poll(now)
+
+    @property
+    def input_deadline(self) -> float | None:
+        return self._chords.deadline
@@ -0,0 +1,70 @@
+import sys
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from ..interfaces import BrailleEvent
+
+
+# (event type, keys, text)
+EventTemplate = Tuple[str, Tuple[str, ...], Optional[str]]
+DispatchTable = Tuple[Optional[EventTemplate], ...]
+
+NO_KEYS: Tuple[str, ...] = ()
+DOT_KEYS: Tuple[str, ...] = tuple(sys.intern(f"dot{i}") for i in range(1, 9))
+# Chord key tuples indexed by dot mask (bit0=dot1 .. bit7=dot8).
+CHORD_KEYS: Tuple[Tuple[str, ...], ...] = tuple(
+    tuple(DOT_KEYS[i] for i in range(8) if mask & (1 << i)) for mask in range(256)
+)
+# Routing key tuples indexed by cell number.
+ROUTING_KEYS: Tuple[Tuple[str, ...], ...] = tuple((sys.intern(f"cell-{i}"),) for i in range(256))
+
+
+def key_table(nav_map: Mapping[int, Tuple[str, Sequence[str]]], chords: bool = False) -> DispatchTable:
+    """
+    Build a key-report dispatch table.
+    Precedence matches the original drivers: nav codes, then chord masks (high bit
+    set, when enabled), then printable ASCII as text.
+    """
+    table: List[Optional[EventTemplate]] = [None] * 256
+    for b in range(256):
+        if b in nav_map:
+            etype, keys = nav_map[b]
+            table[b] = (sys.intern(etype), tuple(sys.intern(k) for k in keys), None)
+        elif chords and b & 0x80 and (b & 0x7F):
+            table[b] = ("chord", CHORD_KEYS[b & 0x7F], None)
+        elif 32 <= b <= 126:
+            table[b] = ("text", NO_KEYS, chr(b))
+    return tuple(table)
+
+
+ROUTING_TABLE: DispatchTable = tuple(("routing", ROUTING_KEYS[i], None) for i in range(256))
+
+
+class ReportParser:
+    """
+    Shared input-report parsing core for vendor drivers.
+    Drivers describe each report ID as a 256-entry table mapping a payload byte to
+    an immutable event template, so parsing is one lookup per byte over a
+    memoryview of the payload: no slice copies and no per-byte key list or string
+    construction. Each returned event is a fresh instance the caller may modify.
+    """
+
+    def __init__(self, tables: Mapping[int, DispatchTable]) -> None:
+        self._templates: Dict[int, DispatchTable] = dict(tables)
+        self.device_id: str | None = None
+
+    def bind(self, device_id: str | None) -> None:
+        """Set the device stamped on parsed events; call on open/close."""
+        self.device_id = device_id
+
+    def parse(self, data: bytes | bytearray | memoryview) -> List[BrailleEvent]:
+        if not data:
+            return []
+        table = self._templates.get(data[0])
+        if table is None:
+            return []
+        device_id = self.device_id
+        return [
+            BrailleEvent(type=t[0], keys=t[1], text=t[2], device_id=device_id)
+            for t in map(table.__getitem__, memoryview(data)[1:])
+            if t is not None
+        ]
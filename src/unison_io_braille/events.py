@@ -1,18 +1,93 @@
-from dataclasses import dataclass, asdict
-from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+import json
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
 
 from .interfaces import DeviceInfo, BrailleEvent
+from .lazy import load_optional
+
+
+def _orjson():
+    return load_optional(globals(), "orjson", "orjson")
+
+
+def _msgspec():
+    return load_optional(globals(), "msgspec", "msgspec")
+
+
+def __getattr__(name: str):
+    if name == "orjson":
+        return _orjson()
+    if name == "msgspec":
+        return _msgspec()
+    raise AttributeError(name)
+
+
+def _json_dumpb(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+_encoder: Optional[Callable[[Any], bytes]] = None
+
+
+def _dumpb(obj: Any) -> bytes:
+    """Compact UTF-8 JSON: orjson, else msgspec, else the stdlib (chosen on first use)."""
+    global _encoder
+    if _encoder is None:
+        orjson, msgspec = _orjson(), _msgspec()
+        if orjson is not None:
+            _encoder = orjson.dumps
+        elif msgspec is not None:  # pragma: no cover
+            _encoder = msgspec.json.encode
+        else:  # pragma: no cover
+            _encoder = _json_dumpb
+    return _encoder(obj)
+
+
+class _UtcClock:
+    """
+    ISO-8601 UTC timestamps from the monotonic clock, anchored to wall time.
+    The date/time prefix is formatted once per second; the anchor is re-read every
+    `resync` seconds so wall-clock adjustments are picked up.
+    """
+
+    def __init__(self, resync: float = 60.0) -> None:
+        self.resync = resync
+        self._anchor = (0.0, 0.0)  # (monotonic at sync, wall - monotonic)
+        self._second: Tuple[int, str] = (-1, "")
+        self._sync()
+
+    def _sync(self) -> None:
+        mono = time.monotonic()
+        self._anchor = (mono, time.time() - mono)
+
+    def iso(self) -> str:
+        mono = time.monotonic()
+        synced, offset = self._anchor
+        if mono - synced > self.resync:
+            self._sync()
+            synced, offset = self._anchor
+        wall = mono + offset
+        sec = int(wall)
+        second = self._second
+        if second[0] != sec:
+            second = self._second = (sec, time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec)))
+        return f"{second[1]}.{int((wall - sec) * 1_000_000):06d}+00:00"
+
+
+_clock = _UtcClock()
 
 
 def _ts() -> str:
-    return datetime.now(timezone.utc).isoformat()
+    return _clock.iso()
 
 
 @dataclass
 class CapsReport:
     person_id: str
     device: DeviceInfo
+    present: bool = True
 
     def to_envelope(self) -> Dict[str, Any]:
         return {
@@ -25,7 +100,7 @@ class CapsReport:
                 "person_id": self.person_id,
                 "caps": {
                     "braille_adapter": {
-                        "present": True,
+                        "present": self.present,
                         "transport": self.device.transport,
                         "vid": self.device.vid,
                         "pid": self.device.pid,
@@ -39,6 +114,9 @@ class CapsReport:
 
 def braille_input_event(evt: BrailleEvent, person_id: Optional[str] = None) -> Dict[str, Any]:
     """Map a BrailleEvent to a Unison EventEnvelope-like dict."""
+    payload: Dict[str, Any] = {"keys": list(evt.keys), "text": evt.text, "event_type": evt.type}
+    if evt.repeat > 1:
+        payload["repeat"] = evt.repeat
     return {
         "schema_version": "2.0",
         "timestamp": _ts(),
@@ -47,9 +125,56 @@ def braille_input_event(evt: BrailleEvent, person_id: Optional[str] = None) -> D
         "intent": {
             "type": "input.command",
             "command": "braille",
-            "payload": {"keys": list(evt.keys), "text": evt.text, "event_type": evt.type},
+            "payload": payload,
         },
         "person": {"id": person_id} if person_id else None,
         "auth_scope": "braille.input.read",
         "metadata": {"device_id": evt.device_id},
     }
+
+
+# Constant envelope fragments, serialized once.
+_INPUT_HEAD = b'{"schema_version":"2.0","timestamp":"'
+_INPUT_MID = (
+    b'","source":"unison-io-braille","event_type":"braille.input",'
+    b'"intent":{"type":"input.command","command":"braille","payload":{"keys":'
+)
+_INPUT_TAIL = b',"auth_scope":"braille.input.read","metadata":{"device_id":'
+
+
+@lru_cache(maxsize=4096)
+def _fragment(value: Any) -> bytes:
+    # Keys tuples, event types, person/device ids and single-character text repeat constantly.
+    return _dumpb(list(value) if isinstance(value, tuple) else value)
+
+
+def _text_fragment(text: Optional[str]) -> bytes:
+    return _fragment(text) if text is None or len(text) <= 16 else _dumpb(text)
+
+
+def encode_input_event(evt: BrailleEvent, person_id: Optional[str] = None) -> bytes:
+    """Serialized `braille_input_event(evt, person_id)`, built from cached fragments."""
+    person = b'{"id":' + _fragment(person_id) + b"}" if person_id else b"null"
+    return b"".join(
+        (
+            _INPUT_HEAD,
+            _clock.iso().encode("ascii"),
+            _INPUT_MID,
+            _fragment(tuple(evt.keys)),
+            b',"text":',
+            _text_fragment(evt.text),
+            b',"event_type":',
+            _fragment(evt.type),
+            b',"repeat":%d' % evt.repeat if evt.repeat > 1 else b"",
+            b'}},"person":',
+            person,
+            _INPUT_TAIL,
+            _fragment(evt.device_id),
+            b"}}",
+        )
+    )
+
+
+def encode_envelope(envelope: Dict[str, Any]) -> bytes:
+    """Serialize any envelope dict with the fastest available JSON encoder."""
+    return _dumpb(envelope)
@@ -0,0 +1,249 @@
+"""
+Shared-memory cell framebuffers for renderers on the same host.
+
+Each attached display gets a small memory-mapped file a local renderer writes
+cells into directly; the service watches its sequence counter and pushes
+changed frames to the driver, skipping HTTP, JSON and translation.
+
+File layout (little-endian, 32-byte header):
+  0  b"UBFB"           magic
+  4  u16 version
+  6  u16 capacity      cells allocated after the header
+  8  u32 sequence      odd while a frame is being written, even when stable
+  12 u16 cols, u16 rows
+  16 u16 cursor        0xFFFF = none
+  18 u16 length        cells in the current frame
+  32 capacity bytes    one dot mask per cell (bit0=dot1 .. bit7=dot8)
+
+Writers bump the sequence to odd, write, then bump it to the next even value
+(a seqlock); readers retry a frame whose sequence changed while they copied it.
+"""
+import asyncio
+import logging
+import mmap
+import os
+import struct
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from .interfaces import BrailleCells
+from .settings import FRAMEBUFFER_DIR, FRAMEBUFFER_POLL_SECONDS
+from .translator import cells_from_packed
+
+logger = logging.getLogger("unison-io-braille.framebuffer")
+
+MAGIC = b"UBFB"
+VERSION = 1
+HEADER_SIZE = 32
+NO_CURSOR = 0xFFFF
+_PREFIX = struct.Struct("<4sHH")
+_SEQ = struct.Struct("<I")
+_SEQ_OFFSET = 8
+_FRAME = struct.Struct("<HHHH")  # cols, rows, cursor, length
+_FRAME_OFFSET = 12
+
+
+class FramebufferError(ValueError):
+    pass
+
+
+@dataclass
+class Frame:
+    sequence: int
+    cells: bytes
+    cursor: Optional[int]
+    cols: int
+    rows: int
+
+    def to_cells(self, total_dots: int = 8) -> BrailleCells:
+        cells = cells_from_packed(self.cells, total_dots)
+        cells.cursor_position = self.cursor
+        cells.cols = self.cols or len(self.cells)
+        cells.rows = self.rows or 1
+        return cells
+
+
+def framebuffer_path(directory: str, device_id: str) -> str:
+    safe_id = "".join(c if c.isalnum() or c in "-_." else "_" for c in device_id)
+    return os.path.join(directory, f"{safe_id}.fb")
+
+
+def _map(path: str, capacity: int | None) -> mmap.mmap:
+    if capacity is not None:
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o660)
+        try:
+            os.ftruncate(fd, HEADER_SIZE + capacity)
+            mm = mmap.mmap(fd, HEADER_SIZE + capacity)
+        finally:
+            os.close(fd)
+        mm[:HEADER_SIZE] = bytes(HEADER_SIZE)
+        _PREFIX.pack_into(mm, 0, MAGIC, VERSION, capacity)
+        _FRAME.pack_into(mm, _FRAME_OFFSET, capacity, 1, NO_CURSOR, 0)
+        return mm
+    fd = os.open(path, os.O_RDWR)
+    try:
+        mm = mmap.mmap(fd, 0)
+    finally:
+        os.close(fd)
+    if len(mm) < HEADER_SIZE or mm[:4] != MAGIC:
+        mm.close()
+        raise FramebufferError(f"{path}: not a cell framebuffer")
+    _, version, capacity = _PREFIX.unpack_from(mm, 0)
+    if version != VERSION or len(mm) < HEADER_SIZE + capacity:
+        mm.close()
+        raise FramebufferError(f"{path}: unsupported framebuffer version {version}")
+    return mm
+
+
+class FramebufferClient:
+    """
+    Renderer side: write cells straight into a display's framebuffer.
+    `write` takes packed dot masks (e.g. `BrailleCells.packed` or
+    `translator.text_to_cells(text).packed`).
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._mm = _map(path, None)
+        self.capacity = _PREFIX.unpack_from(self._mm, 0)[2]
+
+    def write(self, cells: bytes, cursor: int | None = None, cols: int | None = None, rows: int = 1) -> int:
+        """Publish one frame (truncated to capacity); returns its sequence number."""
+        mm = self._mm
+        length = min(len(cells), self.capacity)
+        (seq,) = _SEQ.unpack_from(mm, _SEQ_OFFSET)
+        seq |= 1  # odd: frame in progress (also recovers from a writer that died mid-frame)
+        _SEQ.pack_into(mm, _SEQ_OFFSET, seq & 0xFFFFFFFF)
+        mm[HEADER_SIZE : HEADER_SIZE + length] = cells[:length]
+        _FRAME.pack_into(mm, _FRAME_OFFSET, cols or length, rows, NO_CURSOR if cursor is None else cursor, length)
+        seq = (seq + 1) & 0xFFFFFFFF
+        _SEQ.pack_into(mm, _SEQ_OFFSET, seq)
+        return seq
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __enter__(self) -> "FramebufferClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class Framebuffer:
+    """Service side of one display's framebuffer: creates the file and reads stable frames."""
+
+    def __init__(self, path: str, capacity: int) -> None:
+        self.path = path
+        self.capacity = capacity
+        self._mm = _map(path, capacity)
+        self.sequence = 0
+
+    @property
+    def changed(self) -> bool:
+        """A stable frame newer than the last poll is waiting (one 4-byte read)."""
+        (seq,) = _SEQ.unpack_from(self._mm, _SEQ_OFFSET)
+        return seq != self.sequence and not seq & 1
+
+    def poll(self) -> Optional[Frame]:
+        """The current frame if it changed since the last poll and is not mid-write."""
+        mm = self._mm
+        (seq,) = _SEQ.unpack_from(mm, _SEQ_OFFSET)
+        if seq == self.sequence or seq & 1:
+            return None
+        cols, rows, cursor, length = _FRAME.unpack_from(mm, _FRAME_OFFSET)
+        length = min(length, self.capacity)
+        cells = mm[HEADER_SIZE : HEADER_SIZE + length]
+        if _SEQ.unpack_from(mm, _SEQ_OFFSET)[0] != seq:
+            return None  # torn: the writer started the next frame while we copied
+        self.sequence = seq
+        return Frame(seq, cells, None if cursor == NO_CURSOR else cursor, cols, rows)
+
+    def close(self, unlink: bool = True) -> None:
+        self._mm.close()
+        if unlink:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+
+
+class FramebufferWatcher:
+    """
+    One framebuffer per attached display under `directory`. `run` polls every
+    sequence counter each `interval` seconds (a 4-byte read per display) and
+    passes changed frames to `send(device_id, cells)`, normally
+    `BrailleDeviceManager.send_cells`, from a worker thread: sending takes the
+    device lock and encodes the frame, which must not block the event loop.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        send: Callable[[str, BrailleCells], object],
+        interval: float = FRAMEBUFFER_POLL_SECONDS,
+    ) -> None:
+        self.directory = directory
+        self.send = send
+        self.interval = interval
+        self.stats = {"frames": 0, "errors": 0}
+        self._buffers: Dict[str, Framebuffer] = {}
+
+    def add(self, device_id: str, cells: int) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        path = framebuffer_path(self.directory, device_id)
+        previous = self._buffers.pop(device_id, None)
+        if previous:
+            previous.close(unlink=False)
+        self._buffers[device_id] = Framebuffer(path, max(1, cells))
+        return path
+
+    def remove(self, device_id: str) -> None:
+        fb = self._buffers.pop(device_id, None)
+        if fb:
+            fb.close()
+
+    def path_for(self, device_id: str) -> Optional[str]:
+        fb = self._buffers.get(device_id)
+        return fb.path if fb else None
+
+    def changed(self) -> List[str]:
+        """Devices whose framebuffer holds a new stable frame (sequence checks only)."""
+        return [device_id for device_id, fb in list(self._buffers.items()) if fb.changed]
+
+    def push(self, device_ids: List[str]) -> int:
+        """Read, decode and send the current frame of each device (blocking: takes the device lock)."""
+        pushed = 0
+        for device_id in device_ids:
+            fb = self._buffers.get(device_id)
+            try:
+                frame = fb.poll() if fb else None
+                if frame is None:
+                    continue
+                self.send(device_id, frame.to_cells())
+                pushed += 1
+            except Exception as exc:
+                self.stats["errors"] += 1
+                logger.warning("framebuffer_send_failed %s %s", device_id, exc)
+        self.stats["frames"] += pushed
+        return pushed
+
+    def poll_once(self) -> int:
+        return self.push(self.changed())
+
+    async def run(self) -> None:
+        """Check sequences on the loop; frames are read and sent from a worker thread."""
+        while True:
+            device_ids = self.changed()
+            if device_ids:
+                await asyncio.to_thread(self.push, device_ids)
+            await asyncio.sleep(self.interval)
+
+    def close(self) -> None:
+        for device_id in list(self._buffers):
+            self.remove(device_id)
+
+
+def open_watcher(send: Callable[[str, BrailleCells], object], directory: str | None = FRAMEBUFFER_DIR) -> Optional[FramebufferWatcher]:
+    """A watcher for the configured directory, or None when framebuffers are disabled."""
+    return FramebufferWatcher(directory, send) if directory else None
@@ -1,30 +1,38 @@
 from typing import Optional
 import logging
-import concurrent.futures
+import threading
 
-logger = logging.getLogger("unison-io-braille.hid_io")
+from .io_worker import DeviceIOWorker
+from .lazy import load_optional
 
-try:
-    import hid  # type: ignore
-except Exception:  # pragma: no cover
-    hid = None
+logger = logging.getLogger("unison-io-braille.hid_io")
 
 
-_EXECUTOR: concurrent.futures.ThreadPoolExecutor | None = None
+def _hid():
+    return load_optional(globals(), "hid", "hid")
 
 
-def _executor() -> concurrent.futures.ThreadPoolExecutor:
-    global _EXECUTOR
-    if _EXECUTOR is None:
-        _EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="hid-writer")
-    return _EXECUTOR
+def __getattr__(name: str):
+    if name == "hid":
+        return _hid()
+    raise AttributeError(name)
 
 
 class HIDWriter:
     """Thin wrapper around hid.Device for writing output reports."""
 
-    def __init__(self, dev) -> None:
+    def __init__(self, dev, name: str = "hid") -> None:
         self.dev = dev
+        self.name = name
+        self._worker: DeviceIOWorker | None = None
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def open(self) -> None:
+        """Start this device's I/O worker (once; not after close)."""
+        with self._lock:
+            if self._worker is None and not self._closed:
+                self._worker = DeviceIOWorker(self.write, name=self.name)
 
     def write(self, data: bytes) -> None:
         try:
@@ -34,13 +42,21 @@ class HIDWriter:
             logger.warning("hid_write_failed %s", exc)
 
     def write_async(self, data: bytes) -> None:
-        """Fire-and-forget write using a small threadpool to avoid blocking event loop."""
-        try:
-            _executor().submit(self.write, data)
-        except Exception as exc:  # pragma: no cover
-            logger.warning("hid_write_async_failed %s", exc)
+        """Queue a write on this device's own I/O worker to avoid blocking the event loop."""
+        if self._worker is None:
+            self.open()
+        worker = self._worker
+        # The driver reuses its frame buffer; the worker thread needs its own copy.
+        if self._closed or worker is None or not worker.submit(bytes(data)):
+            logger.warning("hid_write_async_after_close %s", self.name)
 
-    def close(self) -> None:
+    def close(self, timeout: float = 2.0) -> None:
+        with self._lock:
+            self._closed = True
+            worker = self._worker
+        if worker is not None:
+            if not worker.close(timeout):
+                logger.warning("hid_writer_wedged %s", self.name)
         try:
             self.dev.close()
         except Exception:
@@ -48,11 +64,16 @@ class HIDWriter:
 
 
 def open_hid_writer(vid_hex: str | None, pid_hex: str | None) -> Optional[HIDWriter]:
-    if hid is None or not vid_hex or not pid_hex:
+    if not vid_hex or not pid_hex:
+        return None
+    hid = _hid()
+    if hid is None:
         return None
     try:
-        dev = hid.Device(int(vid_hex, 16), int(pid_hex, 16))  # type: ignore[attr-defined]
-        return HIDWriter(dev)
+        dev = hid.Device(int(vid_hex, 16), int(pid_hex, 16))
+        writer = HIDWriter(dev, name=f"{vid_hex}:{pid_hex}")
+        writer.open()
+        return writer
     except Exception as exc:  # pragma: no cover
         logger.warning("hid_open_failed %s", exc)
         return None
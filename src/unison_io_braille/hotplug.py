@@ -0,0 +1,142 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from .discovery import DiscoveryService
+from .interfaces import DeviceInfo
+from .lazy import load_optional
+from .manager import BrailleDeviceManager
+from .settings import HOTPLUG_POLL_SECONDS
+
+logger = logging.getLogger("unison-io-braille.hotplug")
+
+
+def _pyudev():
+    return load_optional(globals(), "pyudev", "pyudev")
+
+
+def __getattr__(name: str):
+    if name == "pyudev":
+        return _pyudev()
+    raise AttributeError(name)
+
+
+class HotplugWatcher:
+    """
+    Attaches and detaches drivers through `BrailleDeviceManager` as known USB
+    displays come and go. Rides on `DiscoveryService` change notifications; when
+    pyudev is available, udev netlink events trigger an immediate USB rescan,
+    otherwise USB is polled (hidapi enumerate only, no BT scan) every `poll_interval`.
+    Only devices with a known driver key are attached automatically.
+    """
+
+    def __init__(
+        self,
+        manager: BrailleDeviceManager,
+        discovery: DiscoveryService,
+        poll_interval: float = HOTPLUG_POLL_SECONDS,
+        on_attach: Optional[Callable[[DeviceInfo], None]] = None,
+        on_detach: Optional[Callable[[str], None]] = None,
+        use_udev: bool = True,
+        claim: Optional[Callable[[DeviceInfo], Awaitable[bool]]] = None,
+        release: Optional[Callable[[str], Awaitable[None]]] = None,
+    ) -> None:
+        self.manager = manager
+        self.discovery = discovery
+        self.poll_interval = poll_interval
+        self.on_attach = on_attach
+        self.on_detach = on_detach
+        self.use_udev = use_udev  # pyudev is only imported when the watcher starts
+        # Optional ownership hooks so only one worker attaches a given device.
+        self.claim = claim
+        self.release = release
+        self.attached: Dict[str, DeviceInfo] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._observer = None
+        self._kick: Optional[asyncio.Event] = None
+        discovery.add_listener(self._on_change)
+
+    async def _on_change(self, added: List[DeviceInfo], removed: List[DeviceInfo]) -> None:
+        for dev in removed:
+            if dev.id in self.attached:
+                await asyncio.to_thread(self.manager.detach, dev.id)
+                self.attached.pop(dev.id, None)
+                if self.release:
+                    await self.release(dev.id)
+                logger.info("hotplug_detached %s", dev.id)
+                if self.on_detach:
+                    self.on_detach(dev.id)
+        for dev in added:
+            if dev.transport != "usb" or not (dev.capabilities or {}).get("driver_key") or dev.id in self.attached:
+                continue
+            if self.claim and not await self.claim(dev):
+                continue
+            try:
+                driver = await asyncio.to_thread(self.manager.attach, dev)
+            except Exception as exc:  # pragma: no cover
+                logger.warning("hotplug_attach_failed %s %s", dev.id, exc)
+                continue
+            if driver is None:
+                continue
+            self.attached[dev.id] = dev
+            logger.info("hotplug_attached %s", dev.id)
+            if self.on_attach:
+                self.on_attach(dev)
+
+    def _start_udev(self, loop: asyncio.AbstractEventLoop, kick: asyncio.Event) -> bool:
+        pyudev = _pyudev()
+        if pyudev is None:
+            return False
+        try:
+            context = pyudev.Context()
+            monitor = pyudev.Monitor.from_netlink(context)
+            monitor.filter_by(subsystem="hidraw")
+            monitor.filter_by(subsystem="usb")
+
+            def _event(device) -> None:
+                loop.call_soon_threadsafe(kick.set)
+
+            self._observer = pyudev.MonitorObserver(monitor, callback=_event, name="braille-udev")
+            self._observer.start()
+            return True
+        except Exception as exc:  # pragma: no cover
+            logger.warning("udev_monitor_unavailable %s; polling USB", exc)
+            return False
+
+    async def _run(self) -> None:
+        kick = self._kick
+        assert kick is not None
+        udev = self.use_udev and self._start_udev(asyncio.get_running_loop(), kick)
+        while True:
+            try:
+                # With udev, wake on events (plus a slow safety poll); otherwise poll.
+                await asyncio.wait_for(kick.wait(), self.poll_interval * (10 if udev else 1))
+            except asyncio.TimeoutError:
+                pass
+            kick.clear()
+            try:
+                await self.discovery.scan_once(usb=True, bt=False)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # pragma: no cover
+                logger.warning("hotplug_scan_failed %s", exc)
+
+    def start(self) -> None:
+        if self._task is None and self.poll_interval > 0:
+            self._kick = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if self._observer is not None:
+            try:
+                self._observer.stop()
+            except Exception:
+                pass
+            self._observer = None
+        if task:
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
@@ -0,0 +1,79 @@
+import struct
+from typing import Dict, Iterable, List, Tuple
+
+# Device-multiplexed packet batch (websocket binary frames, application/octet-stream bodies):
+#   repeated: u8 device-id length, device id (UTF-8), u16 LE packet length, packet bytes
+# Single-device batches (device id given out of band) omit the id: u16 LE length, packet.
+_LEN16 = struct.Struct("<H")
+
+Packet = Tuple[str, bytes]
+
+
+class BatchFormatError(ValueError):
+    pass
+
+
+def encode_batch(packets: Iterable[Packet]) -> bytes:
+    out = bytearray()
+    for device_id, packet in packets:
+        raw = device_id.encode("utf-8")
+        if len(raw) > 0xFF or len(packet) > 0xFFFF:
+            raise BatchFormatError("device id or packet too long")
+        out.append(len(raw))
+        out += raw
+        out += _LEN16.pack(len(packet))
+        out += packet
+    return bytes(out)
+
+
+def decode_batch(data: bytes) -> List[Packet]:
+    view = memoryview(data)
+    end = len(view)
+    pos = 0
+    out: List[Packet] = []
+    ids: Dict[bytes, str] = {}
+    while pos < end:
+        size = view[pos]
+        pos += 1
+        if pos + size + 2 > end:
+            raise BatchFormatError(f"truncated record at byte {pos - 1}")
+        raw = bytes(view[pos : pos + size])
+        device_id = ids.get(raw)
+        if device_id is None:
+            try:
+                device_id = ids[raw] = raw.decode("utf-8")
+            except UnicodeDecodeError:
+                raise BatchFormatError(f"device id at byte {pos - 1} is not UTF-8") from None
+        pos += size
+        (length,) = _LEN16.unpack_from(view, pos)
+        pos += 2
+        if pos + length > end:
+            raise BatchFormatError(f"truncated packet at byte {pos - 2}")
+        out.append((device_id, bytes(view[pos : pos + length])))
+        pos += length
+    return out
+
+
+def decode_device_batch(device_id: str, data: bytes) -> List[Packet]:
+    view = memoryview(data)
+    end = len(view)
+    pos = 0
+    out: List[Packet] = []
+    while pos < end:
+        if pos + 2 > end:
+            raise BatchFormatError(f"truncated record at byte {pos}")
+        (length,) = _LEN16.unpack_from(view, pos)
+        pos += 2
+        if pos + length > end:
+            raise BatchFormatError(f"truncated packet at byte {pos - 2}")
+        out.append((device_id, bytes(view[pos : pos + length])))
+        pos += length
+    return out
+
+
+def group_by_device(packets: Iterable[Packet]) -> Dict[str, List[bytes]]:
+    """Packets per device, order preserved within each device."""
+    grouped: Dict[str, List[bytes]] = {}
+    for device_id, packet in packets:
+        grouped.setdefault(device_id, []).append(packet)
+    return grouped
@@ -1,13 +1,27 @@
-from typing import Iterable
+from typing import Any, Callable, Iterable, Optional
 
-from .events import braille_input_event
+from .events import encode_input_event
 from .interfaces import BrailleEvent
 from .transport import post_event
 from .settings import ORCH_HOST, ORCH_PORT, DEFAULT_PERSON_ID, ORCH_AUTH_TOKEN
 
 
-def forward_events(events: Iterable[BrailleEvent]) -> None:
-    """Forward BrailleEvents to orchestrator as braille.input envelopes."""
+# Where serialized envelopes go; None posts each one to the orchestrator's /event.
+_sink: Optional[Callable[[bytes], Any]] = None
+
+
+def set_event_sink(sink: Optional[Callable[[bytes], Any]]) -> None:
+    """Route envelopes elsewhere (e.g. the streaming uplink); None restores per-event POSTs."""
+    global _sink
+    _sink = sink
+
+
+def forward_events(events: Iterable[BrailleEvent], person_id: str | None = None) -> None:
+    """Forward BrailleEvents to orchestrator as braille.input envelopes on behalf of `person_id`."""
+    person_id = person_id or DEFAULT_PERSON_ID
     for evt in events:
-        envelope = braille_input_event(evt, person_id=DEFAULT_PERSON_ID)
+        envelope = encode_input_event(evt, person_id=person_id)
+        if _sink is not None:
+            _sink(envelope)
+            continue
         post_event(ORCH_HOST, ORCH_PORT, "/event", envelope, token=ORCH_AUTH_TOKEN)
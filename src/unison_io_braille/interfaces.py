@@ -14,6 +14,9 @@ class BrailleCells:
     cells: Sequence[BrailleCell]
     cursor_position: Optional[int] = None  # index into cells
     metadata: Dict[str, Any] | None = None
+    # One dot bitmask byte per cell (bit0=dot1), when the producer has it. A snapshot
+    # derived from `cells` at construction: reset it to None after mutating `cells`.
+    packed: bytes | None = None
 
 
 @dataclass
@@ -23,6 +26,7 @@ class BrailleEvent:
     text: Optional[str] = None
     timestamp: float | None = None
     device_id: str | None = None
+    repeat: int = 1  # >1 when identical presses were coalesced into this event
 
 
 @dataclass
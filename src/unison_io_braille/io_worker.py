@@ -0,0 +1,80 @@
+import logging
+import queue
+import threading
+from typing import Callable
+
+from .settings import IO_QUEUE_SIZE
+
+logger = logging.getLogger("unison-io-braille.io_worker")
+
+_STOP = object()
+
+
+class DeviceIOWorker:
+    """
+    Dedicated writer thread for one device.
+    Writes are serialized in submission order through a bounded queue, so a slow
+    or wedged device only backs up its own queue. When the queue is full the
+    oldest pending report is dropped: display frames supersede each other, and
+    the newest state must not wait behind stale ones.
+    """
+
+    def __init__(self, write: Callable[[bytes], None], name: str = "device", maxsize: int = IO_QUEUE_SIZE) -> None:
+        self._write = write
+        self._queue: "queue.Queue[object]" = queue.Queue(maxsize=max(1, maxsize))
+        self._closed = False
+        self._lock = threading.Lock()
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self._thread = threading.Thread(target=self._run, name=f"braille-io-{name}", daemon=True)
+        self._thread.start()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, data: bytes) -> bool:
+        """Queue a report without blocking; False once the worker is closed."""
+        with self._lock:
+            if self._closed:
+                return False
+            while True:
+                try:
+                    self._queue.put_nowait(data)
+                    return True
+                except queue.Full:
+                    try:
+                        self._queue.get_nowait()
+                        self.dropped += 1
+                    except queue.Empty:
+                        pass
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            try:
+                self._write(item)  # type: ignore[arg-type]
+                self.written += 1
+            except Exception as exc:  # pragma: no cover
+                self.failed += 1
+                logger.warning("device_write_failed %s", exc)
+
+    def close(self, timeout: float = 2.0) -> bool:
+        """Stop accepting writes, flush what is queued, and join; False if the device stayed wedged."""
+        with self._lock:
+            if self._closed:
+                return not self._thread.is_alive()
+            self._closed = True
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return False
+        if threading.current_thread() is not self._thread:
+            self._thread.join(timeout)
+        return not self._thread.is_alive()
@@ -0,0 +1,24 @@
+import importlib
+from typing import Any, Dict
+
+_MISSING = object()
+
+
+def load_optional(namespace: Dict[str, Any], name: str, module: str, member: str | None = None) -> Any:
+    """
+    Resolve an optional dependency kept as a module global on first use.
+    The import (or None when it is unavailable) is stored under `name` in the
+    caller's globals, so later calls are a dict lookup and tests can still patch
+    the global directly. Pair with a module-level `__getattr__` so
+    `module.<name>` keeps working for callers outside the module.
+    """
+    value = namespace.get(name, _MISSING)
+    if value is _MISSING:
+        try:
+            value = importlib.import_module(module)
+            if member:
+                value = getattr(value, member)
+        except Exception:
+            value = None
+        namespace[name] = value
+    return value
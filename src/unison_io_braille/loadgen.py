@@ -0,0 +1,345 @@
+"""
+Load generator: a fleet of simulated Braille displays driving the service.
+
+Each simulated device is attached with a vendor driver (sim, Focus, HandyTech,
+HIMS) and sends that vendor's input reports (0x01 keys/nav/chords, 0x02 routing,
+0x03 key state) base64-encoded to `/braille/input` at a fixed keystroke rate, while focus updates go to
+`/braille/focus` and every device's session is watched over `/braille/output`
+(websocket delivery is measured when the `websockets` package is installed).
+By default the service is started as a subprocess and pointed at a built-in stub
+orchestrator, so no hardware or other services are needed. Requests carry
+`X-Test-Bypass` only against that spawned service (or with `--test-bypass`);
+pass `--token` to exercise auth on a real deployment.
+
+Run: python -m unison_io_braille.loadgen --devices 50 --duration 30 --keys-per-second 5 --focus-per-second 20
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .drivers.chords import KEY_STATE_REPORT
+from .drivers.focus import FocusBrailleDriver
+from .drivers.handytech import HandyTechDriver
+from .drivers.hims import HimsBrailleDriver
+from .lazy import load_optional
+
+# driver key → nav codes the vendor's 0x01 reports use
+VENDORS: Dict[str, List[int]] = {
+    "sim": [],
+    "focus-generic": sorted(FocusBrailleDriver.NAV_MAP),
+    "handytech": sorted(HandyTechDriver.NAV_MAP),
+    "hims": sorted(HimsBrailleDriver.NAV_MAP),
+}
+# drivers whose 0x01 key reports also carry chords (high bit + dot mask)
+CHORD_KEY_REPORTS = {"focus-generic"}
+LETTERS = b"abcdefghijklmnopqrstuvwxyz"
+FOCUS_TEXTS = ["OK", "Cancel", "Settings", "Open file", "Inbox (3 unread)", "Braille display connected"]
+
+
+def vendor_reports(driver_key: str, rng: random.Random, cells: int = 40) -> List[bytes]:
+    """
+    One keystroke as the vendor sends it: mostly typed keys, some navigation,
+    routing and chords. A chord on the key-state report is a press and a release.
+    """
+    if driver_key == "sim":
+        return [bytes([rng.choice(LETTERS)])]
+    roll = rng.random()
+    if roll < 0.05:
+        return [bytes([0x02, rng.randrange(cells)])]
+    nav = VENDORS[driver_key]
+    if roll < 0.15 and nav:
+        return [bytes([0x01, rng.choice(nav)])]
+    if roll < 0.25:
+        return [bytes([KEY_STATE_REPORT, rng.randrange(1, 256), int(rng.random() < 0.2)]), bytes([KEY_STATE_REPORT, 0, 0])]
+    if roll < 0.30 and driver_key in CHORD_KEY_REPORTS:
+        return [bytes([0x01, 0x80 | rng.randrange(1, 128)])]
+    return [bytes([0x01, rng.choice(LETTERS)])]
+
+
+def request_headers(test_bypass: bool = False, token: str | None = None) -> Dict[str, str]:
+    headers = {"X-Test-Bypass": "1"} if test_bypass else {}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    return headers
+
+
+@dataclass
+class OpStats:
+    latencies_ms: List[float] = field(default_factory=list)
+    errors: int = 0
+
+    def record(self, ms: float) -> None:
+        self.latencies_ms.append(ms)
+
+    def summary(self, seconds: float) -> Dict[str, Any]:
+        lat = sorted(self.latencies_ms)
+        total = len(lat) + self.errors
+        return {
+            "requests": total,
+            "per_second": round(len(lat) / seconds, 1) if seconds > 0 else 0.0,
+            "p50_ms": round(statistics.median(lat), 2) if lat else None,
+            "p99_ms": round(lat[max(0, int(len(lat) * 0.99) - 1)], 2) if lat else None,
+            "errors": self.errors,
+            "error_rate": round(self.errors / total, 4) if total else 0.0,
+        }
+
+
+class StubOrchestrator:
+    """Accepts `POST /event` on a local port and counts envelopes by event type."""
+
+    def __init__(self) -> None:
+        from fastapi import FastAPI
+
+        self.counts: Dict[str, int] = {}
+        self.app = FastAPI()
+
+        @self.app.post("/event")
+        async def event(envelope: Dict[str, Any]) -> Dict[str, Any]:
+            kind = envelope.get("event_type", "unknown")
+            self.counts[kind] = self.counts.get(kind, 0) + 1
+            return {"accepted": True}
+
+        @self.app.get("/health")
+        async def health() -> Dict[str, str]:
+            return {"status": "ok"}
+
+        self.port = _free_port()
+        self._server = None
+
+    def start(self) -> None:
+        import uvicorn
+
+        self._server = uvicorn.Server(uvicorn.Config(self.app, host="127.0.0.1", port=self.port, log_level="warning"))
+        threading.Thread(target=self._server.run, daemon=True).start()
+        while not self._server.started:
+            time.sleep(0.01)
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.should_exit = True
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def spawn_service(orch_port: int, workers: int = 1) -> tuple[subprocess.Popen, str]:
+    port = _free_port()
+    env = {
+        **os.environ,
+        "UNISON_ORCH_HOST": "127.0.0.1",
+        "UNISON_ORCH_PORT": str(orch_port),
+        "UNISON_BRAILLE_HOTPLUG": "false",
+        "UNISON_BRAILLE_DISCOVERY_INTERVAL": "0",
+    }
+    src = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (src, env.get("PYTHONPATH")) if p)
+    cmd = [sys.executable, "-m", "uvicorn", "unison_io_braille.server:app", "--port", str(port), "--log-level", "warning"]
+    if workers > 1:
+        cmd += ["--workers", str(workers)]
+        # Workers must share device ownership, or input lands on workers that never saw the attach.
+        env["UNISON_BRAILLE_STATE_SOCKET"] = os.path.join(tempfile.mkdtemp(prefix="braille-loadgen-"), "state.sock")
+    return subprocess.Popen(cmd, env=env), f"http://127.0.0.1:{port}"
+
+
+class LoadRun:
+    def __init__(
+        self,
+        base_url: str,
+        devices: int,
+        duration: float,
+        keys_per_second: float,
+        focus_per_second: float,
+        seed: int = 1,
+        headers: Dict[str, str] | None = None,
+    ) -> None:
+        self.base_url = base_url
+        self.headers = dict(headers or {})
+        self.devices = [(f"load-{i}", f"person-{i}", list(VENDORS)[i % len(VENDORS)]) for i in range(devices)]
+        self.duration = duration
+        self.keys_per_second = keys_per_second
+        self.focus_per_second = focus_per_second
+        self.rng = random.Random(seed)
+        self.stats: Dict[str, OpStats] = {name: OpStats() for name in ("attach", "input", "focus", "focus_delivery")}
+        self._sent_focus: Dict[str, float] = {}  # device_id → when its last focus was posted
+        self.websocket_note: Optional[str] = None
+
+    async def _call(self, http, op: str, path: str, body: Dict[str, Any]) -> None:
+        start = time.perf_counter()
+        try:
+            resp = await http.post(path, json=body)
+            ok = resp.status_code == 200 and resp.json().get("ok", False)
+        except Exception:
+            ok = False
+        if ok:
+            self.stats[op].record((time.perf_counter() - start) * 1000)
+        else:
+            self.stats[op].errors += 1
+
+    async def _device(self, http, device_id: str, driver_key: str, deadline: float) -> None:
+        rng = random.Random(self.rng.random())
+        interval = 1.0 / self.keys_per_second
+        next_at = time.perf_counter() + rng.random() * interval
+        while next_at < deadline:
+            await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+            for packet in vendor_reports(driver_key, rng):
+                body = {"device_id": device_id, "data": base64.b64encode(packet).decode("ascii"), "encoding": "base64"}
+                await self._call(http, "input", "/braille/input", body)
+            next_at += interval
+
+    async def _focus(self, http, deadline: float) -> None:
+        if self.focus_per_second <= 0:
+            return
+        interval = 1.0 / self.focus_per_second
+        next_at = time.perf_counter()
+        n = 0
+        while next_at < deadline:
+            await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+            device_id, person_id, _ = self.devices[n % len(self.devices)]
+            text = f"{FOCUS_TEXTS[n % len(FOCUS_TEXTS)]} {n}"
+            self._sent_focus[device_id] = time.perf_counter()
+            await self._call(http, "focus", "/braille/focus", {"text": text, "person_id": person_id, "device_id": device_id})
+            n += 1
+            next_at += interval
+
+    async def _watch(self, websockets, device_id: str, person_id: str, deadline: float, ready: asyncio.Event) -> None:
+        url = self.base_url.replace("http", "ws", 1) + f"/braille/output?person_id={person_id}&device_id={device_id}"
+        headers = self.headers
+        try:
+            ws = await websockets.connect(url, additional_headers=headers)
+        except TypeError:  # websockets < 14
+            ws = await websockets.connect(url, extra_headers=headers)
+        async with ws:
+            await ws.recv()  # connected
+            ready.set()
+            while time.perf_counter() < deadline:
+                try:
+                    frame = json.loads(await asyncio.wait_for(ws.recv(), timeout=max(0.01, deadline - time.perf_counter())))
+                except asyncio.TimeoutError:
+                    return
+                sent = self._sent_focus.pop(frame.get("session", {}).get("device_id"), None)
+                if sent is not None:
+                    self.stats["focus_delivery"].record((time.perf_counter() - sent) * 1000)
+
+    async def run(self) -> Dict[str, Any]:
+        import httpx
+
+        limits = httpx.Limits(max_connections=max(10, len(self.devices)), max_keepalive_connections=max(10, len(self.devices)))
+        async with httpx.AsyncClient(base_url=self.base_url, headers=self.headers, limits=limits, timeout=10.0) as http:
+            for device_id, person_id, driver_key in self.devices:
+                device = {"id": device_id, "transport": "sim", "capabilities": {"driver_key": driver_key, "cells": 40}}
+                await self._call(http, "attach", "/braille/devices/attach", {"device": device, "person_id": person_id})
+            watchers: List[asyncio.Task] = []
+            websockets = load_optional(globals(), "websockets", "websockets")
+            deadline = time.perf_counter() + self.duration
+            if websockets is None:
+                self.websocket_note = "websockets not installed; focus delivery not measured"
+            else:
+                for device_id, person_id, _ in self.devices:
+                    ready = asyncio.Event()
+                    watchers.append(asyncio.create_task(self._watch(websockets, device_id, person_id, deadline + 1.0, ready)))
+                    await ready.wait()
+            start = time.perf_counter()
+            deadline = start + self.duration
+            await asyncio.gather(self._focus(http, deadline), *(self._device(http, d, k, deadline) for d, _, k in self.devices))
+            elapsed = time.perf_counter() - start
+            for task in watchers:
+                task.cancel()
+            await asyncio.gather(*watchers, return_exceptions=True)
+        report: Dict[str, Any] = {
+            "devices": len(self.devices),
+            "seconds": round(elapsed, 2),
+            "ops": {name: s.summary(elapsed) for name, s in self.stats.items() if name != "attach"},
+            "attach": self.stats["attach"].summary(elapsed),
+        }
+        if self.websocket_note:
+            report["note"] = self.websocket_note
+        return report
+
+
+def _wait_healthy(base_url: str, proc: Optional[subprocess.Popen], timeout: float = 30.0) -> None:
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc is not None and proc.poll() is not None:
+            raise RuntimeError("service exited during startup")
+        try:
+            if httpx.get(f"{base_url}/ready", timeout=0.5).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.05)
+    raise RuntimeError("service did not become ready")
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"devices={report['devices']} duration={report['seconds']}s")
+    print(f"{'op':<16}{'requests':>10}{'per_sec':>10}{'p50_ms':>10}{'p99_ms':>10}{'errors':>8}{'err_rate':>10}")
+    for name, s in report["ops"].items():
+        p50 = "-" if s["p50_ms"] is None else f"{s['p50_ms']:.2f}"
+        p99 = "-" if s["p99_ms"] is None else f"{s['p99_ms']:.2f}"
+        print(f"{name:<16}{s['requests']:>10}{s['per_second']:>10}{p50:>10}{p99:>10}{s['errors']:>8}{s['error_rate']:>10}")
+    if "orchestrator" in report:
+        print(f"orchestrator received: {report['orchestrator']}")
+    if "note" in report:
+        print(f"note: {report['note']}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--devices", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--keys-per-second", type=float, default=5.0, help="per device")
+    parser.add_argument("--focus-per-second", type=float, default=10.0, help="across all sessions")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the spawned service")
+    parser.add_argument("--target", help="base URL of an already running service (skips spawn and stub)")
+    parser.add_argument("--token", help="bearer token sent with every request")
+    parser.add_argument("--test-bypass", action="store_true", help="send X-Test-Bypass to --target (always sent to the spawned service)")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    stub: Optional[StubOrchestrator] = None
+    proc: Optional[subprocess.Popen] = None
+    base_url = args.target
+    try:
+        if base_url is None:
+            stub = StubOrchestrator()
+            stub.start()
+            proc, base_url = spawn_service(stub.port, workers=args.workers)
+        _wait_healthy(base_url, proc)
+        headers = request_headers(args.test_bypass or proc is not None, args.token)
+        run = LoadRun(base_url, args.devices, args.duration, args.keys_per_second, args.focus_per_second, headers=headers)
+        report = asyncio.run(run.run())
+        if stub is not None:
+            time.sleep(0.5)  # let in-flight events land
+            report["orchestrator"] = dict(stub.counts)
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=10)
+        if stub is not None:
+            stub.stop()
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    return 0 if all(s["error_rate"] == 0 for s in report["ops"].values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
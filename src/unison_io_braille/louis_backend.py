@@ -0,0 +1,93 @@
+import logging
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .lazy import load_optional
+
+logger = logging.getLogger("unison-io-braille.louis")
+
+
+def _louis():
+    # liblouis loads its C library on import; defer until a table asks for it.
+    return load_optional(globals(), "louis", "louis")
+
+
+def __getattr__(name: str):
+    if name == "louis":
+        return _louis()
+    raise AttributeError(name)
+
+# bytes.translate tables applied to the low byte of each dotsIO code unit.
+_MASK_6DOT = bytes(m & 0x3F for m in range(256))
+_MASK_8DOT = bytes(range(256))
+
+
+def available() -> bool:
+    return _louis() is not None
+
+
+class LouisBackend:
+    """
+    liblouis translation for one table list, resolved and compiled once.
+    liblouis keeps compiled tables in its own cache keyed by table name; the
+    backend validates the list up front (so a missing table fails once, not per
+    request) and reuses the same list for every call. dotsIO output (one
+    0x8000|dots code unit per cell) is decoded to packed mask bytes in bulk:
+    UTF-16-LE encoding and taking every other byte keeps the low byte of each
+    cell and drops the 0x8000 flag.
+    """
+
+    def __init__(self, tables: Sequence[str], eight_dot: bool = False) -> None:
+        louis = _louis()
+        if louis is None:
+            raise RuntimeError("liblouis not available")
+        self._lib = louis
+        self.tables: List[str] = list(tables)
+        self.eight_dot = eight_dot
+        self._mask = _MASK_8DOT if eight_dot else _MASK_6DOT
+        louis.checkTable(self.tables)
+
+    def translate_packed(self, text: str) -> bytes:
+        louis = self._lib
+        out = louis.translateString(self.tables, text, mode=louis.dotsIO)
+        return out.encode("utf-16-le")[::2].translate(self._mask)
+
+    def translate_segments(self, text: str) -> Tuple[bytes, List[int], List[int]]:
+        """Packed cells plus text/cell segment starts from liblouis' input→output position map."""
+        louis = self._lib
+        out, _, _, out_pos, _ = louis.translate(self.tables, text, mode=louis.dotsIO)
+        packed = out.encode("utf-16-le")[::2].translate(self._mask)
+        text_starts: List[int] = []
+        cell_starts: List[int] = []
+        for t, c in enumerate(out_pos[: len(text)]):
+            # Characters folded into one contraction share an output position.
+            if not cell_starts or c > cell_starts[-1]:
+                text_starts.append(t)
+                cell_starts.append(c if cell_starts else 0)  # indicators before the first char belong to it
+        return packed, text_starts, cell_starts
+
+    def translate_many(self, texts: Sequence[str]) -> List[bytes]:
+        """Translate a batch of strings against the already-compiled table."""
+        tables, mode, mask = self.tables, self._lib.dotsIO, self._mask
+        translate = self._lib.translateString
+        return [translate(tables, text, mode=mode).encode("utf-16-le")[::2].translate(mask) for text in texts]
+
+
+_BACKENDS: Dict[Tuple[Tuple[str, ...], bool], Optional[LouisBackend]] = {}
+_BACKENDS_LOCK = threading.Lock()
+
+
+def get_backend(tables: Sequence[str] | str | None, eight_dot: bool = False) -> Optional[LouisBackend]:
+    """Shared backend per table list; None when liblouis or the table is unavailable."""
+    if not tables or _louis() is None:
+        return None
+    names = (tables,) if isinstance(tables, str) else tuple(tables)
+    key = (names, eight_dot)
+    with _BACKENDS_LOCK:
+        if key not in _BACKENDS:
+            try:
+                _BACKENDS[key] = LouisBackend(names, eight_dot=eight_dot)
+            except Exception as exc:
+                logger.warning("louis_table_unavailable %s %s", ",".join(names), exc)
+                _BACKENDS[key] = None
+        return _BACKENDS[key]
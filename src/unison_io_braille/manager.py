@@ -1,36 +1,278 @@
-from typing import Dict, Optional, Type
+import itertools
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
 
-from .interfaces import DeviceInfo, BrailleDeviceDriver
+from .interfaces import DeviceInfo, BrailleDeviceDriver, BrailleCells, BrailleEvent
 from .driver_registry import BrailleDeviceDriverRegistry
+from .ble_transport import open_ble_writer
+from .drivers.framing import FrameAssembler
 from .hid_io import open_hid_writer
+from .packet_trace import TraceWriter
+from .serial_transport import open_serial_writer
+from .settings import TRACE_DIR
+
+logger = logging.getLogger("unison-io-braille.manager")
+
+WriterFactory = Callable[[DeviceInfo], Any]
+
+_trace_seq = itertools.count()
+
+
+def open_device_writer(device: DeviceInfo, on_input: Callable[[bytes], None] | None = None) -> Any:
+    """
+    Default writer factory: open the transport-specific output writer, if any.
+    Transports that also carry input (BLE notifications, serial reads) hand the raw byte stream to `on_input`.
+    """
+    if device.transport == "usb":
+        return open_hid_writer(device.vid, device.pid)
+    if device.transport == "bt":
+        return open_ble_writer(device, on_input=on_input)
+    if device.transport == "serial":
+        return open_serial_writer(device, on_input=on_input)
+    return None
+
+
+@dataclass
+class AttachedDevice:
+    info: DeviceInfo
+    driver: BrailleDeviceDriver
+    writer: Any = None
+    driver_key: str = ""
+    recorder: Optional[TraceWriter] = None
+    # Reassembles reports from stream transports, for drivers that declare STREAM_FRAMING.
+    frames: Optional[FrameAssembler] = None
+    # Serializes driver calls (parsing, frame encoding) for this device only.
+    lock: threading.Lock = field(default_factory=threading.Lock)
 
 
 class BrailleDeviceManager:
     """
-    Placeholder manager responsible for discovery and lifecycle.
-    Real discovery (USB/BT) will be added later.
+    Device lifecycle and driver ownership.
+    Safe to call from the event loop and threadpool handlers concurrently: the
+    device table is guarded by one lock held only for dict updates, while
+    opening/closing drivers and per-device I/O happen outside it. Each device's
+    writer owns its I/O worker, so a wedged device cannot stall the others.
+    With `trace_dir` set, every attached device's raw input is recorded to a
+    packet trace there (see `packet_trace`). Input the transport itself receives
+    (rather than `on_packet` callers) is reassembled and parsed by `on_stream`,
+    and the events go to `event_sink(device_id, events)`.
     """
 
-    def __init__(self, registry: BrailleDeviceDriverRegistry) -> None:
+    def __init__(
+        self,
+        registry: BrailleDeviceDriverRegistry,
+        writer_factory: WriterFactory | None = None,
+        trace_dir: str | None = TRACE_DIR,
+    ) -> None:
         self.registry = registry
+        self.writer_factory = writer_factory or self._open_writer
+        self.event_sink: Callable[[str, List[BrailleEvent]], Any] | None = None
+        self.trace_dir = trace_dir
         self.active: Dict[str, BrailleDeviceDriver] = {}
+        self._devices: Dict[str, AttachedDevice] = {}
+        self._lock = threading.RLock()
 
-    def attach(self, device: DeviceInfo) -> None:
+    def attach(self, device: DeviceInfo) -> Optional[BrailleDeviceDriver]:
         key = device.capabilities.get("driver_key") if device.capabilities else None
         key = key or (f"{device.vid}:{device.pid}" if device.vid and device.pid else device.id)
-        driver_cls = self.registry.get(key) or self.registry.get("generic-hid")
+        driver_cls = self.registry.get(key)
+        if driver_cls is None:
+            key, driver_cls = "generic-hid", self.registry.get("generic-hid")
         if not driver_cls:
-            return
+            return None
+        # Close the previous attachment first: exclusive transports (a serial tty, a
+        # connected BLE peripheral) cannot be opened a second time.
+        with self._lock:
+            previous = self._devices.pop(device.id, None)
+            self.active.pop(device.id, None)
+        if previous:
+            self._close(previous)
         driver = driver_cls()
-        writer = None
-        if device.transport == "usb":
-            writer = open_hid_writer(device.vid, device.pid)
-        driver.open(device)
+        writer = self.writer_factory(device)
+        try:
+            driver.open(device)
+        except Exception:
+            self._close_writer(device.id, writer)
+            raise
         if writer and hasattr(driver, "set_output_writer"):
             driver.set_output_writer(writer)
-        self.active[device.id] = driver
+        entry = AttachedDevice(info=device, driver=driver, writer=writer, driver_key=key)
+        framing = getattr(driver, "STREAM_FRAMING", None)
+        if framing is not None:
+            entry.frames = FrameAssembler(framing)
+        if self.trace_dir:
+            entry.recorder = self._open_trace(entry, None)
+        with self._lock:
+            displaced = self._devices.get(device.id)  # a concurrent attach of the same id
+            self._devices[device.id] = entry
+            self.active[device.id] = driver
+        if displaced:
+            self._close(displaced)
+        return driver
+
+    def _open_writer(self, device: DeviceInfo) -> Any:
+        return open_device_writer(device, on_input=lambda data: self._received(device.id, data))
+
+    def _received(self, device_id: str, data: bytes) -> None:
+        sink = self.event_sink
+        if sink is None:
+            logger.debug("device_input_dropped %s no sink", device_id)
+            return
+        events = self.on_stream(device_id, data)
+        if events:
+            sink(device_id, events)
 
     def detach(self, device_id: str) -> None:
-        drv = self.active.pop(device_id, None)
-        if drv:
-            drv.close()
+        with self._lock:
+            entry = self._devices.pop(device_id, None)
+            self.active.pop(device_id, None)
+        if entry:
+            self._close(entry)
+
+    def _open_trace(self, entry: AttachedDevice, path: str | None) -> TraceWriter:
+        if path is None:
+            if not self.trace_dir:
+                raise ValueError("no trace_dir configured; pass an explicit trace path")
+            os.makedirs(self.trace_dir, exist_ok=True)
+            safe_id = "".join(c if c.isalnum() or c in "-_." else "_" for c in entry.info.id)
+            # Unique even for several traces of one device within a second.
+            stamp = f"{time.strftime('%Y%m%dT%H%M%S')}-{time.time_ns() % 1_000_000_000:09d}-{next(_trace_seq)}"
+            path = os.path.join(self.trace_dir, f"{safe_id}-{stamp}.ubt")
+        return TraceWriter(path, entry.info.id, entry.driver_key)
+
+    def start_recording(self, device_id: str, path: str | None = None) -> Optional[str]:
+        """
+        Record the device's raw input packets to a trace file; returns its path.
+        Without `path`, the file goes under `trace_dir` (ValueError if none is configured).
+        """
+        entry = self.get(device_id)
+        if entry is None:
+            return None
+        recorder = self._open_trace(entry, path)
+        with entry.lock:
+            previous, entry.recorder = entry.recorder, recorder
+        if previous:
+            previous.close()
+        return recorder.path
+
+    def stop_recording(self, device_id: str) -> Optional[str]:
+        entry = self.get(device_id)
+        if entry is None or entry.recorder is None:
+            return None
+        with entry.lock:
+            recorder, entry.recorder = entry.recorder, None
+        recorder.close()
+        return recorder.path
+
+    def _close(self, entry: AttachedDevice) -> None:
+        if entry.recorder:
+            entry.recorder.close()
+        with entry.lock:
+            try:
+                entry.driver.close()
+            except Exception as exc:  # pragma: no cover
+                logger.warning("driver_close_failed %s %s", entry.info.id, exc)
+        self._close_writer(entry.info.id, entry.writer)
+
+    def _close_writer(self, device_id: str, writer: Any) -> None:
+        close = getattr(writer, "close", None)
+        if close:
+            try:
+                close()
+            except Exception as exc:  # pragma: no cover
+                logger.warning("writer_close_failed %s %s", device_id, exc)
+
+    def get(self, device_id: str) -> Optional[AttachedDevice]:
+        with self._lock:
+            return self._devices.get(device_id)
+
+    def devices(self) -> List[DeviceInfo]:
+        with self._lock:
+            return [entry.info for entry in self._devices.values()]
+
+    def on_packet(self, device_id: str, data: bytes) -> Optional[List[BrailleEvent]]:
+        """Parse a packet with the device's driver; None if the device is not attached."""
+        entry = self.get(device_id)
+        if entry is None:
+            return None
+        with entry.lock:
+            if entry.recorder:
+                entry.recorder.record(data)
+            return list(entry.driver.on_packet(data))
+
+    def on_packets(self, device_id: str, packets: Iterable[bytes]) -> Optional[List[BrailleEvent]]:
+        """Parse a batch of packets under one device-lock acquisition; None if not attached."""
+        entry = self.get(device_id)
+        if entry is None:
+            return None
+        events: List[BrailleEvent] = []
+        with entry.lock:
+            recorder, on_packet = entry.recorder, entry.driver.on_packet
+            for data in packets:
+                if recorder:
+                    recorder.record(data)
+                events.extend(on_packet(data))
+        return events
+
+    def on_stream(self, device_id: str, data: bytes) -> Optional[List[BrailleEvent]]:
+        """
+        Parse a chunk of a device's input byte stream: reports are reassembled by
+        the driver's STREAM_FRAMING and handed to it as memoryviews (a driver
+        without one gets the chunk as a single packet). None if not attached.
+        """
+        entry = self.get(device_id)
+        if entry is None:
+            return None
+        if entry.frames is None:
+            return self.on_packet(device_id, data)
+        events: List[BrailleEvent] = []
+        with entry.lock:
+            recorder, on_packet = entry.recorder, entry.driver.on_packet
+            for frame in entry.frames.feed(data):
+                if recorder:
+                    recorder.record(frame)
+                events.extend(on_packet(frame))
+        return events
+
+    def next_input_deadline(self) -> Optional[float]:
+        """Earliest time a driver has timed input pending (chord hold/autorepeat)."""
+        with self._lock:
+            entries = list(self._devices.values())
+        deadlines = [d for d in (getattr(e.driver, "input_deadline", None) for e in entries) if d is not None]
+        return min(deadlines) if deadlines else None
+
+    def poll_input(self, now: float | None = None) -> Dict[str, List[BrailleEvent]]:
+        """Collect timer-driven events (held chords, autorepeat) from drivers that have any due."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            entries = list(self._devices.values())
+        out: Dict[str, List[BrailleEvent]] = {}
+        for entry in entries:
+            deadline = getattr(entry.driver, "input_deadline", None)
+            if deadline is None or deadline > now:
+                continue
+            with entry.lock:
+                events = list(entry.driver.poll(now))
+            if events:
+                out[entry.info.id] = events
+        return out
+
+    def send_cells(self, device_id: str, cells: BrailleCells) -> bool:
+        entry = self.get(device_id)
+        if entry is None:
+            return False
+        with entry.lock:
+            entry.driver.send_cells(cells)
+        return True
+
+    def close_all(self) -> None:
+        with self._lock:
+            entries = list(self._devices.values())
+            self._devices.clear()
+            self.active.clear()
+        for entry in entries:
+            self._close(entry)
@@ -0,0 +1,198 @@
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional, Protocol, Sequence, Tuple
+
+
+class SegmentTranslator(Protocol):
+    def segments(self, text: str) -> Tuple[bytes, List[int], List[int]]: ...
+
+
+KINDS = ("line", "word", "paragraph", "heading")
+
+
+def _splice(values: List[int], lo: int, hi: int, new: Sequence[int], delta: int) -> None:
+    """Replace the values in [lo, hi) with `new` and shift those at or after `hi` by `delta`."""
+    i = bisect_left(values, lo)
+    j = bisect_left(values, hi)
+    values[i:] = list(new) + ([v + delta for v in values[j:]] if delta else values[j:])
+
+
+class NavIndex:
+    """
+    Navigation index over one translated document.
+    Holds aligned text/cell segment starts (one per translation token), so text
+    and cell offsets convert both ways with a bisect. It also holds cell offsets of
+    word and paragraph starts, line starts wrapped at word boundaries for `width`
+    cells, and heading positions. Lookups are O(log n). `edit` re-translates only
+    the paragraph(s) an edit touches and shifts the rest, since translation
+    tokens and line wraps never cross a newline.
+    """
+
+    def __init__(self, translator: SegmentTranslator, width: int | None = None, table: str | None = None) -> None:
+        self.translator = translator
+        self.width = width
+        self.table = table
+        self.text = ""
+        self.cells = 0
+        self.headings: List[int] = []  # text offsets
+        self._seg_text: List[int] = []
+        self._seg_cell: List[int] = []
+        self.words: List[int] = []
+        self.paragraphs: List[int] = [0]
+        self.lines: List[int] = [0]
+
+    @classmethod
+    def build(
+        cls,
+        text: str,
+        translator: SegmentTranslator,
+        width: int | None = None,
+        headings: Iterable[int] = (),
+        table: str | None = None,
+    ) -> "NavIndex":
+        index = cls(translator, width, table)
+        index.edit(0, 0, text)
+        index.headings = sorted(headings)
+        return index
+
+    # -- offsets -------------------------------------------------------------
+
+    def text_to_cell(self, offset: int) -> int:
+        """First cell of the token containing text `offset`."""
+        if offset >= len(self.text):
+            return self.cells
+        k = bisect_right(self._seg_text, offset) - 1
+        return self._seg_cell[k] if k >= 0 else 0
+
+    def cell_to_text(self, cell: int) -> int:
+        """Start of the text that produced `cell` (contractions map all their cells to one offset)."""
+        if cell >= self.cells:
+            return len(self.text)
+        k = bisect_right(self._seg_cell, cell) - 1
+        return self._seg_text[k] if k >= 0 else 0
+
+    def route(self, viewport_offset: int, key: int) -> int:
+        """Text offset under routing key `key` (`cell-N`) of a display panned to `viewport_offset`."""
+        return self.cell_to_text(viewport_offset + key)
+
+    # -- navigation ----------------------------------------------------------
+
+    def _marks(self, kind: str) -> List[int]:
+        if kind == "line":
+            return self.lines
+        if kind == "word":
+            return self.words
+        if kind == "paragraph":
+            return self.paragraphs
+        if kind == "heading":
+            return [self.text_to_cell(t) for t in self.headings]
+        raise ValueError(f"unknown navigation target: {kind}")
+
+    def line_start(self, cell: int) -> int:
+        """Start of the wrapped line containing `cell`: where to pan to show it."""
+        return self.lines[max(0, bisect_right(self.lines, cell) - 1)]
+
+    def next(self, kind: str, cell: int) -> Optional[int]:
+        marks = self._marks(kind)
+        i = bisect_right(marks, cell)
+        return marks[i] if i < len(marks) else None
+
+    def prev(self, kind: str, cell: int) -> Optional[int]:
+        marks = self._marks(kind)
+        i = bisect_left(marks, cell) - 1
+        return marks[i] if i >= 0 else None
+
+    def find(self, query: str, cell: int, backwards: bool = False) -> Optional[int]:
+        """Cell of the next (or previous) occurrence of `query` after (before) `cell`; case-insensitive."""
+        if not query:
+            return None
+        haystack, needle = self.text.lower(), query.lower()
+        start = self.cell_to_text(cell)
+        if backwards:
+            hit = haystack.rfind(needle, 0, max(0, start))
+        else:
+            hit = haystack.find(needle, start + 1 if cell < self.cells else len(haystack))
+        return None if hit < 0 else self.text_to_cell(hit)
+
+    # -- updates -------------------------------------------------------------
+
+    def sync(self, text: str) -> None:
+        """Bring the index up to `text` with one edit spanning what changed."""
+        old = self.text
+        if text == old:
+            return
+        limit = min(len(old), len(text))
+        prefix = 0
+        while prefix < limit and old[prefix] == text[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < limit - prefix and old[-1 - suffix] == text[-1 - suffix]:
+            suffix += 1
+        self.edit(prefix, len(old) - suffix, text[prefix : len(text) - suffix])
+
+    def edit(self, start: int, end: int, replacement: str) -> None:
+        """Replace text[start:end]; only the enclosing paragraph(s) are re-translated."""
+        text = self.text
+        p0 = text.rfind("\n", 0, start) + 1
+        p1 = text.find("\n", end)
+        if p1 < 0:
+            p1 = len(text)
+        c0, c1 = self.text_to_cell(p0), self.text_to_cell(p1)
+        region = text[p0:start] + replacement + text[end:p1]
+        packed, seg_text, seg_cell = self.translator.segments(region)
+        count = len(packed)
+        dtext = len(region) - (p1 - p0)
+        dcell = count - (c1 - c0)
+        self.text = text[:start] + replacement + text[end:]
+        self.cells += dcell
+        # Segments: p0 and p1 are token boundaries (a newline is its own token).
+        i = bisect_left(self._seg_text, p0)
+        j = bisect_left(self._seg_text, p1)
+        tail = [(t + dtext, c + dcell) for t, c in zip(self._seg_text[j:], self._seg_cell[j:])]
+        self._seg_text[i:] = [p0 + t for t in seg_text] + [t for t, _ in tail]
+        self._seg_cell[i:] = [c0 + c for c in seg_cell] + [c for _, c in tail]
+        self.headings = [h for h in self.headings if h < start] + [h + len(replacement) - (end - start) for h in self.headings if h >= end]
+
+        def cell_at(t: int) -> int:
+            k = bisect_right(seg_text, t) - 1
+            return c0 + (seg_cell[k] if k >= 0 else 0) if t < len(region) else c0 + count
+
+        words = [cell_at(t) for t, ch in enumerate(region) if not ch.isspace() and (t == 0 or region[t - 1].isspace())]
+        paragraphs = [c0] + [cell_at(t + 1) for t, ch in enumerate(region) if ch == "\n"]
+        # Everything up to and including the newline cell that ends the region is rebuilt.
+        hi = c1 + 1
+        _splice(self.words, c0, hi, words, dcell)
+        _splice(self.paragraphs, c0, hi, paragraphs, dcell)
+        ends = paragraphs[1:] + [c0 + count + 1 if p1 < len(text) else c0 + count]
+        _splice(self.lines, c0, hi, self._wrap(paragraphs, ends, words), dcell)
+
+    def set_width(self, width: int | None) -> None:
+        """Re-wrap lines for a new display width without re-translating."""
+        if width == self.width:
+            return
+        self.width = width
+        ends = self.paragraphs[1:] + [self.cells]
+        self.lines = self._wrap(self.paragraphs, ends, self.words)
+
+    def _wrap(self, starts: List[int], ends: List[int], words: List[int]) -> List[int]:
+        """Line starts for paragraphs [start, end): break at the last word start that fits."""
+        width = self.width
+        lines: List[int] = []
+        for start, end in zip(starts, ends):
+            line = start
+            lines.append(line)
+            while width and end - line > width:
+                limit = line + width
+                k = bisect_right(words, limit) - 1
+                line = words[k] if k >= 0 and words[k] > line else limit
+                lines.append(line)
+        return lines
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "chars": len(self.text),
+            "cells": self.cells,
+            "segments": len(self._seg_text),
+            "words": len(self.words),
+            "paragraphs": len(self.paragraphs),
+            "lines": len(self.lines),
+        }
@@ -0,0 +1,195 @@
+"""
+Raw device packet traces: record what a display sent, replay it through a driver.
+
+File layout (little-endian):
+  header  b"UBTR", u16 version, u16 reserved, u64 wall-clock start (ns),
+          u16 len + device id (UTF-8), u16 len + driver key (UTF-8)
+  records u64 offset from start (ns), u16 length, payload bytes
+
+Run: python -m unison_io_braille.packet_trace info|replay TRACE [--driver KEY] [--speed X]
+"""
+import argparse
+import mmap
+import struct
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Tuple
+
+from .interfaces import BrailleDeviceDriver, BrailleEvent, DeviceInfo
+
+MAGIC = b"UBTR"
+VERSION = 1
+_HEADER = struct.Struct("<4sHHQ")
+_LEN = struct.Struct("<H")
+_RECORD = struct.Struct("<QH")
+
+
+class TraceFormatError(ValueError):
+    pass
+
+
+class TraceWriter:
+    """
+    Appends timestamped packets for one device; safe to call from the device's I/O threads.
+    The file must not exist yet (FileExistsError): a trace is never truncated.
+    """
+
+    def __init__(self, path: str, device_id: str, driver: str = "") -> None:
+        self.path = path
+        self.device_id = device_id
+        self.driver = driver
+        self.packets = 0
+        self._start = time.monotonic_ns()
+        self._lock = threading.Lock()
+        self._fh = open(path, "xb")
+        header = _HEADER.pack(MAGIC, VERSION, 0, time.time_ns())
+        for text in (device_id, driver):
+            raw = text.encode("utf-8")
+            header += _LEN.pack(len(raw)) + raw
+        self._fh.write(header)
+
+    def record(self, data: bytes) -> None:
+        if len(data) > 0xFFFF:
+            data = data[:0xFFFF]
+        entry = _RECORD.pack(time.monotonic_ns() - self._start, len(data)) + bytes(data)
+        with self._lock:
+            if self._fh.closed:
+                return
+            self._fh.write(entry)
+            self.packets += 1
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._fh.closed:
+                self._fh.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._fh.closed:
+                self._fh.close()
+
+    def __enter__(self) -> "TraceWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class TraceReader:
+    """Memory-mapped trace; iterating yields (offset_ns, packet bytes) without reading the whole file."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as fh:
+            self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        mm = self._mm
+        if len(mm) < _HEADER.size or mm[:4] != MAGIC:
+            raise TraceFormatError(f"{path}: not a packet trace")
+        _, version, _, self.started_ns = _HEADER.unpack_from(mm, 0)
+        if version != VERSION:
+            raise TraceFormatError(f"{path}: unsupported trace version {version}")
+        pos = _HEADER.size
+        names = []
+        for _ in range(2):
+            (size,) = _LEN.unpack_from(mm, pos)
+            pos += _LEN.size
+            names.append(mm[pos : pos + size].decode("utf-8"))
+            pos += size
+        self.device_id, self.driver = names
+        self._data_start = pos
+
+    def __iter__(self) -> Iterator[Tuple[int, bytes]]:
+        mm, pos, end = self._mm, self._data_start, len(self._mm)
+        unpack = _RECORD.unpack_from
+        size = _RECORD.size
+        while pos + size <= end:
+            offset_ns, length = unpack(mm, pos)
+            pos += size
+            if pos + length > end:
+                break  # truncated tail (recorder was killed mid-write)
+            yield offset_ns, mm[pos : pos + length]
+            pos += length
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __enter__(self) -> "TraceReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+@dataclass
+class ReplayStats:
+    packets: int = 0
+    events: int = 0
+    seconds: float = 0.0
+    collected: List[BrailleEvent] = field(default_factory=list)
+
+    @property
+    def packets_per_second(self) -> float:
+        return self.packets / self.seconds if self.seconds > 0 else 0.0
+
+
+def replay(
+    reader: TraceReader, driver: BrailleDeviceDriver, speed: Optional[float] = None, collect: bool = False
+) -> ReplayStats:
+    """
+    Feed a trace through `driver.on_packet`.
+    `speed=None` replays as fast as possible (throughput benchmark); `speed=1.0`
+    keeps the original inter-packet timing, `2.0` twice as fast, and so on.
+    `collect=True` keeps the produced events, e.g. to compare against a corpus.
+    """
+    stats = ReplayStats()
+    on_packet = driver.on_packet
+    start = time.perf_counter()
+    for offset_ns, packet in reader:
+        if speed:
+            delay = offset_ns / 1e9 / speed - (time.perf_counter() - start)
+            if delay > 0:
+                time.sleep(delay)
+        events = list(on_packet(packet))
+        stats.packets += 1
+        stats.events += len(events)
+        if collect:
+            stats.collected.extend(events)
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from .driver_registry import BrailleDeviceDriverRegistry
+
+    parser = argparse.ArgumentParser(description="Inspect or replay a raw packet trace")
+    parser.add_argument("command", choices=["info", "replay"])
+    parser.add_argument("trace")
+    parser.add_argument("--driver", help="driver key (defaults to the one recorded in the trace)")
+    parser.add_argument("--speed", type=float, help="1.0 = original timing; omit for as fast as possible")
+    args = parser.parse_args(argv)
+    with TraceReader(args.trace) as reader:
+        if args.command == "info":
+            records = list(reader)
+            duration = records[-1][0] / 1e9 if records else 0.0
+            print(f"device={reader.device_id} driver={reader.driver or '-'} packets={len(records)} duration={duration:.3f}s")
+            return 0
+        key = args.driver or reader.driver
+        driver_cls = BrailleDeviceDriverRegistry().get(key) if key else None
+        if driver_cls is None:
+            print(f"unknown driver {key!r}; pass --driver", file=sys.stderr)
+            return 2
+        driver = driver_cls()
+        driver.open(DeviceInfo(id=reader.device_id, transport="replay"))
+        stats = replay(reader, driver, speed=args.speed)
+        driver.close()
+    print(f"packets={stats.packets} events={stats.events} seconds={stats.seconds:.3f} packets/s={stats.packets_per_second:,.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger("unison-io-braille.readiness")
+
+PENDING = "pending"
+READY = "ready"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+
+@dataclass
+class ComponentStatus:
+    name: str
+    required: bool = True
+    status: str = PENDING
+    duration_ms: float | None = None
+    detail: Any = None
+    error: str | None = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {"status": self.status, "required": self.required}
+        if self.duration_ms is not None:
+            out["ms"] = round(self.duration_ms, 1)
+        if self.detail is not None:
+            out["detail"] = self.detail
+        if self.error:
+            out["error"] = self.error
+        return out
+
+
+class Readiness:
+    """
+    Per-component warm-up tracking behind `/ready`.
+    Components are registered before warm-up starts so they report `pending`;
+    the instance is ready once every required component is ready or skipped.
+    Optional components (e.g. connection priming) are reported but never gate.
+    Required steps that fail are retried with exponential backoff, so a dependency
+    that is briefly unreachable at boot does not leave the instance unready.
+    """
+
+    def __init__(self) -> None:
+        self.components: Dict[str, ComponentStatus] = {}
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+
+    def register(self, name: str, required: bool = True) -> ComponentStatus:
+        status = self.components.get(name)
+        if status is None:
+            status = self.components[name] = ComponentStatus(name=name, required=required)
+        return status
+
+    def skip(self, name: str, reason: str, required: bool = True) -> None:
+        status = self.register(name, required)
+        status.status = SKIPPED
+        status.detail = reason
+
+    async def run(self, name: str, fn: Callable[[], Awaitable[Any]], required: bool = True) -> bool:
+        """Run one warm-up step, recording its outcome, timing and returned detail."""
+        status = self.register(name, required)
+        start = time.perf_counter()
+        try:
+            status.detail = await fn()
+            status.status = READY
+            status.error = None
+        except Exception as exc:
+            status.status = FAILED
+            status.error = str(exc) or type(exc).__name__
+            log = logger.warning if required else logger.info
+            log("warmup_failed %s %s", name, status.error)
+        status.duration_ms = (time.perf_counter() - start) * 1000
+        return status.status == READY
+
+    async def warm_up(
+        self,
+        steps: Dict[str, Callable[[], Awaitable[Any]]],
+        optional: tuple = (),
+        retry_initial: float = 1.0,
+        retry_max: float = 30.0,
+    ) -> bool:
+        """
+        Run all steps concurrently; `optional` names are reported but do not gate readiness.
+        Failed required steps are then retried (backoff from `retry_initial` up to
+        `retry_max` seconds) until they succeed; pass `retry_initial=0` to not retry.
+        """
+        self.started_at = time.monotonic()
+        for name in steps:
+            self.register(name, required=name not in optional)
+        await asyncio.gather(*(self.run(name, fn, required=name not in optional) for name, fn in steps.items()))
+        self.finished_at = time.monotonic()
+        delay = retry_initial
+        while delay > 0:
+            failed = [name for name in steps if name not in optional and self.components[name].status == FAILED]
+            if not failed:
+                break
+            logger.info("warmup_retry %s in %.1fs", ",".join(failed), delay)
+            await asyncio.sleep(delay)
+            await asyncio.gather(*(self.run(name, steps[name]) for name in failed))
+            delay = min(delay * 2, retry_max)
+        return self.ready
+
+    @property
+    def ready(self) -> bool:
+        if self.started_at is None:
+            return False
+        return all(c.status in (READY, SKIPPED) for c in self.components.values() if c.required)
+
+    def snapshot(self) -> Dict[str, Any]:
+        elapsed: Optional[float] = None
+        if self.started_at is not None:
+            elapsed = ((self.finished_at or time.monotonic()) - self.started_at) * 1000
+        return {
+            "ready": self.ready,
+            "warmup_ms": None if elapsed is None else round(elapsed, 1),
+            "components": {name: c.as_dict() for name, c in self.components.items()},
+        }
@@ -0,0 +1,237 @@
+import asyncio
+import logging
+import os
+import termios
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+from .interfaces import DeviceInfo
+from .settings import SERIAL_BAUD, SERIAL_FLOW, SERIAL_TX_LIMIT
+
+logger = logging.getLogger("unison-io-braille.serial")
+
+FLOW_CONTROL = ("none", "rtscts", "xonxoff")
+_READ_SIZE = 4096
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def serial_loop() -> asyncio.AbstractEventLoop:
+    """One event-loop thread shared by every serial port (fd readiness, not a thread per device)."""
+    global _loop
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="braille-serial", daemon=True).start()
+        return _loop
+
+
+def configure_port(fd: int, baud: int = SERIAL_BAUD, flow: str = SERIAL_FLOW) -> None:
+    """Raw 8N1 at `baud` with the given flow control (none, rtscts, xonxoff)."""
+    speed = getattr(termios, f"B{baud}", None)
+    if speed is None:
+        raise ValueError(f"unsupported baud rate: {baud}")
+    if flow not in FLOW_CONTROL:
+        raise ValueError(f"unsupported flow control: {flow}")
+    iflag, oflag, cflag, lflag, _, _, cc = termios.tcgetattr(fd)
+    iflag &= ~(termios.IGNBRK | termios.BRKINT | termios.PARMRK | termios.ISTRIP | termios.INLCR | termios.IGNCR | termios.ICRNL | termios.IXON | termios.IXOFF | termios.IXANY)
+    oflag &= ~termios.OPOST
+    lflag &= ~(termios.ECHO | termios.ECHONL | termios.ICANON | termios.ISIG | termios.IEXTEN)
+    cflag &= ~(termios.CSIZE | termios.PARENB | termios.CSTOPB | getattr(termios, "CRTSCTS", 0))
+    cflag |= termios.CS8 | termios.CREAD | termios.CLOCAL
+    if flow == "rtscts":
+        cflag |= getattr(termios, "CRTSCTS", 0)
+    elif flow == "xonxoff":
+        iflag |= termios.IXON | termios.IXOFF
+    cc[termios.VMIN] = 0
+    cc[termios.VTIME] = 0
+    termios.tcsetattr(fd, termios.TCSANOW, [iflag, oflag, cflag, lflag, speed, speed, cc])
+
+
+class SerialTransport:
+    """
+    Non-blocking serial I/O for one port, driven by its event loop's fd readiness.
+    Reads drain the port into a buffer and hand everything received in one wakeup
+    to `on_input` (reports are reassembled by the manager, see `drivers.framing`). Writes
+    queue frames and flush them together in one `os.write` per loop iteration;
+    the rest waits for the port to become writable. Queued frames beyond
+    `tx_limit` bytes drop oldest first, as display frames supersede each other.
+    All methods except `open`/`close` run on the loop.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        baud: int = SERIAL_BAUD,
+        flow: str = SERIAL_FLOW,
+        on_input: Callable[[bytes], None] | None = None,
+        tx_limit: int = SERIAL_TX_LIMIT,
+    ) -> None:
+        self.path = path
+        self.baud = baud
+        self.flow = flow
+        self.on_input = on_input
+        self.tx_limit = tx_limit
+        self.fd: Optional[int] = None
+        self.stats = {"rx_bytes": 0, "tx_bytes": 0, "writes": 0, "dropped": 0}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._rx = bytearray()
+        self._tx: Deque[bytes] = deque()
+        self._tx_bytes = 0
+        self._partial = memoryview(b"")
+        self._flush_scheduled = False
+        self._writer_registered = False
+        self._drained: Optional[asyncio.Event] = None
+
+    async def open(self) -> None:
+        fd = os.open(self.path, os.O_RDWR | os.O_NOCTTY | os.O_NONBLOCK)
+        try:
+            configure_port(fd, self.baud, self.flow)
+        except Exception:
+            os.close(fd)
+            raise
+        self.fd = fd
+        self._loop = asyncio.get_running_loop()
+        self._drained = asyncio.Event()
+        self._drained.set()
+        self._loop.add_reader(fd, self._readable)
+
+    def _readable(self) -> None:
+        rx = self._rx
+        while True:
+            try:
+                chunk = os.read(self.fd, _READ_SIZE)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError as exc:  # e.g. EIO once the other end of a pty closes
+                logger.warning("serial_read_failed %s %s", self.path, exc)
+                self._loop.remove_reader(self.fd)
+                break
+            if not chunk:
+                break
+            rx += chunk
+            if len(chunk) < _READ_SIZE:
+                break
+        if rx:
+            self.stats["rx_bytes"] += len(rx)
+            data = bytes(rx)
+            rx.clear()
+            if self.on_input:
+                try:
+                    self.on_input(data)
+                except Exception as exc:
+                    logger.warning("serial_input_failed %s", exc)
+
+    def write(self, data: bytes) -> None:
+        self._tx.append(data)
+        self._tx_bytes += len(data)
+        while self._tx_bytes > self.tx_limit and len(self._tx) > 1:
+            self._tx_bytes -= len(self._tx.popleft())
+            self.stats["dropped"] += 1
+        self._drained.clear()
+        if not self._flush_scheduled and not self._writer_registered:
+            self._flush_scheduled = True
+            self._loop.call_soon(self._flush)
+
+    def _flush(self) -> None:
+        self._flush_scheduled = False
+        if not self._partial and self._tx:
+            # Everything queued since the last flush goes out in one write.
+            self._partial = memoryview(b"".join(self._tx))
+            self._tx.clear()
+            self._tx_bytes = 0
+        while self._partial:
+            try:
+                written = os.write(self.fd, self._partial)
+            except (BlockingIOError, InterruptedError):
+                written = 0
+            except OSError as exc:
+                logger.warning("serial_write_failed %s %s", self.path, exc)
+                self._partial = memoryview(b"")
+                break
+            self.stats["writes"] += 1
+            self.stats["tx_bytes"] += written
+            self._partial = self._partial[written:]
+            if not self._partial and self._tx:
+                self._partial = memoryview(b"".join(self._tx))
+                self._tx.clear()
+                self._tx_bytes = 0
+            if written == 0:
+                break
+        if self._partial:
+            if not self._writer_registered:
+                self._loop.add_writer(self.fd, self._flush)
+                self._writer_registered = True
+            return
+        if self._writer_registered:
+            self._loop.remove_writer(self.fd)
+            self._writer_registered = False
+        self._drained.set()
+
+    async def drain(self) -> None:
+        await self._drained.wait()
+
+    def close(self) -> None:
+        if self.fd is None:
+            return
+        self._loop.remove_reader(self.fd)
+        if self._writer_registered:
+            self._loop.remove_writer(self.fd)
+            self._writer_registered = False
+        os.close(self.fd)
+        self.fd = None
+
+
+class SerialWriter:
+    """Output writer for a serial display (the `write`/`write_async`/`close` shape of `HIDWriter`)."""
+
+    def __init__(self, transport: SerialTransport, loop: asyncio.AbstractEventLoop | None = None) -> None:
+        self.transport = transport
+        self._loop = loop or serial_loop()
+
+    def open(self, timeout: float = 5.0) -> None:
+        asyncio.run_coroutine_threadsafe(self.transport.open(), self._loop).result(timeout)
+
+    def write_async(self, data: bytes) -> None:
+        self._loop.call_soon_threadsafe(self.transport.write, bytes(data))
+
+    def write(self, data: bytes) -> None:
+        self.write_async(data)
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Wait until everything written so far has been handed to the port."""
+        asyncio.run_coroutine_threadsafe(self.transport.drain(), self._loop).result(timeout)
+
+    def close(self, timeout: float = 2.0) -> None:
+        async def shutdown() -> None:
+            try:
+                await asyncio.wait_for(self.transport.drain(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning("serial_close_undrained %s", self.transport.path)
+            self.transport.close()
+
+        try:
+            asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result(timeout + 1.0)
+        except Exception as exc:  # pragma: no cover
+            logger.warning("serial_close_failed %s %s", self.transport.path, exc)
+
+
+def open_serial_writer(device: DeviceInfo, on_input: Callable[[bytes], None] | None = None) -> Optional[SerialWriter]:
+    """Open a serial display (`port` capability, or id `serial:<path>`); None when the port cannot be opened."""
+    caps: Dict[str, Any] = device.capabilities or {}
+    path = caps.get("port") or (device.id[7:] if device.id.startswith("serial:") else device.id)
+    transport = SerialTransport(
+        path,
+        baud=int(caps.get("baud") or SERIAL_BAUD),
+        flow=caps.get("flow") or SERIAL_FLOW,
+        on_input=on_input,
+    )
+    writer = SerialWriter(transport)
+    try:
+        writer.open()
+    except Exception as exc:
+        logger.warning("serial_open_failed %s %s", device.id, exc)
+        return None
+    return writer
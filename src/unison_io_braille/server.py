@@ -1,23 +1,33 @@
 import asyncio
+import base64
 import logging
 import os
 import time
-from typing import Dict, Any, List, Optional
-
-from fastapi import FastAPI, Body, WebSocket, WebSocketDisconnect, Request, HTTPException
-import httpx
-import uvicorn
-
-from .translator_loader import TableTranslator
-from .events import CapsReport, braille_input_event
-from .discovery import enumerate_usb, enumerate_bluetooth
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+
+from fastapi import FastAPI, Body, WebSocket, WebSocketDisconnect, Request, HTTPException, Response
+
+from .back_translator import BackTranslationSessions
+from .translation_cache import TranslationCache
+from .translator_loader import get_translator
+from .events import CapsReport, braille_input_event, encode_envelope
+from .discovery import DiscoveryService
+from .hotplug import HotplugWatcher
+from .readiness import Readiness
+from .sessions import Session, SessionStore
+from .shared_state import SharedState
 from .simulated_driver import SimulatedBrailleDriver
 from .interfaces import BrailleEvent, BrailleCells, DeviceInfo
 from .manager import BrailleDeviceDriverRegistry, BrailleDeviceManager
 from .middleware import ScopeMiddleware
-from .input_router import forward_events
-from .transport import post_event
-from .settings import APP_NAME, ORCH_HOST, ORCH_PORT, DEFAULT_PERSON_ID, REQUIRED_SCOPE_INPUT, REQUIRED_SCOPE_DEVICES
+from .coalescer import EventCoalescer
+from .framebuffer import open_watcher
+from .ingest import BatchFormatError, decode_batch, decode_device_batch, group_by_device
+from .input_router import forward_events, set_event_sink
+from .transport import bind_unix_socket, close_clients, post_event, prime
+from .uplink import EventUplink
+from .settings import BACK_TRANSLATION_IDLE_SECONDS, APP_NAME, ORCH_HOST, ORCH_PORT, DEFAULT_PERSON_ID, REQUIRED_SCOPE_INPUT, REQUIRED_SCOPE_DEVICES, HOTPLUG_ENABLED, ORCH_STREAM_ENABLED, SERVICE_UDS, WARMUP_TABLES
 from .auth import AuthValidator
 
 logger = logging.getLogger("unison-io-braille.server")
@@ -25,15 +35,38 @@ logger = logging.getLogger("unison-io-braille.server")
 app = FastAPI(title=APP_NAME)
 app.add_middleware(ScopeMiddleware, required_scope=REQUIRED_SCOPE_INPUT)
 _metrics: Dict[str, int] = {}
-_ws_clients: List[WebSocket] = []
-_focus_text: Optional[str] = None
-_focus_table: str = "ueb_grade1"
+# Focus, table, viewport and websocket subscribers per (person, display).
+_sessions = SessionStore()
 _driver_registry = BrailleDeviceDriverRegistry()
 _driver_registry.register("sim", SimulatedBrailleDriver)
 _manager = BrailleDeviceManager(_driver_registry)
 _active_devices: Dict[str, DeviceInfo] = {}
 _auth = AuthValidator()
 _jwks_task: Optional[asyncio.Task] = None
+_warmup_task: Optional[asyncio.Task] = None
+_input_timer_task: Optional[asyncio.Task] = None
+# Upper bound on how long the chord timer sleeps when no driver has a deadline pending.
+_INPUT_TIMER_IDLE_SECONDS = 0.05
+# Parsing and forwarding run on this one thread, so input reaches the coalescer in arrival order.
+_input_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="braille-input")
+_readiness = Readiness()
+_discovery = DiscoveryService()
+_translations = TranslationCache()
+# Per-display shared-memory cell framebuffers for co-located renderers (None unless configured).
+_framebuffers = open_watcher(lambda device_id, cells: _manager.send_cells(device_id, cells))
+_framebuffer_task: Optional[asyncio.Task] = None
+# Folds held-key repeats, typed text and routing sweeps before forwarding.
+_coalescer = EventCoalescer()
+# Chorded input is back-translated with the table the device is reading in.
+_back_translation = BackTranslationSessions(
+    trie_for=lambda table: get_translator(table).reverse_trie(),
+    table_for=_sessions.table_for,
+)
+# Focus, device ownership and metrics shared across uvicorn workers (local-only unless configured).
+_shared = SharedState()
+_shared.metrics_source = lambda: dict(_metrics)
+# Optional long-lived event stream to the orchestrator (falls back to POST /event).
+_uplink: Optional[EventUplink] = EventUplink() if ORCH_STREAM_ENABLED else None
 
 
 def _bump(key: str) -> None:
@@ -43,6 +76,8 @@ def _bump(key: str) -> None:
 def http_post_json(host: str, port: str, path: str, payload: dict) -> tuple[bool, int, dict | None]:
     try:
         url = f"http://{host}:{port}{path}"
+        import httpx
+
         with httpx.Client(timeout=2.0) as client:
             resp = client.post(url, json=payload)
         parsed = None
@@ -56,18 +91,6 @@ def http_post_json(host: str, port: str, path: str, payload: dict) -> tuple[bool
         return (False, 0, None)
 
 
-def _cells_payload(text: str, table: str) -> Dict[str, Any]:
-    translator = TableTranslator(table)
-    cells = translator.text_to_cells(text)
-    return {
-        "table": table,
-        "rows": cells.rows,
-        "cols": cells.cols,
-        "cells": [[int(i + 1) for i, v in enumerate(cell.dots) if v] for cell in cells.cells],
-        "cursor": cells.cursor_position,
-    }
-
-
 def _ensure_scope(request: Request, required_scope: str) -> None:
     auth_header = request.headers.get("Authorization")
     if request.headers.get("X-Test-Bypass") == "1":
@@ -76,16 +99,17 @@ def _ensure_scope(request: Request, required_scope: str) -> None:
         raise HTTPException(status_code=403, detail=f"missing required scope: {required_scope}")
 
 
-async def _broadcast_focus(payload: Dict[str, Any]) -> None:
-    clients = list(_ws_clients)
+async def _broadcast_focus(session: Session) -> None:
+    """Send the session's focus to its own subscribers; sessions nobody watches are not translated."""
+    clients = session.listeners()
+    if not clients or not session.focus_text:
+        return
+    message = session.focus_frame(_translations.get(session.table, session.focus_text).payload_json)
     for ws in clients:
         try:
-            await ws.send_json({"event": "focus", "payload": payload})
+            await ws.send_text(message)
         except Exception:
-            try:
-                _ws_clients.remove(ws)
-            except ValueError:
-                pass
+            session.unsubscribe(ws)
 
 
 @app.get("/health")
@@ -95,85 +119,240 @@ def health() -> Dict[str, str]:
 
 
 @app.get("/ready")
-def ready() -> Dict[str, Any]:
+def ready(response: Response) -> Dict[str, Any]:
+    """Per-component warm-up status; 503 until every required component is warm."""
     _bump("/ready")
-    return {"ready": True}
+    snapshot = _readiness.snapshot()
+    if not snapshot["ready"]:
+        response.status_code = 503
+    return snapshot
 
 
 @app.get("/metrics")
-def metrics() -> str:
+async def metrics() -> str:
     lines = [
         "# HELP unison_io_braille_requests_total Total requests by endpoint",
         "# TYPE unison_io_braille_requests_total counter",
     ]
-    for k, v in _metrics.items():
+    counts = await _shared.metrics_all() if _shared.shared else _metrics
+    for k, v in counts.items():
         lines.append(f'unison_io_braille_requests_total{{endpoint="{k}"}} {v}')
+    cache = _translations.stats()
+    lines += [
+        "# HELP unison_io_braille_translation_cache_events_total Translation cache lookups and evictions",
+        "# TYPE unison_io_braille_translation_cache_events_total counter",
+        f'unison_io_braille_translation_cache_events_total{{result="hit"}} {cache["hits"]}',
+        f'unison_io_braille_translation_cache_events_total{{result="miss"}} {cache["misses"]}',
+        f'unison_io_braille_translation_cache_events_total{{result="eviction"}} {cache["evictions"]}',
+        "# HELP unison_io_braille_translation_cache_bytes Estimated bytes held by the translation cache",
+        "# TYPE unison_io_braille_translation_cache_bytes gauge",
+        f"unison_io_braille_translation_cache_bytes {cache['bytes']}",
+        "# HELP unison_io_braille_translation_cache_entries Entries in the translation cache",
+        "# TYPE unison_io_braille_translation_cache_entries gauge",
+        f"unison_io_braille_translation_cache_entries {cache['entries']}",
+    ]
+    lines += [
+        "# HELP unison_io_braille_coalescer_events_total Input events before (in) and after (out) coalescing",
+        "# TYPE unison_io_braille_coalescer_events_total counter",
+    ]
+    lines += [f'unison_io_braille_coalescer_events_total{{stage="{k}"}} {v}' for k, v in _coalescer.stats.items()]
+    if _uplink:
+        lines += [
+            "# HELP unison_io_braille_uplink_events_total Orchestrator stream frames by outcome",
+            "# TYPE unison_io_braille_uplink_events_total counter",
+        ]
+        lines += [f'unison_io_braille_uplink_events_total{{result="{k}"}} {v}' for k, v in _uplink.stats.items()]
+        lines.append(f"unison_io_braille_uplink_connected {int(_uplink.connected)}")
     return "\n".join(lines)
 
 
 @app.post("/braille/translate")
-def translate(text: str = Body(..., embed=True), table: str = Body("ueb_grade1", embed=True), request: Request = None) -> Dict[str, Any]:
+def translate(text: str = Body(..., embed=True), table: str = Body("ueb_grade1", embed=True), request: Request = None) -> Response:
     _bump("/braille/translate")
-    return _cells_payload(text, table)
+    return Response(content=_translations.get(table, text).payload_json, media_type="application/json")
 
 
 @app.post("/braille/focus")
-async def set_focus(text: str = Body(..., embed=True), table: str = Body("ueb_grade1", embed=True)) -> Dict[str, Any]:
-    """Accept focus text from renderer/onboarding and broadcast to subscribers."""
-    global _focus_text, _focus_table
-    _focus_text = text
-    _focus_table = table
-    payload = _cells_payload(text, table)
-    await _broadcast_focus(payload)
+async def set_focus(
+    text: str = Body(..., embed=True),
+    table: str = Body("ueb_grade1", embed=True),
+    person_id: Optional[str] = Body(None, embed=True),
+    device_id: Optional[str] = Body(None, embed=True),
+    headings: Optional[List[int]] = Body(None, embed=True),
+) -> Dict[str, Any]:
+    """
+    Accept focus text from renderer/onboarding for one (person, display) session and
+    send it to that session's subscribers on every worker. `headings` are optional
+    text offsets of headings, used by `/braille/navigate`.
+    """
+    focus = {"text": text, "table": table, "person_id": person_id, "device_id": device_id, "headings": headings}
+    session = await _apply_focus(focus)
+    await _shared.publish(_focus_topic(session), focus)
     _bump("/braille/focus")
-    return {"ok": True, "payload": payload}
+    return {
+        "ok": True,
+        "session": {"person_id": session.person_id, "device_id": session.device_id},
+        "payload": _translations.get(table, text).payload,
+    }
+
+
+def _focus_topic(session: Session) -> str:
+    """Shared topic retaining one session's latest focus, so late workers get every session's focus."""
+    return f"focus/{session.person_id}/{session.device_id}"
+
+
+async def _apply_focus(focus: Dict[str, Any]) -> Session:
+    session = _sessions.get_or_create(focus.get("person_id"), focus.get("device_id"))
+    session.set_focus(focus["text"], focus["table"], focus.get("headings"))
+    await _broadcast_focus(session)
+    return session
+
+
+@app.post("/braille/viewport")
+async def set_viewport(
+    offset: int = Body(0, embed=True),
+    cols: Optional[int] = Body(None, embed=True),
+    person_id: Optional[str] = Body(None, embed=True),
+    device_id: Optional[str] = Body(None, embed=True),
+) -> Dict[str, Any]:
+    """Pan or resize a session's viewport; subscribers get the focus again with the new window."""
+    session = _sessions.get_or_create(person_id, device_id)
+    session.set_viewport(offset, cols)
+    await _broadcast_focus(session)
+    _bump("/braille/viewport")
+    return {"ok": True, "viewport": session.viewport.__dict__}
+
+
+@app.post("/braille/navigate")
+async def navigate(
+    target: str = Body(..., embed=True),
+    direction: str = Body("next", embed=True),
+    query: Optional[str] = Body(None, embed=True),
+    cell: int = Body(0, embed=True),
+    person_id: Optional[str] = Body(None, embed=True),
+    device_id: Optional[str] = Body(None, embed=True),
+) -> Dict[str, Any]:
+    """
+    Move a session's viewport through its focus document: `target` is line, word,
+    paragraph, heading or search (`query`), `direction` next or prev. The viewport
+    is panned to the start of the line holding the target.
+    `target=routing` resolves routing key `cell` (cell-N) to a text offset instead.
+    """
+    session = _sessions.get_or_create(person_id, device_id)
+    _bump("/braille/navigate")
+    try:
+        result = await asyncio.to_thread(session.navigate, get_translator, target, direction, query, cell)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if target != "routing" and result["ok"]:
+        await _broadcast_focus(session)
+    return result
+
+
+_shared.on_topic("focus", _apply_focus)
+_sessions.on_evict = lambda session: _shared.retract(_focus_topic(session))
 
 
 @app.websocket("/braille/output")
-async def websocket_output(ws: WebSocket):
+async def websocket_output(ws: WebSocket, person_id: Optional[str] = None, device_id: Optional[str] = None):
+    """Focus stream for one session (`?person_id=&device_id=`; defaults to the local user's default display)."""
     await ws.accept()
-    _ws_clients.append(ws)
+    session = _sessions.get_or_create(person_id, device_id)
+    session.subscribe(ws)
+    # This worker may have evicted and retracted the session earlier; keep its focus retained.
+    _shared.hold(_focus_topic(session))
     try:
-        await ws.send_json({"event": "connected", "service": APP_NAME, "ts": time.time()})
-        if _focus_text:
-            await _broadcast_focus(_cells_payload(_focus_text, _focus_table))
+        await ws.send_json({"event": "connected", "service": APP_NAME, "ts": time.time(), "person_id": session.person_id, "device_id": session.device_id})
+        if session.focus_text:
+            # Served from the translation cache: reconnects cost no translation work.
+            await ws.send_text(session.focus_frame(_translations.get(session.table, session.focus_text).payload_json))
         while True:
-            try:
-                data = await ws.receive_bytes()
-                # Treat incoming bytes as Braille device packets for simulation; forward to orchestrator.
-                evt = BrailleEvent(type="text", keys=(), text=data.decode(errors="ignore"))
-                forward_events([evt])
-            except WebSocketDisconnect:
+            message = await ws.receive()
+            if message["type"] == "websocket.disconnect":
                 break
+            if message.get("bytes") is not None:
+                # Device-tagged packet batch (see ingest.py), parsed by the attached drivers.
+                try:
+                    await _ingest(decode_batch(message["bytes"]))
+                except BatchFormatError as exc:
+                    await ws.send_json({"event": "error", "error": str(exc)})
+            elif message.get("text"):
+                # Plain text typed by a simulated display for this session, in order with its packets.
+                await _run_input(_forward_typed, session, message["text"])
     finally:
-        try:
-            _ws_clients.remove(ws)
-        except ValueError:
-            pass
+        session.unsubscribe(ws)
         _bump("/braille/output/ws_closed")
 
 
+async def _report_discovered(added: List[DeviceInfo], removed: List[DeviceInfo]) -> None:
+    """Emit caps.report when USB devices appear or disappear, off the event loop."""
+    changes = [(dev, True) for dev in added] + [(dev, False) for dev in removed]
+    for dev, present in changes:
+        if dev.transport != "usb":
+            continue
+        envelope = encode_envelope(CapsReport(person_id=DEFAULT_PERSON_ID, device=dev, present=present).to_envelope())
+        if _uplink:
+            _uplink.submit(envelope)
+        else:
+            await asyncio.to_thread(post_event, ORCH_HOST, ORCH_PORT, "/event", envelope)
+
+
+async def _claim(info: DeviceInfo) -> bool:
+    """Pin a device to this worker; False if another worker already owns it."""
+    return await _shared.claim_device(info.id, info.__dict__) == _shared.worker_id
+
+
+def _on_attached(info: DeviceInfo, person_id: str | None = None) -> None:
+    _active_devices[info.id] = info
+    cells = (info.capabilities or {}).get("cells")
+    _sessions.bind_device(info.id, person_id, cols=cells)
+    if _framebuffers:
+        _framebuffers.add(info.id, int(cells or 80))
+
+
+def _on_detached(device_id: str) -> None:
+    _active_devices.pop(device_id, None)
+    _sessions.unbind_device(device_id)
+    _back_translation.forget(device_id)
+    if _framebuffers:
+        _framebuffers.remove(device_id)
+
+
+_discovery.add_listener(_report_discovered)
+_hotplug: Optional[HotplugWatcher] = None
+if HOTPLUG_ENABLED:
+    _hotplug = HotplugWatcher(
+        _manager,
+        _discovery,
+        on_attach=lambda dev: _on_attached(dev),
+        on_detach=lambda dev_id: _on_detached(dev_id),
+        claim=lambda dev: _claim(dev),
+        release=lambda dev_id: _shared.release_device(dev_id),
+    )
+
+
 @app.get("/braille/devices/discover")
-async def discover_devices() -> Dict[str, Any]:
-    """Enumerate USB and Bluetooth devices; returns cached results."""
-    usb = list(enumerate_usb())
-    bt = []
-    try:
-        bt = list(await enumerate_bluetooth())
-    except Exception:
-        bt = []
-    devices = [d.__dict__ for d in usb + bt]
+async def discover_devices(refresh: bool = False, since: Optional[int] = None, timeout: float = 30.0) -> Dict[str, Any]:
+    """
+    Return the cached USB/Bluetooth discovery table (background rescans keep it fresh).
+    `refresh=true` forces a rescan first; `since=<version>` long-polls up to `timeout`
+    seconds for the table to change.
+    """
     _bump("/braille/devices/discover")
-    # Emit caps.report for first device, best effort
-    if usb:
-        envelope = CapsReport(person_id=DEFAULT_PERSON_ID, device=usb[0]).to_envelope()
-        post_event(ORCH_HOST, ORCH_PORT, "/event", envelope)
-    return {"devices": devices}
+    if refresh:
+        return await _discovery.refresh()
+    if since is not None:
+        await _discovery.wait_for_change(since, timeout=max(0.0, min(timeout, 60.0)))
+    return _discovery.snapshot()
 
 
 @app.post("/braille/devices/attach")
-def attach_device(device: Dict[str, Any] = Body(..., embed=True), request: Request = None) -> Dict[str, Any]:
-    """Manually attach a device record (for testing or static config)."""
+async def attach_device(
+    device: Dict[str, Any] = Body(..., embed=True),
+    person_id: Optional[str] = Body(None, embed=True),
+    request: Request = None,
+) -> Dict[str, Any]:
+    """Manually attach a device record (for testing or static config), optionally for a specific person."""
     if request:
         _ensure_scope(request, REQUIRED_SCOPE_DEVICES)
     info = DeviceInfo(
@@ -184,40 +363,287 @@ def attach_device(device: Dict[str, Any] = Body(..., embed=True), request: Reque
         name=device.get("name"),
         capabilities=device.get("capabilities") or {},
     )
-    _manager.attach(info)
-    _active_devices[info.id] = info
     _bump("/braille/devices/attach")
-    return {"ok": True, "device": info.__dict__}
+    if not await _claim(info):
+        # Pinned to another worker; it keeps the driver and receives this device's input.
+        return {"ok": True, "device": info.__dict__, "owner": (await _shared.devices()).get(info.id, {}).get("owner")}
+    await asyncio.to_thread(_manager.attach, info)
+    _on_attached(info, person_id)
+    framebuffer = _framebuffers.path_for(info.id) if _framebuffers else None
+    return {"ok": True, "device": info.__dict__, "owner": _shared.worker_id, "framebuffer": framebuffer}
+
+
+@app.post("/braille/devices/trace")
+async def trace_device(device_id: str = Body(..., embed=True), record: bool = Body(True, embed=True), request: Request = None) -> Dict[str, Any]:
+    """Start/stop recording a device's raw input packets to a replayable trace file."""
+    if request:
+        _ensure_scope(request, REQUIRED_SCOPE_DEVICES)
+    _bump("/braille/devices/trace")
+    if record and not _manager.trace_dir:
+        raise HTTPException(status_code=409, detail="trace recording is disabled: set UNISON_BRAILLE_TRACE_DIR")
+    if record:
+        path = await asyncio.to_thread(_manager.start_recording, device_id)
+    else:
+        path = await asyncio.to_thread(_manager.stop_recording, device_id)
+    if path is None:
+        return {"ok": False, "error": "device not attached here" if record else "not recording"}
+    return {"ok": True, "recording": record, "path": path}
 
 
 @app.get("/braille/devices")
-def list_devices() -> Dict[str, Any]:
-    return {"devices": [d.__dict__ for d in _active_devices.values()]}
+async def list_devices() -> Dict[str, Any]:
+    if not _shared.shared:
+        return {"devices": [d.__dict__ for d in _active_devices.values()]}
+    return {"devices": [{**e["device"], "owner": e["owner"]} for e in (await _shared.devices()).values()]}
+
+
+async def _run_input(fn, *args):
+    """Run an input step on the input thread, after everything queued before it."""
+    return await asyncio.get_running_loop().run_in_executor(_input_executor, fn, *args)
+
+
+def _handle_packets(grouped: Dict[str, List[bytes]]) -> Dict[str, Any]:
+    """
+    Parse each device's packets with its driver and forward the resulting events,
+    one batch per device (runs in a worker thread). Returns counts plus the packets
+    of devices not attached to this worker.
+    """
+    events_total = 0
+    unknown: Dict[str, List[bytes]] = {}
+    for device_id, packets in grouped.items():
+        events = _manager.on_packets(device_id, packets)
+        if events is None:
+            unknown[device_id] = packets
+            continue
+        events = _back_translation.process(device_id, events)
+        events_total += len(events)
+        events = _coalescer.push(device_id, events)
+        if events:
+            forward_events(events, _sessions.person_for(device_id))
+    return {"events": events_total, "unknown": unknown}
+
+
+async def _ingest(packets: List[Tuple[str, bytes]]) -> Dict[str, Any]:
+    """Route a packet batch through local drivers, then other workers; counts what was accepted."""
+    result = await _run_input(_handle_packets, group_by_device(packets))
+    rejected: Dict[str, int] = {}
+    for device_id, pending in result["unknown"].items():
+        for data in pending:
+            if not await _shared.route_input(device_id, data):
+                rejected[device_id] = rejected.get(device_id, 0) + 1
+    accepted = len(packets) - sum(rejected.values())
+    return {"packets": accepted, "events": result["events"], "rejected": rejected}
+
+
+def _forward_polled(polled: Dict[str, List[BrailleEvent]], flushed: Dict[str, List[BrailleEvent]]) -> None:
+    for device_id, events in polled.items():
+        events = _coalescer.push(device_id, _back_translation.process(device_id, events))
+        if events:
+            forward_events(events, _sessions.person_for(device_id))
+    for device_id, events in flushed.items():
+        forward_events(events, _sessions.person_for(device_id))
+
+
+def _forward_typed(session: Session, text: str) -> None:
+    evt = BrailleEvent(type="text", keys=(), text=text, device_id=session.device_id)
+    if _sessions.person_for(session.device_id) == session.person_id:
+        _forward_polled({session.device_id: [evt]}, {})
+    else:
+        # Coalesced events are released under the display's bound person, not this session's.
+        forward_events([evt], session.person_id)
+
+
+def _commit_idle_text(flushed: Dict[str, List[BrailleEvent]]) -> None:
+    """Append text committed from contractions left pending by idle devices (after any coalesced events)."""
+    for device_id, text in _back_translation.flush_idle(BACK_TRANSLATION_IDLE_SECONDS).items():
+        event = BrailleEvent(type="text", keys=(), text=text, device_id=device_id)
+        flushed.setdefault(device_id, []).append(event)
+
+
+async def _input_timer_loop() -> None:
+    """
+    Fire chord hold timeouts/autorepeat, release coalesced events when their window
+    closes and commit back-translation left pending by idle devices.
+    """
+    while True:
+        try:
+            deadlines = [d for d in (_manager.next_input_deadline(), _coalescer.deadline) if d is not None]
+            delay = min(deadlines) - time.monotonic() if deadlines else _INPUT_TIMER_IDLE_SECONDS
+            await asyncio.sleep(min(max(delay, 0.001), _INPUT_TIMER_IDLE_SECONDS))
+            polled = _manager.poll_input()
+            flushed = _coalescer.flush()
+            _commit_idle_text(flushed)
+            if polled or flushed:
+                await _run_input(_forward_polled, polled, flushed)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            # One bad tick must not stop chord timeouts, autorepeat and coalescer flushes for good.
+            logger.exception("input_timer_failed %s", exc)
+            await asyncio.sleep(_INPUT_TIMER_IDLE_SECONDS)
+
+
+def _log_input_failure(future: Future) -> None:
+    exc = future.exception()
+    if exc:
+        logger.error("transport_input_failed %s", exc, exc_info=exc)
+
+
+def _transport_input(device_id: str, events: List[BrailleEvent]) -> None:
+    """Event sink for transports that receive and parse input on their own threads (BLE, serial)."""
+    _input_executor.submit(_forward_polled, {device_id: events}, {}).add_done_callback(_log_input_failure)
+
+
+async def _process_input(device_id: str, data: bytes) -> bool:
+    """Parse input on this worker's driver and forward the events; False if not attached here."""
+    result = await _run_input(_handle_packets, {device_id: [data]})
+    return not result["unknown"]
+
+
+_shared.on_input(_process_input)
+
+
+_INPUT_DECODERS = {
+    "utf-8": lambda data: data.encode("utf-8"),
+    "latin-1": lambda data: data.encode("latin-1"),
+    "base64": base64.b64decode,
+    "hex": bytes.fromhex,
+}
 
 
 @app.post("/braille/input")
-def ingest_input(device_id: str = Body(..., embed=True), data: str = Body(..., embed=True), request: Request = None) -> Dict[str, Any]:
-    """Inject raw input bytes for a device (sim/dev); forwards resulting BrailleEvents to orchestrator."""
+async def ingest_input(
+    device_id: str = Body(..., embed=True),
+    data: str = Body(..., embed=True),
+    encoding: str = Body("utf-8", embed=True),
+    request: Request = None,
+) -> Dict[str, Any]:
+    """
+    Inject raw input bytes for a device (sim/dev); forwards resulting BrailleEvents to orchestrator.
+    `encoding` says how `data` carries the bytes: utf-8 (text), latin-1, base64 or hex;
+    use base64/hex/latin-1 for binary reports with bytes >= 0x80 (e.g. chord masks).
+    """
     if request:
         _ensure_scope(request, REQUIRED_SCOPE_INPUT)
-    drv = _manager.active.get(device_id)
-    if not drv:
+    decode = _INPUT_DECODERS.get(encoding)
+    if decode is None:
+        raise HTTPException(status_code=400, detail=f"unsupported encoding: {encoding}")
+    try:
+        raw = decode(data)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=f"invalid {encoding} data: {exc}")
+    if not (await _ingest([(device_id, raw)]))["packets"]:
         return {"ok": False, "error": "device not attached"}
-    events = drv.on_packet(data.encode())
-    forward_events(events)
     _bump("/braille/input")
     return {"ok": True}
 
 
+@app.post("/braille/input/batch")
+async def ingest_batch(request: Request, device_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Bulk raw packets as application/octet-stream. Records are `u8 id length, device id,
+    u16 LE length, packet`; with `?device_id=` the id is omitted (`u16 LE length, packet`).
+    """
+    _ensure_scope(request, REQUIRED_SCOPE_INPUT)
+    body = await request.body()
+    try:
+        packets = decode_device_batch(device_id, body) if device_id else decode_batch(body)
+    except BatchFormatError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    result = await _ingest(packets)
+    _bump("/braille/input/batch")
+    return {"ok": not result["rejected"], **result}
+
+
+def _warm_tables() -> Dict[str, Any]:
+    out = {}
+    for table in WARMUP_TABLES:
+        translator = get_translator(table)
+        if hasattr(translator, "reverse_trie"):
+            translator.reverse_trie()
+        out[table] = _translations.get(table, APP_NAME).payload["cols"] > 0
+    return out
+
+
+async def _warm_jwks() -> Dict[str, Any]:
+    await asyncio.to_thread(_auth._ensure_jwks)
+    if not _auth.jwks:
+        raise RuntimeError("JWKS fetch failed")
+    return {"keys": len(_auth.jwks.get("keys", []))}
+
+
+async def _warm_devices() -> Dict[str, Any]:
+    # One USB pass so hotplug attaches (opens) known displays before traffic arrives.
+    await _discovery.scan_once(usb=True, bt=False)
+    return {"attached": len(_hotplug.attached) if _hotplug else 0}
+
+
+async def _warm_orchestrator() -> Dict[str, Any]:
+    if _uplink:
+        return {"stream": _uplink.connected, "status": await asyncio.to_thread(prime, ORCH_HOST, ORCH_PORT)}
+    return {"status": await asyncio.to_thread(prime, ORCH_HOST, ORCH_PORT)}
+
+
+async def _warm_up() -> None:
+    steps = {"tables": lambda: asyncio.to_thread(_warm_tables), "orchestrator": _warm_orchestrator}
+    if _auth.jwks_url:
+        steps["jwks"] = _warm_jwks
+    else:
+        _readiness.skip("jwks", "not configured")
+    if _hotplug:
+        steps["devices"] = _warm_devices
+    else:
+        _readiness.skip("devices", "hotplug disabled", required=False)
+    # Devices may legitimately be absent and the orchestrator may come up later: report, don't gate.
+    ok = await _readiness.warm_up(steps, optional=("devices", "orchestrator"))
+    logger.info("warmup_done ready=%s %s", ok, _readiness.snapshot()["warmup_ms"])
+
+
 @app.on_event("startup")
 async def on_startup():
-    global _jwks_task
+    global _jwks_task, _warmup_task, _input_timer_task, _framebuffer_task
+    await _shared.start()
+    _manager.event_sink = _transport_input
+    if _uplink:
+        await _uplink.start()
+        set_event_sink(_uplink.submit)
     if hasattr(_auth, "refresh_loop"):
         _jwks_task = asyncio.create_task(_auth.refresh_loop())
+    _discovery.start()
+    if _hotplug:
+        _hotplug.start()
+    _warmup_task = asyncio.create_task(_warm_up())
+    _input_timer_task = asyncio.create_task(_input_timer_loop())
+    if _framebuffers:
+        _framebuffer_task = asyncio.create_task(_framebuffers.run())
 
 
 @app.on_event("shutdown")
 async def on_shutdown():
+    if _input_timer_task:
+        _input_timer_task.cancel()
+    if _framebuffer_task:
+        _framebuffer_task.cancel()
+    if _framebuffers:
+        _framebuffers.close()
+    flushed = _coalescer.flush(force=True)
+    if flushed:
+        await _run_input(_forward_polled, {}, flushed)
+    if _warmup_task and not _warmup_task.done():
+        _warmup_task.cancel()
+        try:
+            await _warmup_task
+        except (asyncio.CancelledError, Exception):
+            pass
+    if _hotplug:
+        await _hotplug.stop()
+    await _discovery.stop()
+    await asyncio.to_thread(_manager.close_all)
+    if _uplink:
+        set_event_sink(None)
+        await _uplink.stop()
+    close_clients()
+    await _shared.stop()
     if _jwks_task:
         _jwks_task.cancel()
         try:
@@ -226,6 +652,16 @@ async def on_shutdown():
             pass
 
 
+def serve(port: int, uds: str | None = SERVICE_UDS) -> None:
+    """Serve on TCP and, when configured, also on a Unix socket for co-located renderers."""
+    import uvicorn
+
+    config = uvicorn.Config(app, host="0.0.0.0", port=port)
+    sockets = [config.bind_socket()]
+    if uds:
+        sockets.append(bind_unix_socket(uds))
+    uvicorn.Server(config).run(sockets=sockets)
+
+
 if __name__ == "__main__":
-    port = int(os.getenv("SERVICE_PORT") or os.getenv("BRAILLE_PORT", "8090"))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    serve(int(os.getenv("SERVICE_PORT") or os.getenv("BRAILLE_PORT", "8090")))
@@ -0,0 +1,271 @@
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from .nav_index import KINDS, NavIndex, SegmentTranslator
+from .settings import DEFAULT_PERSON_ID, SESSION_MAX, SESSION_SHARDS
+
+# Device id used by renderers and websocket clients that do not name a display.
+DEFAULT_DEVICE_ID = "default"
+DEFAULT_TABLE = "ueb_grade1"
+
+SessionKey = Tuple[str, str]  # (person_id, device_id)
+
+
+@dataclass
+class Viewport:
+    offset: int = 0
+    cols: Optional[int] = None  # None: the whole focus line
+
+
+@dataclass(eq=False)
+class Session:
+    """Focus, table, viewport and websocket subscribers of one person on one display."""
+
+    person_id: str
+    device_id: str
+    table: str = DEFAULT_TABLE
+    focus_text: Optional[str] = None
+    headings: List[int] = field(default_factory=list)  # text offsets supplied by the renderer
+    viewport: Viewport = field(default_factory=Viewport)
+    subscribers: Set[Any] = field(default_factory=set)
+    version: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    _prefix: str = field(default="", repr=False)
+    _nav: Optional[NavIndex] = field(default=None, repr=False)
+
+    def __post_init__(self) -> None:
+        self._update_prefix()
+
+    @property
+    def key(self) -> SessionKey:
+        return (self.person_id, self.device_id)
+
+    def set_focus(self, text: str, table: str | None = None, headings: List[int] | None = None) -> int:
+        with self._lock:
+            self.focus_text = text
+            if table:
+                self.table = table
+            self.headings = sorted(headings or ())
+            self.version += 1
+            self.last_used = time.monotonic()
+            return self.version
+
+    def set_viewport(self, offset: int = 0, cols: int | None = None) -> None:
+        with self._lock:
+            self.viewport = Viewport(offset=max(0, int(offset)), cols=cols)
+            self.last_used = time.monotonic()
+            self._update_prefix()
+
+    def navigation(self, translator_for: Callable[[str], SegmentTranslator]) -> NavIndex:
+        """
+        Navigation index for the current focus and viewport width. Kept across focus
+        changes and brought up to date with an incremental edit; rebuilt only when
+        the table changes. The index is shared: query it through `navigate`, which
+        holds the session lock, when other requests may update it concurrently.
+        """
+        with self._lock:
+            return self._navigation(translator_for)
+
+    def _navigation(self, translator_for: Callable[[str], SegmentTranslator]) -> NavIndex:
+        index = self._nav
+        if index is None or index.table != self.table:
+            index = self._nav = NavIndex.build(self.focus_text or "", translator_for(self.table), self.viewport.cols, table=self.table)
+        else:
+            index.sync(self.focus_text or "")
+            index.set_width(self.viewport.cols)
+        index.headings = list(self.headings)
+        return index
+
+    def navigate(
+        self,
+        translator_for: Callable[[str], SegmentTranslator],
+        target: str,
+        direction: str = "next",
+        query: str | None = None,
+        cell: int = 0,
+    ) -> Dict[str, Any]:
+        """
+        Resolve a navigation request and pan the viewport to the start of the line
+        holding the target, all under the session lock. `target=routing` maps
+        routing key `cell` to a text offset without moving. ValueError for an
+        unknown target or direction.
+        """
+        with self._lock:
+            index = self._navigation(translator_for)
+            offset = self.viewport.offset
+            if target == "routing":
+                cell_offset = offset + cell
+                return {"ok": cell_offset < index.cells, "cell": cell_offset, "text_offset": index.route(offset, cell)}
+            if direction not in ("next", "prev"):
+                raise ValueError(f"unknown direction: {direction}")
+            if target == "search":
+                found = index.find(query or "", offset, backwards=direction == "prev")
+            elif target in KINDS:
+                found = getattr(index, direction)(target, offset)
+            else:
+                raise ValueError(f"unknown navigation target: {target}")
+            if found is None:
+                return {"ok": False, "viewport": dict(self.viewport.__dict__)}
+            self.viewport = Viewport(offset=index.line_start(found), cols=self.viewport.cols)
+            self.last_used = time.monotonic()
+            self._update_prefix()
+            return {"ok": True, "cell": found, "text_offset": index.cell_to_text(found), "viewport": dict(self.viewport.__dict__)}
+
+    def subscribe(self, ws: Any) -> None:
+        with self._lock:
+            self.subscribers.add(ws)
+
+    def unsubscribe(self, ws: Any) -> None:
+        with self._lock:
+            self.subscribers.discard(ws)
+
+    def listeners(self) -> List[Any]:
+        with self._lock:
+            return list(self.subscribers)
+
+    def focus_frame(self, payload_json: str) -> str:
+        """Websocket focus frame for this session around an already serialized payload."""
+        return f"{self._prefix}{payload_json}}}"
+
+    def _update_prefix(self) -> None:
+        head = json.dumps(
+            {
+                "person_id": self.person_id,
+                "device_id": self.device_id,
+                "viewport": {"offset": self.viewport.offset, "cols": self.viewport.cols},
+            },
+            separators=(",", ":"),
+            ensure_ascii=False,
+        )
+        self._prefix = f'{{"event":"focus","session":{head},"payload":'
+
+
+class _Shard:
+    __slots__ = ("lock", "sessions", "devices")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.sessions: Dict[SessionKey, Session] = {}
+        self.devices: Dict[str, str] = {}  # device_id → person_id
+
+
+class SessionStore:
+    """
+    Sessions keyed by (person, device), spread over independently locked shards.
+    A shard lock is only held for dictionary lookups; focus changes and fan-out
+    then work on the session itself, so updates for one session never block or
+    wake another.
+    Past `max_sessions`, creating a session evicts the least recently used ones
+    that are idle (no display bound, no subscribers) and reports each to `on_evict`.
+    """
+
+    def __init__(self, shards: int = SESSION_SHARDS, max_sessions: int = SESSION_MAX) -> None:
+        self._shards = tuple(_Shard() for _ in range(max(1, shards)))
+        self.max_sessions = max_sessions
+        self.on_evict: Optional[Callable[[Session], None]] = None
+
+    def _shard(self, key: Any) -> _Shard:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def get(self, person_id: str, device_id: str = DEFAULT_DEVICE_ID) -> Optional[Session]:
+        key = (person_id, device_id)
+        shard = self._shard(key)
+        with shard.lock:
+            return shard.sessions.get(key)
+
+    def get_or_create(self, person_id: str | None = None, device_id: str | None = None) -> Session:
+        key = (person_id or DEFAULT_PERSON_ID, device_id or DEFAULT_DEVICE_ID)
+        shard = self._shard(key)
+        with shard.lock:
+            session = shard.sessions.get(key)
+            created = session is None
+            if created:
+                session = shard.sessions[key] = Session(person_id=key[0], device_id=key[1])
+            else:
+                session.last_used = time.monotonic()
+        if created and self.max_sessions and len(self) > self.max_sessions:
+            self.evict_idle(keep=session)
+        return session
+
+    def evict_idle(self, keep: Session | None = None) -> List[Session]:
+        """Evict idle sessions, oldest first, down to 90% of `max_sessions` (batched so creation stays cheap)."""
+        excess = len(self) - self.max_sessions * 9 // 10
+        if excess <= 0:
+            return []
+        bound = set()
+        for shard in self._shards:
+            with shard.lock:
+                bound.update(shard.devices.items())
+        idle = [
+            s for s in self.sessions()
+            if s is not keep and (s.device_id, s.person_id) not in bound and not s.listeners()
+        ]
+        idle.sort(key=lambda s: s.last_used)
+        evicted = [s for s in idle[:excess] if self._remove_if(s)]
+        for session in evicted:
+            if self.on_evict:
+                self.on_evict(session)
+        return evicted
+
+    def _remove_if(self, session: Session) -> bool:
+        shard = self._shard(session.key)
+        with shard.lock:
+            if shard.sessions.get(session.key) is session and not session.listeners():
+                del shard.sessions[session.key]
+                return True
+        return False
+
+    def remove(self, person_id: str, device_id: str) -> Optional[Session]:
+        key = (person_id, device_id)
+        shard = self._shard(key)
+        with shard.lock:
+            return shard.sessions.pop(key, None)
+
+    def bind_device(self, device_id: str, person_id: str | None = None, cols: int | None = None) -> Session:
+        """Assign a display to a person; its input envelopes then carry that person."""
+        person_id = person_id or DEFAULT_PERSON_ID
+        shard = self._shard(device_id)
+        with shard.lock:
+            previous = shard.devices.get(device_id)
+            shard.devices[device_id] = person_id
+        if previous and previous != person_id:
+            self.remove(previous, device_id)
+        session = self.get_or_create(person_id, device_id)
+        if cols and session.viewport.cols is None:
+            session.set_viewport(session.viewport.offset, cols)
+        return session
+
+    def unbind_device(self, device_id: str) -> None:
+        shard = self._shard(device_id)
+        with shard.lock:
+            person_id = shard.devices.pop(device_id, None)
+        if person_id:
+            self.remove(person_id, device_id)
+
+    def person_for(self, device_id: str | None) -> str:
+        if not device_id:
+            return DEFAULT_PERSON_ID
+        shard = self._shard(device_id)
+        with shard.lock:
+            return shard.devices.get(device_id, DEFAULT_PERSON_ID)
+
+    def for_device(self, device_id: str) -> Session:
+        return self.get_or_create(self.person_for(device_id), device_id)
+
+    def table_for(self, device_id: str) -> str:
+        session = self.get(self.person_for(device_id), device_id)
+        return session.table if session else DEFAULT_TABLE
+
+    def sessions(self) -> List[Session]:
+        out: List[Session] = []
+        for shard in self._shards:
+            with shard.lock:
+                out.extend(shard.sessions.values())
+        return out
+
+    def __len__(self) -> int:
+        return sum(len(shard.sessions) for shard in self._shards)
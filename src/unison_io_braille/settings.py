@@ -12,3 +12,35 @@ AUTH_JWKS_URL = os.getenv("UNISON_AUTH_JWKS_URL")
 AUTH_INTROSPECT_URL = os.getenv("UNISON_AUTH_INTROSPECT_URL")
 AUTH_CLIENT_ID = os.getenv("UNISON_AUTH_CLIENT_ID")
 AUTH_CLIENT_SECRET = os.getenv("UNISON_AUTH_CLIENT_SECRET")
+DISCOVERY_INTERVAL_SECONDS = float(os.getenv("UNISON_BRAILLE_DISCOVERY_INTERVAL", "30"))
+DISCOVERY_BT_TIMEOUT_SECONDS = float(os.getenv("UNISON_BRAILLE_BT_SCAN_TIMEOUT", "4"))
+DISCOVERY_BT_STALE_SECONDS = float(os.getenv("UNISON_BRAILLE_BT_STALE_AFTER", "120"))
+HOTPLUG_ENABLED = os.getenv("UNISON_BRAILLE_HOTPLUG", "true").lower() in {"1", "true", "yes"}
+HOTPLUG_POLL_SECONDS = float(os.getenv("UNISON_BRAILLE_HOTPLUG_POLL", "2"))
+IO_QUEUE_SIZE = int(os.getenv("UNISON_BRAILLE_IO_QUEUE", "32"))
+TRANSLATION_CACHE_BYTES = int(os.getenv("UNISON_BRAILLE_TRANSLATION_CACHE_BYTES", str(4 * 1024 * 1024)))
+STATE_SOCKET = os.getenv("UNISON_BRAILLE_STATE_SOCKET")
+STATE_METRICS_INTERVAL_SECONDS = float(os.getenv("UNISON_BRAILLE_STATE_METRICS_INTERVAL", "2"))
+SESSION_SHARDS = int(os.getenv("UNISON_BRAILLE_SESSION_SHARDS", "16"))
+# Sessions beyond this many are evicted least recently used first (bound displays and live subscribers are kept).
+SESSION_MAX = int(os.getenv("UNISON_BRAILLE_SESSION_MAX", "10000"))
+ORCH_STREAM_ENABLED = os.getenv("UNISON_BRAILLE_ORCH_STREAM", "false").lower() in {"1", "true", "yes"}
+ORCH_STREAM_PATH = os.getenv("UNISON_BRAILLE_ORCH_STREAM_PATH", "/event/stream")
+ORCH_STREAM_WINDOW = int(os.getenv("UNISON_BRAILLE_ORCH_STREAM_WINDOW", "256"))
+ORCH_STREAM_RETRY_SECONDS = float(os.getenv("UNISON_BRAILLE_ORCH_STREAM_RETRY", "5"))
+SERVICE_UDS = os.getenv("UNISON_BRAILLE_UDS")
+WARMUP_TABLES = [t.strip() for t in os.getenv("UNISON_BRAILLE_WARMUP_TABLES", "ueb_grade1,ueb_grade2").split(",") if t.strip()]
+TRACE_DIR = os.getenv("UNISON_BRAILLE_TRACE_DIR")
+CHORD_HOLD_SECONDS = float(os.getenv("UNISON_BRAILLE_CHORD_HOLD_MS", "500")) / 1000
+CHORD_REPEAT_DELAY_SECONDS = float(os.getenv("UNISON_BRAILLE_CHORD_REPEAT_DELAY_MS", "400")) / 1000
+CHORD_REPEAT_INTERVAL_SECONDS = float(os.getenv("UNISON_BRAILLE_CHORD_REPEAT_INTERVAL_MS", "100")) / 1000
+# Pending contractions (e.g. a last word typed without a trailing space) are committed after this much idle time.
+BACK_TRANSLATION_IDLE_SECONDS = float(os.getenv("UNISON_BRAILLE_BACK_TRANSLATION_IDLE_MS", "1000")) / 1000
+COALESCE_WINDOW_SECONDS = float(os.getenv("UNISON_BRAILLE_COALESCE_MS", "40")) / 1000
+FRAMEBUFFER_DIR = os.getenv("UNISON_BRAILLE_FRAMEBUFFER_DIR")
+FRAMEBUFFER_POLL_SECONDS = float(os.getenv("UNISON_BRAILLE_FRAMEBUFFER_POLL_MS", "2")) / 1000
+BLE_WINDOW = int(os.getenv("UNISON_BRAILLE_BLE_WINDOW", "8"))
+BLE_CONNECT_TIMEOUT_SECONDS = float(os.getenv("UNISON_BRAILLE_BLE_CONNECT_TIMEOUT", "10"))
+SERIAL_BAUD = int(os.getenv("UNISON_BRAILLE_SERIAL_BAUD", "19200"))
+SERIAL_FLOW = os.getenv("UNISON_BRAILLE_SERIAL_FLOW", "none")
+SERIAL_TX_LIMIT = int(os.getenv("UNISON_BRAILLE_SERIAL_TX_LIMIT", "4096"))
@@ -0,0 +1,465 @@
+import asyncio
+import base64
+import fcntl
+import itertools
+import json
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from .settings import STATE_SOCKET, STATE_METRICS_INTERVAL_SECONDS
+
+logger = logging.getLogger("unison-io-braille.shared_state")
+
+TopicHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+InputHandler = Callable[[str, bytes], Awaitable[None]]
+
+
+def _encode(msg: Dict[str, Any]) -> bytes:
+    return json.dumps(msg, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+class StateBroker:
+    """
+    Single-host state broker on a Unix domain socket (newline-delimited JSON).
+    Hosted inside whichever worker holds the lock file; keeps the latest value per
+    topic, the device → owning worker table and per-worker metrics, and fans
+    published topics out to every other worker. A retained topic is held by every
+    worker it was delivered to (or that asked to hold it) and is dropped once all
+    of them have retracted it or gone away.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.topics: Dict[str, Dict[str, Any]] = {}
+        self.holders: Dict[str, Set[str]] = {}  # topic → workers still holding it
+        self.devices: Dict[str, Dict[str, Any]] = {}
+        self.metrics: Dict[str, Dict[str, int]] = {}
+        self._clients: Dict[asyncio.StreamWriter, str] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+        self._server = await asyncio.start_unix_server(self._handle, path=self.path)
+        os.chmod(self.path, 0o600)  # workers run as one user; nobody else may publish or route input
+
+    async def close(self) -> None:
+        if self._server:
+            self._server.close()
+            for writer in list(self._clients):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def _send(self, writer: asyncio.StreamWriter, msg: Dict[str, Any]) -> None:
+        try:
+            writer.write(_encode(msg))
+        except Exception:  # pragma: no cover
+            pass
+
+    def _owner_writer(self, worker: str) -> Optional[asyncio.StreamWriter]:
+        return next((w for w, wid in self._clients.items() if wid == worker), None)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        worker = ""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                msg = json.loads(line)
+                op = msg.get("op")
+                rid = msg.get("rid")
+                if op == "hello":
+                    worker = str(msg["worker"])
+                    self._clients[writer] = worker
+                    for holders in self.holders.values():
+                        holders.add(worker)
+                    self._send(writer, {"op": "reply", "rid": rid, "topics": self.topics})
+                elif op == "publish":
+                    topic = msg["topic"]
+                    self.topics[topic] = msg["data"]
+                    self.holders[topic] = set(self._clients.values())
+                    event = _encode({"op": "event", "topic": topic, "data": msg["data"]})
+                    for other in self._clients:
+                        if other is not writer:
+                            other.write(event)
+                elif op == "hold":
+                    if msg["topic"] in self.topics:
+                        self.holders[msg["topic"]].add(worker)
+                elif op == "retract":
+                    self._unhold(msg["topic"], worker)
+                elif op == "claim":
+                    entry = self.devices.get(msg["device_id"])
+                    if entry is None or self._owner_writer(entry["owner"]) is None:
+                        entry = {"owner": worker, "device": msg.get("device") or {}}
+                        self.devices[msg["device_id"]] = entry
+                    self._send(writer, {"op": "reply", "rid": rid, "owner": entry["owner"]})
+                elif op == "release":
+                    entry = self.devices.get(msg["device_id"])
+                    if entry and entry["owner"] == worker:
+                        del self.devices[msg["device_id"]]
+                elif op == "devices":
+                    self._send(writer, {"op": "reply", "rid": rid, "devices": self.devices})
+                elif op == "route":
+                    entry = self.devices.get(msg["device_id"])
+                    target = self._owner_writer(entry["owner"]) if entry else None
+                    if target is not None:
+                        self._send(target, {"op": "input", "device_id": msg["device_id"], "data": msg["data"]})
+                    self._send(writer, {"op": "reply", "rid": rid, "routed": target is not None})
+                elif op == "metrics":
+                    self.metrics[worker] = msg["counts"]
+                elif op == "metrics_all":
+                    self._send(writer, {"op": "reply", "rid": rid, "metrics": self.metrics})
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, json.JSONDecodeError):
+            pass
+        finally:
+            self._clients.pop(writer, None)
+            # A worker that goes away gives up its devices and metrics.
+            for device_id in [d for d, e in self.devices.items() if e["owner"] == worker]:
+                del self.devices[device_id]
+            self.metrics.pop(worker, None)
+            if worker not in self._clients.values():
+                for topic in list(self.holders):
+                    self._unhold(topic, worker)
+            writer.close()
+
+    def _unhold(self, topic: str, worker: str) -> None:
+        holders = self.holders.get(topic)
+        if holders is None:
+            return
+        holders.discard(worker)
+        if not holders:
+            del self.holders[topic]
+            self.topics.pop(topic, None)
+
+
+class SharedState:
+    """
+    Worker-side view of state shared across uvicorn workers on one host.
+    With no socket path configured it is a purely local, single-process store.
+    With a path, the first worker to take `<path>.lock` hosts the `StateBroker`
+    and every worker (including that one) connects to it as a client; if the
+    hosting worker exits, the survivors reconnect and one of them takes over.
+    """
+
+    def __init__(self, path: str | None = STATE_SOCKET, worker_id: str | None = None) -> None:
+        self.path = path or None
+        self.worker_id = worker_id or str(os.getpid())
+        self.topics: Dict[str, Dict[str, Any]] = {}
+        self._local_devices: Dict[str, Dict[str, Any]] = {}
+        self._topic_handlers: Dict[str, List[TopicHandler]] = {}
+        self._input_handler: Optional[InputHandler] = None
+        self._broker: Optional[StateBroker] = None
+        self._lock_fd: Optional[int] = None
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._rids = itertools.count(1)
+        self._task: Optional[asyncio.Task] = None
+        self._metrics_task: Optional[asyncio.Task] = None
+        self._connected: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._deliveries: Dict[str, asyncio.Task] = {}  # topic → task applying its latest value
+        self._handler_tasks: set = set()
+        self.metrics_source: Optional[Callable[[], Dict[str, int]]] = None
+
+    @property
+    def shared(self) -> bool:
+        return self.path is not None
+
+    @property
+    def is_broker(self) -> bool:
+        return self._broker is not None
+
+    def on_topic(self, topic: str, handler: TopicHandler) -> None:
+        """Handle `topic` and its keyed subtopics (`<topic>/<key>`, each retaining its own latest value)."""
+        self._topic_handlers.setdefault(topic, []).append(handler)
+
+    def on_input(self, handler: InputHandler) -> None:
+        self._input_handler = handler
+
+    # --- lifecycle -----------------------------------------------------------------
+
+    async def start(self) -> None:
+        if not self.shared or self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._connected = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        await asyncio.wait_for(self._connected.wait(), timeout=5.0)
+        self._metrics_task = asyncio.create_task(self._metrics_loop())
+
+    async def stop(self) -> None:
+        for task in (self._metrics_task, self._task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+        self._task = self._metrics_task = None
+        for task in [*self._deliveries.values(), *self._handler_tasks]:
+            task.cancel()
+        await self._disconnect()
+        if self._broker:
+            await self._broker.close()
+            self._broker = None
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    def _try_become_broker(self) -> bool:
+        if self._lock_fd is None:
+            fd = os.open(f"{self.path}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                os.close(fd)
+                return False
+            self._lock_fd = fd
+        return True
+
+    async def _connect(self) -> None:
+        while True:
+            if self._broker is None and self._try_become_broker():
+                self._broker = StateBroker(self.path)  # type: ignore[arg-type]
+                await self._broker.start()
+                logger.info("state_broker_started %s worker=%s", self.path, self.worker_id)
+            try:
+                self._reader, self._writer = await asyncio.open_unix_connection(self.path)  # type: ignore[arg-type]
+                return
+            except (FileNotFoundError, ConnectionRefusedError):
+                await asyncio.sleep(0.05)
+
+    async def _disconnect(self) -> None:
+        writer, self._writer = self._writer, None
+        if writer:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except Exception:
+                pass
+        for fut in self._pending.values():
+            if not fut.done():
+                fut.set_exception(ConnectionError("state broker disconnected"))
+        self._pending.clear()
+
+    async def _run(self) -> None:
+        while True:
+            await self._connect()
+            hello = self._request({"op": "hello", "worker": self.worker_id})
+            reader_task = asyncio.create_task(self._read_loop())
+            try:
+                reply = await hello
+                for topic, data in (reply.get("topics") or {}).items():
+                    await self._deliver(topic, data)
+                for device_id, device in self._local_devices.items():
+                    await self._request({"op": "claim", "device_id": device_id, "device": device})
+                assert self._connected is not None
+                self._connected.set()
+                await reader_task
+            except (ConnectionError, asyncio.IncompleteReadError):
+                pass
+            finally:
+                reader_task.cancel()
+            await self._disconnect()
+            logger.warning("state_broker_lost; reconnecting worker=%s", self.worker_id)
+
+    async def _read_loop(self) -> None:
+        """
+        Resolve replies inline; run topic and input handlers as tasks so a slow
+        handler never holds up replies other requests are waiting for.
+        """
+        assert self._reader is not None
+        while True:
+            line = await self._reader.readline()
+            if not line:
+                raise ConnectionError("state broker closed")
+            try:
+                msg = json.loads(line)
+                op = msg.get("op")
+                if op == "reply":
+                    fut = self._pending.pop(msg.get("rid"), None)
+                    if fut and not fut.done():
+                        fut.set_result(msg)
+                elif op == "event":
+                    self._schedule_delivery(msg["topic"], msg["data"])
+                elif op == "input" and self._input_handler:
+                    self._spawn(self._handle_input(msg["device_id"], base64.b64decode(msg["data"])))
+            except Exception as exc:
+                logger.warning("state_message_failed %s", exc)
+
+    def _spawn(self, coro: Awaitable[None]) -> None:
+        task = asyncio.ensure_future(coro)
+        self._handler_tasks.add(task)
+        task.add_done_callback(self._handler_tasks.discard)
+
+    async def _handle_input(self, device_id: str, data: bytes) -> None:
+        try:
+            await self._input_handler(device_id, data)  # type: ignore[misc]
+        except Exception as exc:
+            logger.warning("state_input_handler_failed %s %s", device_id, exc)
+
+    def _schedule_delivery(self, topic: str, data: Dict[str, Any]) -> None:
+        """Record the topic value and apply it in order: one delivery task per topic applies the latest value."""
+        self.topics[topic] = data
+        if topic not in self._deliveries:
+            self._deliveries[topic] = asyncio.ensure_future(self._deliver_latest(topic))
+
+    async def _deliver_latest(self, topic: str) -> None:
+        try:
+            delivered = None
+            latest = self.topics.get(topic)
+            while latest is not None and latest is not delivered:  # stop if retracted meanwhile
+                delivered = latest
+                await self._deliver(topic, delivered)
+                latest = self.topics.get(topic)
+        finally:
+            self._deliveries.pop(topic, None)
+
+    async def _deliver(self, topic: str, data: Dict[str, Any]) -> None:
+        self.topics[topic] = data
+        for handler in self._topic_handlers.get(topic.partition("/")[0], []):
+            try:
+                await handler(data)
+            except Exception as exc:
+                logger.warning("state_topic_handler_failed %s %s", topic, exc)
+
+    def _send(self, msg: Dict[str, Any]) -> None:
+        if self._writer is None:
+            raise ConnectionError("state broker not connected")
+        self._writer.write(_encode(msg))
+
+    def _request(self, msg: Dict[str, Any]) -> "asyncio.Future[Dict[str, Any]]":
+        rid = next(self._rids)
+        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._pending[rid] = fut
+        try:
+            self._send({**msg, "rid": rid})
+        except ConnectionError as exc:
+            self._pending.pop(rid, None)
+            fut.set_exception(exc)
+        return fut
+
+    async def _call(self, msg: Dict[str, Any], timeout: float = 2.0) -> Dict[str, Any]:
+        return await asyncio.wait_for(self._request(msg), timeout)
+
+    async def _metrics_loop(self) -> None:
+        while True:
+            await asyncio.sleep(STATE_METRICS_INTERVAL_SECONDS)
+            if self.metrics_source:
+                try:
+                    self._send({"op": "metrics", "counts": self.metrics_source()})
+                except ConnectionError:
+                    pass
+
+    # --- operations ----------------------------------------------------------------
+
+    async def publish(self, topic: str, data: Dict[str, Any]) -> None:
+        """Record a topic value and deliver it to the other workers (the caller applies it locally)."""
+        self.topics[topic] = data
+        if self.shared:
+            try:
+                self._send({"op": "publish", "topic": topic, "data": data})
+            except ConnectionError as exc:
+                logger.warning("state_publish_failed %s %s", topic, exc)
+
+    def hold(self, topic: str) -> None:
+        """Keep a retained topic on the broker while this worker needs it (safe to call from any thread)."""
+        self._send_threadsafe({"op": "hold", "topic": topic})
+
+    def retract(self, topic: str) -> None:
+        """
+        Drop a topic's retained value here and give up this worker's hold on it; the
+        broker drops it once no worker holds it (safe to call from any thread).
+        """
+        self.topics.pop(topic, None)
+        self._send_threadsafe({"op": "retract", "topic": topic})
+
+    def _send_threadsafe(self, msg: Dict[str, Any]) -> None:
+        loop = self._loop
+        if not self.shared or loop is None or loop.is_closed():
+            return
+
+        def send() -> None:
+            try:
+                self._send(msg)
+            except ConnectionError:
+                pass
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            send()
+        else:
+            loop.call_soon_threadsafe(send)
+
+    async def claim_device(self, device_id: str, device: Dict[str, Any]) -> str:
+        """Pin a device to this worker unless another live worker already owns it; returns the owner."""
+        if not self.shared:
+            self._local_devices[device_id] = device
+            return self.worker_id
+        try:
+            reply = await self._call({"op": "claim", "device_id": device_id, "device": device})
+        except (asyncio.TimeoutError, ConnectionError) as exc:
+            # Keep the device here; it is claimed again when the broker connection is restored.
+            logger.warning("state_claim_failed %s %s; owning locally", device_id, exc)
+            self._local_devices[device_id] = device
+            return self.worker_id
+        if reply["owner"] == self.worker_id:
+            self._local_devices[device_id] = device
+        return reply["owner"]
+
+    async def release_device(self, device_id: str) -> None:
+        self._local_devices.pop(device_id, None)
+        if self.shared:
+            try:
+                self._send({"op": "release", "device_id": device_id})
+            except ConnectionError:
+                pass
+
+    async def devices(self) -> Dict[str, Dict[str, Any]]:
+        """device_id → {"owner", "device"} across all workers."""
+        local = {d: {"owner": self.worker_id, "device": info} for d, info in self._local_devices.items()}
+        if not self.shared:
+            return local
+        try:
+            return (await self._call({"op": "devices"}))["devices"]
+        except (asyncio.TimeoutError, ConnectionError) as exc:
+            logger.warning("state_devices_failed %s; local devices only", exc)
+            return local
+
+    async def route_input(self, device_id: str, data: bytes) -> bool:
+        """Hand raw input to the worker that owns the device; False if nobody does."""
+        if not self.shared:
+            return False
+        try:
+            reply = await self._call({"op": "route", "device_id": device_id, "data": base64.b64encode(data).decode("ascii")})
+        except (asyncio.TimeoutError, ConnectionError) as exc:
+            logger.warning("state_route_failed %s %s", device_id, exc)
+            return False
+        return bool(reply.get("routed"))
+
+    async def metrics_all(self) -> Dict[str, int]:
+        """Counters summed over every worker (other workers' values lag by the push interval)."""
+        local = self.metrics_source() if self.metrics_source else {}
+        if not self.shared:
+            return dict(local)
+        try:
+            per_worker = (await self._call({"op": "metrics_all"}))["metrics"]
+        except (asyncio.TimeoutError, ConnectionError) as exc:
+            logger.warning("state_metrics_failed %s; local metrics only", exc)
+            return dict(local)
+        per_worker[self.worker_id] = local
+        total: Dict[str, int] = {}
+        for counts in per_worker.values():
+            for key, value in counts.items():
+                total[key] = total.get(key, 0) + int(value)
+        return total
@@ -0,0 +1,104 @@
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Tuple
+
+from .drivers.encoding import pack_cells
+from .interfaces import BrailleCells, Translator
+from .settings import TRANSLATION_CACHE_BYTES
+from .translator_loader import get_translator
+
+# Dot-number lists per mask, for the JSON cell representation ([[1, 2], [1], ...]).
+_DOT_LISTS: Tuple[List[int], ...] = tuple([i + 1 for i in range(8) if mask & (1 << i)] for mask in range(256))
+# Rough per-entry and per-cell object overhead, so the byte budget tracks real memory.
+_ENTRY_OVERHEAD = 512
+_CELL_OVERHEAD = 96
+
+
+def _dumps(obj: Any) -> str:
+    # Same compact form Starlette's send_json uses.
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+@dataclass(frozen=True)
+class CachedTranslation:
+    cells: BrailleCells
+    payload: Dict[str, Any]
+    payload_json: str
+    size: int
+
+
+class TranslationCache:
+    """
+    LRU cache of finished translations keyed by (table, text).
+    Holds the cell buffer plus the JSON payload already serialized (websocket
+    focus frames wrap it without re-encoding), and is bounded by an estimate of
+    total bytes rather than entry count, so a few long documents cannot crowd
+    out many short UI labels.
+    """
+
+    def __init__(self, max_bytes: int = TRANSLATION_CACHE_BYTES, translator_for: Callable[[str], Translator] = get_translator) -> None:
+        self.max_bytes = max_bytes
+        self._translator_for = translator_for
+        self._entries: "OrderedDict[Tuple[str, str], CachedTranslation]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, table: str, text: str) -> CachedTranslation:
+        key = (table, text)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+        entry = self._translate(table, text)
+        if entry.size <= self.max_bytes:
+            with self._lock:
+                previous = self._entries.pop(key, None)
+                if previous is not None:
+                    self.total_bytes -= previous.size
+                self._entries[key] = entry
+                self.total_bytes += entry.size
+                while self.total_bytes > self.max_bytes and self._entries:
+                    _, evicted = self._entries.popitem(last=False)
+                    self.total_bytes -= evicted.size
+                    self.evictions += 1
+        return entry
+
+    def _translate(self, table: str, text: str) -> CachedTranslation:
+        cells = self._translator_for(table).text_to_cells(text)
+        packed = pack_cells(cells)
+        if cells.packed is None:
+            cells.packed = packed
+        payload = {
+            "table": table,
+            "rows": cells.rows,
+            "cols": cells.cols,
+            "cells": [_DOT_LISTS[m] for m in packed],
+            "cursor": cells.cursor_position,
+        }
+        payload_json = _dumps(payload)
+        size = _ENTRY_OVERHEAD + 2 * (len(text) + len(payload_json)) + len(packed) * (_CELL_OVERHEAD + 1)
+        return CachedTranslation(cells=cells, payload=payload, payload_json=payload_json, size=size)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
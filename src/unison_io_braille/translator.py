@@ -1,5 +1,7 @@
 from typing import Dict, Any, Sequence, List, Tuple
 
+from .back_translator import IncrementalBackTranslator, ReverseTrie
+from .drivers.encoding import pack_cells
 from .interfaces import BrailleCells, BrailleCell, Translator
 
 
@@ -12,10 +14,42 @@ def _make_dots(on: Sequence[int], total_dots: int) -> BrailleCell:
     return BrailleCell(dots=dots)
 
 
+_PACKED_CELLS: Dict[int, Tuple[BrailleCell, ...]] = {}
+
+
+def cells_from_packed(packed: bytes, total_dots: int = 6) -> BrailleCells:
+    """
+    Wrap a packed mask buffer as BrailleCells. Cell objects are shared per mask
+    (256 per dot count), so this allocates only the list.
+    """
+    table = _PACKED_CELLS.get(total_dots)
+    if table is None:
+        table = tuple(BrailleCell(dots=tuple(bool(m & (1 << i)) for i in range(total_dots))) for m in range(256))
+        _PACKED_CELLS[total_dots] = table
+    cells = [table[m] for m in packed]
+    return BrailleCells(rows=1, cols=len(cells), cells=cells, cursor_position=len(cells) - 1 if cells else None, packed=packed)
+
+
+def _cell_sequence(value: Sequence[Any]) -> Tuple[Tuple[int, ...], ...]:
+    """Table value → cells: `[1, 2]` is one cell, `[[5], [1, 4, 5]]` a multi-cell contraction."""
+    if value and isinstance(value[0], (list, tuple)):
+        return tuple(tuple(cell) for cell in value)
+    return (tuple(value),)
+
+
+def _dots_to_mask(on: Sequence[int], total_dots: int) -> int:
+    mask = 0
+    for d in on:
+        if 1 <= d <= total_dots:
+            mask |= 1 << (d - 1)
+    return mask
+
+
 class SimpleTranslator(Translator):
     """
     Minimal translator with a small ASCII→Braille table (UEB Grade 1 sketch).
-    Supports multi-character tokens via greedy matching.
+    Supports multi-character tokens via greedy matching; a token may map to a
+    sequence of cells (e.g. dot-5 word contractions).
     """
 
     DEFAULT_TABLE: Dict[str, Sequence[int]] = {
@@ -37,12 +71,13 @@ class SimpleTranslator(Translator):
         self.eight_dot = eight_dot
         self._tokens_sorted = sorted(self.table.keys(), key=len, reverse=True)
         total_dots = 8 if self.eight_dot else 6
-        self._reverse = {tuple(sorted(v)): k for k, v in self.table.items()}
+        self._sequences = {k: _cell_sequence(v) for k, v in self.table.items()}
         self._total_dots = total_dots
+        self._masks = {k: bytes(_dots_to_mask(cell, total_dots) for cell in seq) for k, seq in self._sequences.items()}
+        self._trie: ReverseTrie | None = None
 
-    def _token_to_cell(self, token: str) -> BrailleCell:
-        dots_on = self.table.get(token.lower(), tuple())
-        return _make_dots(dots_on, self._total_dots)
+    def _token_to_cells(self, token: str) -> List[BrailleCell]:
+        return [_make_dots(dots_on, self._total_dots) for dots_on in self._sequences.get(token.lower(), ((),))]
 
     def _greedy_tokenize(self, text: str) -> List[str]:
         tokens: List[str] = []
@@ -64,12 +99,37 @@ class SimpleTranslator(Translator):
 
     def text_to_cells(self, text: str, config: Dict[str, Any] | None = None) -> BrailleCells:
         tokens = self._greedy_tokenize(text)
-        cells = [self._token_to_cell(tok) for tok in tokens]
-        return BrailleCells(rows=1, cols=len(cells), cells=cells, cursor_position=len(cells) - 1 if cells else None)
+        cells = [cell for tok in tokens for cell in self._token_to_cells(tok)]
+        packed = b"".join(self._masks.get(tok.lower(), b"\x00") for tok in tokens)
+        return BrailleCells(rows=1, cols=len(cells), cells=cells, cursor_position=len(cells) - 1 if cells else None, packed=packed)
+
+    def segments(self, text: str) -> Tuple[bytes, List[int], List[int]]:
+        """
+        Packed cells plus aligned segment starts: segment k covers text from
+        `text_starts[k]` and cells from `cell_starts[k]` (one segment per token).
+        """
+        text_starts: List[int] = []
+        cell_starts: List[int] = []
+        chunks: List[bytes] = []
+        t = c = 0
+        for tok in self._greedy_tokenize(text):
+            masks = self._masks.get(tok.lower(), b"\x00")
+            text_starts.append(t)
+            cell_starts.append(c)
+            chunks.append(masks)
+            t += len(tok)
+            c += len(masks)
+        return b"".join(chunks), text_starts, cell_starts
+
+    def reverse_trie(self) -> ReverseTrie:
+        """Cell-sequence → text trie; dots beyond the table's dot count keep their entries unreachable."""
+        if self._trie is None:
+            by_sequence: Dict[bytes, str] = {}
+            for token, seq in self._sequences.items():
+                # Later entries win on identical sequences, like the single-cell reverse map.
+                by_sequence[bytes(_dots_to_mask(cell, 8) for cell in seq)] = token
+            self._trie = ReverseTrie({token: seq for seq, token in by_sequence.items()})
+        return self._trie
 
     def cells_to_text(self, cells: BrailleCells, config: Dict[str, Any] | None = None) -> str:
-        out = []
-        for cell in cells.cells:
-            on = tuple(i + 1 for i, v in enumerate(cell.dots) if v)
-            out.append(self._reverse.get(on, "?"))
-        return "".join(out)
+        return IncrementalBackTranslator(self.reverse_trie()).feed_many(pack_cells(cells))
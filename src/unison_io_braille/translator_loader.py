@@ -1,22 +1,21 @@
 import importlib.resources as pkg_resources
-from pathlib import Path
-from typing import Dict, Any, Sequence
+import logging
+from functools import lru_cache
+from typing import Dict, Any, List, Sequence, Tuple
 
-import yaml
+from .interfaces import BrailleCells
+from .louis_backend import get_backend
+from .translator import SimpleTranslator, cells_from_packed
 
-from .interfaces import BrailleCells, BrailleCell
-from .translator import SimpleTranslator, _make_dots
-
-try:
-    import louis  # type: ignore
-except Exception:  # pragma: no cover
-    louis = None
+logger = logging.getLogger("unison-io-braille.translator")
 
 
 def load_table(name: str) -> Dict[str, Any]:
     """
     Load a Braille table definition by name from bundled YAML files.
     """
+    import yaml  # deferred: only needed once a table is first used
+
     try:
         with pkg_resources.files("unison_io_braille.tables").joinpath(f"{name}.yaml").open("r", encoding="utf-8") as fh:
             return yaml.safe_load(fh) or {}
@@ -25,32 +24,50 @@ def load_table(name: str) -> Dict[str, Any]:
 
 
 class TableTranslator(SimpleTranslator):
-    """Translator backed by YAML tables or liblouis if available."""
+    """
+    Translator backed by YAML tables, or liblouis when installed and the table
+    names a liblouis table (`liblouis:` key). Falls back to the YAML mapping
+    whenever liblouis is missing or fails.
+    """
 
-    def __init__(self, table_name: str = "ueb_grade1") -> None:
+    def __init__(self, table_name: str = "ueb_grade1", use_louis: bool = True) -> None:
         self.table_name = table_name
         table_def = load_table(table_name)
         mapping = table_def.get("mapping", {})
         dots = int(table_def.get("dots", 6)) if table_def else 6
         mapped: Dict[str, Sequence[int]] = {k: tuple(v) for k, v in mapping.items()} if mapping else None
         super().__init__(table=mapped, eight_dot=dots == 8)
+        self._louis = get_backend(table_def.get("liblouis"), eight_dot=dots == 8) if use_louis else None
 
     def text_to_cells(self, text: str, config: Dict[str, Any] | None = None) -> BrailleCells:
-        if louis:
+        if self._louis:
             try:
-                cells = louis.translate([self.table_name], text, mode=louis.dotsIO)  # type: ignore[attr-defined]
-                # louis returns list of integers representing dot patterns per cell
-                dots = []
-                for c in cells[0]:
-                    bits = []
-                    for i in range(1, 9):
-                        if c & (1 << (i - 1)):
-                            bits.append(i)
-                    dots.append(_make_dots(bits, 8 if self.eight_dot else 6))
-                return BrailleCells(rows=1, cols=len(dots), cells=dots, cursor_position=len(dots) - 1 if dots else None)
-            except Exception:
-                pass
+                return cells_from_packed(self._louis.translate_packed(text), self._total_dots)
+            except Exception as exc:
+                logger.debug("louis_translate_failed %s", exc)
         return super().text_to_cells(text, config)
 
+    def segments(self, text: str) -> Tuple[bytes, List[int], List[int]]:
+        if self._louis:
+            try:
+                return self._louis.translate_segments(text)
+            except Exception as exc:
+                logger.debug("louis_translate_failed %s", exc)
+        return super().segments(text)
+
+    def translate_many(self, texts: Sequence[str], config: Dict[str, Any] | None = None) -> List[BrailleCells]:
+        if self._louis:
+            try:
+                return [cells_from_packed(p, self._total_dots) for p in self._louis.translate_many(texts)]
+            except Exception as exc:
+                logger.debug("louis_translate_failed %s", exc)
+        return [SimpleTranslator.text_to_cells(self, text, config) for text in texts]
+
     def cells_to_text(self, cells: BrailleCells, config: Dict[str, Any] | None = None) -> str:
         return super().cells_to_text(cells, config)
+
+
+@lru_cache(maxsize=32)
+def get_translator(table_name: str = "ueb_grade1") -> TableTranslator:
+    """Shared translator per table, so YAML tables are parsed once per process."""
+    return TableTranslator(table_name)
@@ -1,12 +1,22 @@
 import logging
-from typing import Dict, Any, Optional
-
-import httpx
+import os
+import socket
+import threading
+from typing import TYPE_CHECKING, Dict, Any, Optional, Tuple
 
 from .settings import ORCH_AUTH_TOKEN
 
+if TYPE_CHECKING:  # pragma: no cover
+    import httpx
+
 logger = logging.getLogger("unison-io-braille.transport")
 
+UNIX_PREFIX = "unix://"
+
+# One pooled client per destination (None = TCP), reused across events.
+_clients: Dict[Optional[str], "httpx.Client"] = {}
+_clients_lock = threading.Lock()
+
 
 def _headers(token: Optional[str]) -> Dict[str, str]:
     if not token:
@@ -14,13 +24,53 @@ def _headers(token: Optional[str]) -> Dict[str, str]:
     return {"Authorization": f"Bearer {token}"}
 
 
-def post_event(host: str, port: str, path: str, payload: Dict[str, Any], token: Optional[str] = None) -> tuple[bool, int, dict | None]:
-    """Send an event to orchestrator, including Authorization if provided."""
+def orchestrator_url(host: str, port: str, path: str, scheme: str = "http") -> Tuple[str, Optional[str]]:
+    """
+    Resolve an orchestrator address to (URL, unix socket path).
+    `host` may be `unix:///run/unison/orchestrator.sock` for a co-located
+    orchestrator; the port is then ignored.
+    """
+    if host.startswith(UNIX_PREFIX):
+        return f"{scheme}://localhost{path}", host[len(UNIX_PREFIX):]
+    return f"{scheme}://{host}:{port}{path}", None
+
+
+def _client(uds: Optional[str]) -> "httpx.Client":
+    client = _clients.get(uds)
+    if client is None:
+        import httpx  # first event, not service start
+
+        with _clients_lock:
+            client = _clients.get(uds)
+            if client is None:
+                transport = httpx.HTTPTransport(uds=uds) if uds else None
+                client = _clients[uds] = httpx.Client(timeout=2.0, transport=transport)
+    return client
+
+
+def close_clients() -> None:
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
+
+
+def post_event(
+    host: str, port: str, path: str, payload: Dict[str, Any] | bytes, token: Optional[str] = None
+) -> tuple[bool, int, dict | None]:
+    """
+    Send an event to orchestrator (TCP or `unix://` socket), including Authorization if provided.
+    `payload` may be an envelope dict or an already serialized JSON body.
+    """
     auth_token = token or ORCH_AUTH_TOKEN
     try:
-        url = f"http://{host}:{port}{path}"
-        with httpx.Client(timeout=2.0) as client:
-            resp = client.post(url, json=payload, headers=_headers(auth_token))
+        url, uds = orchestrator_url(host, port, path)
+        if isinstance(payload, bytes):
+            headers = {**_headers(auth_token), "Content-Type": "application/json"}
+            resp = _client(uds).post(url, content=payload, headers=headers)
+        else:
+            resp = _client(uds).post(url, json=payload, headers=_headers(auth_token))
         parsed = None
         try:
             parsed = resp.json()
@@ -30,3 +80,25 @@ def post_event(host: str, port: str, path: str, payload: Dict[str, Any], token:
     except Exception as exc:  # pragma: no cover
         logger.warning("post_failed %s", exc)
         return (False, 0, None)
+
+
+def prime(host: str, port: str, path: str = "/health") -> int:
+    """Open the pooled connection to the orchestrator ahead of the first event; returns the status code."""
+    url, uds = orchestrator_url(host, port, path)
+    return _client(uds).get(url).status_code
+
+
+def bind_unix_socket(path: str, mode: int = 0o660) -> socket.socket:
+    """
+    Listening socket for serving the API on a Unix domain socket (replaces a stale socket file).
+    Owner and group only by default: put co-located renderers in the service's group.
+    """
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(path)
+    os.chmod(path, mode)
+    sock.set_inheritable(True)
+    return sock
@@ -0,0 +1,242 @@
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from .settings import (
+    ORCH_HOST,
+    ORCH_PORT,
+    ORCH_AUTH_TOKEN,
+    ORCH_STREAM_PATH,
+    ORCH_STREAM_WINDOW,
+    ORCH_STREAM_RETRY_SECONDS,
+)
+from .lazy import load_optional
+from .transport import orchestrator_url, post_event
+
+logger = logging.getLogger("unison-io-braille.uplink")
+
+
+def _websockets():
+    return load_optional(globals(), "websockets", "websockets")
+
+
+def __getattr__(name: str):
+    if name == "websockets":
+        return _websockets()
+    raise AttributeError(name)
+
+# connect(url, headers[, uds=path]) -> connection with async send(str), recv() -> str, close()
+Connector = Callable[[str, Dict[str, str]], Awaitable[Any]]
+Fallback = Callable[[Dict[str, Any] | bytes], Any]
+
+
+async def websocket_connect(url: str, headers: Dict[str, str], uds: str | None = None) -> Any:
+    """Default connector (requires the optional `websockets` package)."""
+    websockets = _websockets()
+    if websockets is None:
+        raise RuntimeError("websockets not installed")
+    connect = websockets.unix_connect if uds else websockets.connect
+    args = (uds, url) if uds else (url,)
+    try:
+        return await connect(*args, additional_headers=headers, max_queue=None)
+    except TypeError:  # websockets < 14
+        return await connect(*args, extra_headers=headers, max_queue=None)
+
+
+def _dumps(obj: Any) -> str:
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def _frame(seq: int, envelope: Dict[str, Any] | bytes) -> str:
+    if isinstance(envelope, bytes):
+        # Already serialized (events.encode_input_event): splice it in as-is.
+        return f'{{"seq":{seq},"event":{envelope.decode("utf-8")}}}'
+    return _dumps({"seq": seq, "event": envelope})
+
+
+class EventUplink:
+    """
+    Long-lived websocket uplink that multiplexes envelopes to the orchestrator.
+    Protocol (JSON text frames):
+      - client → `{"op":"hello","stream":<id>}`; server → `{"op":"welcome","acked":<seq>}`
+        with the last sequence it holds for that stream (0 for a new stream)
+      - client → `{"seq":<n>,"event":<envelope>}`; server → `{"ack":<n>}` (cumulative)
+    Unacked frames are kept (at most `window` in flight) and replayed after a
+    reconnect, starting after the server's `acked`, so resumes neither lose nor
+    duplicate events. While the stream is down, envelopes (and anything still
+    unacked) go through the plain `POST /event` fallback; the stream is retried
+    every `retry_seconds`. Delivery is at-least-once: frames posted after a lost
+    stream may duplicate ones the orchestrator received but never acked.
+    """
+
+    def __init__(
+        self,
+        host: str = ORCH_HOST,
+        port: str = ORCH_PORT,
+        path: str = ORCH_STREAM_PATH,
+        token: str | None = ORCH_AUTH_TOKEN,
+        window: int = ORCH_STREAM_WINDOW,
+        retry_seconds: float = ORCH_STREAM_RETRY_SECONDS,
+        connect: Connector | None = None,
+        fallback: Fallback | None = None,
+    ) -> None:
+        self.url, self.uds = orchestrator_url(host, port, path, scheme="ws")
+        self.headers = {"Authorization": f"Bearer {token}"} if token else {}
+        self.window = max(1, window)
+        self.retry_seconds = retry_seconds
+        self.stream_id = uuid.uuid4().hex
+        self._connect = connect or websocket_connect
+        self._fallback = fallback or (lambda envelope: post_event(host, port, "/event", envelope, token=token))
+        self._next_seq = 1
+        self._acked = 0
+        self._unacked: "OrderedDict[int, Tuple[str, Dict[str, Any] | bytes]]" = OrderedDict()  # seq → (frame, envelope)
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._progress: Optional[asyncio.Condition] = None
+        self.connected = False
+        self.stats: Dict[str, int] = {"sent": 0, "acked": 0, "resent": 0, "fallback": 0, "reconnects": 0}
+
+    def submit(self, envelope: Dict[str, Any] | bytes) -> None:
+        """Queue an envelope (dict or serialized JSON bytes); safe to call from any thread."""
+        loop = self._loop
+        if loop is None or self._queue is None:
+            self._post(envelope)
+            return
+        loop.call_soon_threadsafe(self._queue.put_nowait, envelope)
+
+    @property
+    def pending(self) -> int:
+        return len(self._unacked) + (self._queue.qsize() if self._queue else 0)
+
+    async def start(self) -> None:
+        if self._task:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._progress = asyncio.Condition()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = 2.0) -> None:
+        """Give queued and unacked events up to `timeout` seconds to drain, then POST the rest."""
+        if not self._task:
+            return
+        deadline = time.monotonic() + timeout
+        while self.connected and self.pending and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await self._fallback_unacked()
+        while self._queue and not self._queue.empty():
+            await asyncio.to_thread(self._post, self._queue.get_nowait())
+        self._loop = None
+
+    def _post(self, envelope: Dict[str, Any] | bytes) -> None:
+        self.stats["fallback"] += 1
+        self._fallback(envelope)
+
+    async def _fallback_unacked(self) -> None:
+        pending = list(self._unacked.values())
+        self._unacked.clear()
+        for _, envelope in pending:
+            await asyncio.to_thread(self._post, envelope)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                conn = await self._connect(self.url, self.headers, **({"uds": self.uds} if self.uds else {}))
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.info("uplink_connect_failed %s", exc)
+                await self._fallback_until_retry()
+                continue
+            try:
+                await self._stream(conn)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.info("uplink_stream_lost %s", exc)
+            finally:
+                established = self.connected
+                self.connected = False
+                try:
+                    await conn.close()
+                except Exception:
+                    pass
+            self.stats["reconnects"] += 1
+            if not established:
+                # Rejected during the handshake: don't hammer the orchestrator.
+                await self._fallback_until_retry()
+
+    async def _fallback_until_retry(self) -> None:
+        # Unacked frames may never have reached the orchestrator: deliver them over POST.
+        await self._fallback_unacked()
+        deadline = time.monotonic() + self.retry_seconds
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                envelope = await asyncio.wait_for(self._queue.get(), timeout=remaining)
+            except asyncio.TimeoutError:
+                return
+            await asyncio.to_thread(self._post, envelope)
+
+    async def _stream(self, conn: Any) -> None:
+        await conn.send(_dumps({"op": "hello", "stream": self.stream_id}))
+        welcome = json.loads(await conn.recv())
+        if welcome.get("op") != "welcome":
+            raise RuntimeError(f"unexpected handshake: {welcome}")
+        self._ack(int(welcome.get("acked", 0)))
+        for frame, _ in list(self._unacked.values()):
+            await conn.send(frame)
+            self.stats["resent"] += 1
+        self.connected = True
+        receiver = asyncio.create_task(self._receive(conn))
+        sender = asyncio.create_task(self._send(conn))
+        try:
+            done, _ = await asyncio.wait({receiver, sender}, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()
+        finally:
+            for task in (receiver, sender):
+                task.cancel()
+            await asyncio.gather(receiver, sender, return_exceptions=True)
+
+    async def _send(self, conn: Any) -> None:
+        while True:
+            async with self._progress:
+                await self._progress.wait_for(lambda: len(self._unacked) < self.window)
+            envelope = await self._queue.get()
+            seq = self._next_seq
+            self._next_seq += 1
+            frame = _frame(seq, envelope)
+            self._unacked[seq] = (frame, envelope)
+            await conn.send(frame)
+            self.stats["sent"] += 1
+
+    async def _receive(self, conn: Any) -> None:
+        while True:
+            msg = json.loads(await conn.recv())
+            if "ack" in msg:
+                self._ack(int(msg["ack"]))
+                async with self._progress:
+                    self._progress.notify_all()
+
+    def _ack(self, seq: int) -> None:
+        while self._unacked:
+            first = next(iter(self._unacked))
+            if first > seq:
+                break
+            del self._unacked[first]
+            self.stats["acked"] += 1
+        self._acked = max(self._acked, seq)
@@ -0,0 +1,71 @@
+from unison_io_braille.back_translator import BackTranslationSessions, IncrementalBackTranslator, ReverseTrie, keys_to_mask
+from unison_io_braille.drivers.focus import FocusBrailleDriver
+from unison_io_braille.interfaces import DeviceInfo
+from unison_io_braille.translator_loader import TableTranslator
+
+DOT5 = 0x10
+
+
+def test_trie_commits_unambiguous_chords_immediately():
+    bt = IncrementalBackTranslator(TableTranslator("ueb_grade2").reverse_trie())
+    assert bt.feed(0x01) == "a"
+    assert bt.feed(0x2F) == "and"
+    assert bt.pending == b""
+
+
+def test_multi_cell_contraction_waits_then_commits():
+    bt = IncrementalBackTranslator(TableTranslator("ueb_grade2").reverse_trie())
+    assert bt.feed(DOT5) == ""  # dot 5 starts several contractions
+    assert bt.pending == bytes([DOT5])
+    assert bt.feed(0x19) == "day"  # dots 1-4-5
+    # dead end: dot 5 followed by a cell that continues no contraction
+    assert bt.feed(DOT5) == ""
+    assert bt.feed(0x01) == "?a"
+    assert bt.feed(DOT5) == "" and bt.flush() == "?"
+
+
+def test_longest_prefix_wins_on_dead_end():
+    trie = ReverseTrie({"x": b"\x01", "xy": b"\x01\x02\x03", "z": b"\x04"})
+    bt = IncrementalBackTranslator(trie)
+    assert bt.feed(0x01) == ""
+    assert bt.feed(0x02) == ""
+    assert bt.feed(0x04) == "x?z"
+
+
+def test_cells_to_text_uses_contractions():
+    tr = TableTranslator("ueb_grade2")
+    assert tr.cells_to_text(tr.text_to_cells("someday and the")) == "someday and the"
+
+
+def test_sessions_turn_focus_chords_into_text_per_device():
+    tr = TableTranslator("ueb_grade2")
+    sessions = BackTranslationSessions(trie_for=lambda table: tr.reverse_trie(), table_for=lambda device_id: "ueb_grade2")
+    drv = FocusBrailleDriver()
+    drv.open(DeviceInfo(id="focus1", transport="usb"))
+    # chord bytes: high bit + dot mask
+    out = sessions.process("focus1", drv.on_packet(bytes([0x01, 0x80 | DOT5])))
+    assert [e.type for e in out] == ["chord"]
+    sessions.process("other", drv.on_packet(bytes([0x01, 0x81])))  # independent device state
+    out = sessions.process("focus1", drv.on_packet(bytes([0x01, 0x80 | 0x1E, 0x81])))
+    assert [(e.type, e.text) for e in out if e.type == "text"] == [("text", "time"), ("text", "a")]
+    assert keys_to_mask(["dot1", "dot8", "space"]) == 0x81
+    sessions.feed("focus1", DOT5)
+    assert sessions.flush_idle(0.0) == {"focus1": "?"}
+
+
+def test_server_commits_idle_contractions_and_forgets_detached_devices(monkeypatch):
+    from unison_io_braille import server
+
+    tr = TableTranslator("ueb_grade2")
+    sessions = BackTranslationSessions(trie_for=lambda table: tr.reverse_trie(), table_for=lambda device_id: "ueb_grade2")
+    monkeypatch.setattr(server, "_back_translation", sessions)
+    monkeypatch.setattr(server, "BACK_TRANSLATION_IDLE_SECONDS", 0.0)
+    sessions.feed("focus1", DOT5)
+    flushed = {"focus1": []}
+    server._commit_idle_text(flushed)
+    assert [(e.type, e.text, e.device_id) for e in flushed["focus1"]] == [("text", "?", "focus1")]
+    sessions.feed("focus1", DOT5)
+    server._on_detached("focus1")
+    flushed = {}
+    server._commit_idle_text(flushed)
+    assert flushed == {}
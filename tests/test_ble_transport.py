@@ -0,0 +1,184 @@
+import asyncio
+import threading
+import time
+
+from unison_io_braille.ble_transport import NUS_RX, NUS_TX, BLETransport, BLEWriter, open_ble_writer, packetize
+from unison_io_braille.driver_registry import BrailleDeviceDriverRegistry
+from unison_io_braille.drivers.encoding import CellReportEncoder
+from unison_io_braille.interfaces import DeviceInfo
+from unison_io_braille.manager import BrailleDeviceManager
+from unison_io_braille.translator import cells_from_packed
+
+
+class FakeChar:
+    def __init__(self, size):
+        self.max_write_without_response_size = size
+
+
+class FakeServices:
+    def __init__(self, size):
+        self.size = size
+
+    def get_characteristic(self, uuid):
+        return FakeChar(self.size) if uuid == NUS_RX else None
+
+
+class FakeBleakClient:
+    """Stands in for bleak.BleakClient: records writes, simulates link latency, emits notifications."""
+
+    def __init__(self, address, mtu=185, latency=0.0):
+        self.address = address
+        self.services = FakeServices(mtu - 3)
+        self.latency = latency
+        self.writes = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.connected = False
+        self.notify = None
+
+    async def connect(self):
+        self.connected = True
+
+    async def disconnect(self):
+        self.connected = False
+
+    async def start_notify(self, uuid, callback):
+        assert uuid == NUS_TX
+        self.notify = callback
+
+    async def stop_notify(self, uuid):
+        self.notify = None
+
+    async def write_gatt_char(self, uuid, data, response=True):
+        assert uuid == NUS_RX and response is False
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        self.writes.append(bytes(data))
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.in_flight -= 1
+
+
+def frame(cells):
+    return bytes(CellReportEncoder(0x08, cells).encode(cells_from_packed(bytes(range(1, cells + 1)))))
+
+
+def test_frames_are_split_to_the_negotiated_mtu_and_pipelined_in_order():
+    assert [bytes(c) for c in packetize(b"abcdefg", 3)] == [b"abc", b"def", b"g"]
+    client = FakeBleakClient("AA", mtu=23, latency=0.002)
+    transport = BLETransport(client, window=4)
+
+    async def run():
+        await transport.open()
+        assert transport.chunk_size == 20
+        for _ in range(3):
+            await transport.send(frame(80))
+        await transport.drain()
+
+    asyncio.run(run())
+    assert all(len(w) <= 20 for w in client.writes)
+    assert b"".join(client.writes) == frame(80) * 3
+    assert 1 < client.max_in_flight <= 4
+    assert transport.stats == {"frames": 3, "chunks": len(client.writes), "failed": 0, "torn": 0, "notifications": 0}
+
+
+def test_failed_chunk_skips_the_rest_of_its_frame():
+    client = FakeBleakClient("AA", mtu=23)
+    calls = []
+    write = client.write_gatt_char
+
+    async def flaky(uuid, data, response=True):
+        calls.append(bytes(data))
+        if len(calls) == 2:
+            raise OSError("link lost")
+        await write(uuid, data, response)
+
+    client.write_gatt_char = flaky
+    transport = BLETransport(client, window=1)
+
+    async def run():
+        await transport.open()
+        await transport.send(frame(80))
+        await transport.send(frame(40))
+        await transport.drain()
+        await asyncio.sleep(0)  # done callbacks run one step after the last write
+        assert not transport._inflight
+
+    asyncio.run(run())
+    assert b"".join(client.writes) == frame(80)[:20] + frame(40)  # nothing after the failed chunk
+    assert transport.stats["torn"] == 1 and transport.stats["failed"] == 1
+
+
+def test_sync_and_async_writes_do_not_interleave_chunks():
+    client = FakeBleakClient("AA", mtu=23, latency=0.002)
+    writer = open_ble_writer(DeviceInfo(id="bt:AA", transport="bt"), client_factory=lambda address: client)
+    big, small = frame(80), frame(40)
+    sender = threading.Thread(target=writer.write, args=(big,))
+    sender.start()
+    writer.write_async(small)
+    sender.join()
+    writer.flush()
+    assert b"".join(client.writes) in (big + small, small + big)
+    writer.close()
+
+
+def test_writer_keeps_newest_frame_and_delivers_notifications():
+    received = []
+    client = FakeBleakClient("AA:BB", mtu=247, latency=0.01)
+    writer = open_ble_writer(DeviceInfo(id="bt:AA:BB", transport="bt"), on_input=received.append, client_factory=lambda address: client)
+    assert isinstance(writer, BLEWriter) and client.address == "AA:BB" and writer.transport.chunk_size == 244
+    frames = [bytes([0x08, 1, 0xFF, i]) for i in range(20)]
+    for f in frames:
+        writer.write_async(f)
+    writer.flush()
+    assert client.writes[-1] == frames[-1] and writer.dropped > 0  # stale frames skipped, newest sent
+    assert len(client.writes) + writer.dropped == len(frames)
+    client.notify(None, bytearray(b"\x01\x61"))
+    assert received == [b"\x01\x61"]
+    writer.close()
+    assert not client.connected
+
+
+def test_manager_routes_ble_notifications_to_event_sink(monkeypatch):
+    client = FakeBleakClient("CC", mtu=64)
+    import unison_io_braille.manager as manager_mod
+
+    monkeypatch.setattr(
+        manager_mod,
+        "open_ble_writer",
+        lambda device, on_input=None: open_ble_writer(device, on_input=on_input, client_factory=lambda address: client),
+    )
+    manager = BrailleDeviceManager(BrailleDeviceDriverRegistry(), trace_dir=None)
+    got = threading.Event()
+    packets = []
+    manager.event_sink = lambda device_id, events: (packets.append((device_id, events)), got.set())
+    driver = manager.attach(DeviceInfo(id="bt:CC", transport="bt", capabilities={"driver_key": "focus-generic"}))
+    manager.send_cells("bt:CC", cells_from_packed(b"\x01\x03"))
+    deadline = time.monotonic() + 2
+    while not client.writes and time.monotonic() < deadline:
+        time.sleep(0.005)
+    assert client.writes == [driver.last_output]
+    client.notify(None, bytearray(b"\x01\x62"))
+    assert got.wait(1)
+    assert packets[0][0] == "bt:CC" and packets[0][1][0].text == "b"
+    manager.close_all()
+    assert not client.connected
+
+
+def test_back_to_back_transport_reads_are_forwarded_in_order(monkeypatch):
+    from unison_io_braille import server
+    from unison_io_braille.interfaces import BrailleEvent
+
+    forwarded = []
+
+    def slow_first(polled, flushed):
+        for device_id, events in polled.items():
+            if events[0].text == "a":
+                time.sleep(0.05)  # a slow first batch must not be overtaken
+            forwarded.extend(e.text for e in events)
+
+    monkeypatch.setattr(server, "_forward_polled", slow_first)
+    for text in "abc":
+        server._transport_input("bt:CC", [BrailleEvent(type="text", keys=(), text=text, device_id="bt:CC")])
+    server._input_executor.submit(lambda: None).result(timeout=2)
+    assert forwarded == ["a", "b", "c"]
@@ -0,0 +1,60 @@
+from unison_io_braille.drivers.encoding import CellReportEncoder, dots_mask, pack_cells
+from unison_io_braille.drivers.handytech import HandyTechDriver
+from unison_io_braille.interfaces import BrailleCells, BrailleCell, DeviceInfo
+from unison_io_braille.translator import SimpleTranslator
+
+
+def test_dots_mask_and_pack_cells():
+    assert dots_mask([True, False, True, False, False, False]) == 0x05
+    assert dots_mask([False] * 7 + [True]) == 0x80
+    cells = BrailleCells(rows=1, cols=2, cells=[BrailleCell([True, True, False, False, False, False]), BrailleCell([False] * 6)])
+    assert pack_cells(cells) == bytes([0x03, 0x00])
+
+
+def test_translator_packed_matches_dots():
+    cells = SimpleTranslator().text_to_cells("Bad h")
+    assert cells.packed == bytes(dots_mask(c.dots) for c in cells.cells)
+
+
+def test_encoder_reuses_buffer_and_prefers_packed():
+    enc = CellReportEncoder(0x08, capacity=2)
+    frame = enc.encode(BrailleCells(rows=1, cols=1, cells=[BrailleCell([True] + [False] * 5)], cursor_position=0))
+    assert bytes(frame) == bytes([0x08, 1, 0, 0x01])
+    # packed buffer wins over per-cell dots; buffer grows past initial capacity
+    frame = enc.encode(BrailleCells(rows=1, cols=3, cells=[], packed=bytes([1, 2, 3])))
+    assert bytes(frame) == bytes([0x08, 3, 0xFF, 1, 2, 3])
+    assert enc.capacity == 3
+
+
+def test_driver_reserves_capacity_from_device_caps():
+    drv = HandyTechDriver()
+    drv.open(DeviceInfo(id="ht1", transport="usb", capabilities={"cells": 80}))
+    assert drv._encoder.capacity == 80
+    drv.send_cells(SimpleTranslator().text_to_cells("abc"))
+    assert drv.last_output == bytes([0x20, 3, 2, 0x01, 0x03, 0x09])
+
+
+def test_driver_output_is_a_view_and_deferred_writers_copy_it():
+    from unison_io_braille.hid_io import HIDWriter
+
+    class FakeDev:
+        def __init__(self):
+            self.writes = []
+
+        def write(self, data):
+            self.writes.append(bytes(data))
+
+        def close(self):
+            pass
+
+    dev = FakeDev()
+    writer = HIDWriter(dev)
+    drv = HandyTechDriver()
+    drv.open(DeviceInfo(id="ht1", transport="usb"))
+    drv.set_output_writer(writer)
+    drv.send_cells(SimpleTranslator().text_to_cells("a"))
+    first = drv.last_output
+    drv.send_cells(SimpleTranslator().text_to_cells("b"))
+    assert isinstance(first, memoryview) and first.obj is drv.last_output.obj  # no per-frame allocation
+    writer.close()
+    assert dev.writes == [bytes([0x20, 1, 0, 0x01]), bytes([0x20, 1, 0, 0x03])]
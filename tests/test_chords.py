@@ -0,0 +1,105 @@
+from unison_io_braille.back_translator import BackTranslationSessions
+from unison_io_braille.driver_registry import BrailleDeviceDriverRegistry
+from unison_io_braille.drivers.chords import KEY_STATE_REPORT, ChordRecognizer
+from unison_io_braille.drivers.handytech import HandyTechDriver
+from unison_io_braille.interfaces import DeviceInfo
+from unison_io_braille.manager import BrailleDeviceManager
+from unison_io_braille.translator_loader import get_translator
+
+
+def state(dots=0, space=False):
+    return bytes([KEY_STATE_REPORT, dots, 0x01 if space else 0])
+
+
+def run(recognizer, timeline):
+    """Feed (time, report) pairs, polling every millisecond like the service timer; returns (time, event) pairs."""
+    emitted = []
+    reports = dict(timeline)
+    end = max(reports) + 2.0
+    t = 0.0
+    while t <= end:
+        now = round(t, 3)
+        events = recognizer.on_report(reports[now], now) if now in reports else recognizer.poll(now)
+        emitted.extend((now, e) for e in events)
+        t += 0.001
+    return emitted
+
+
+def test_chord_is_emitted_at_first_release_not_after_all_keys_are_up():
+    rec = ChordRecognizer("d", hold_seconds=0.5)
+    # dots 1, 2, 4 pressed over 30 ms, released over 40 ms
+    timeline = [(0.0, state(0b0001)), (0.01, state(0b0011)), (0.03, state(0b1011)), (0.12, state(0b1010)), (0.14, state(0b1000)), (0.16, state(0))]
+    emitted = run(rec, timeline)
+    assert [(e.type, e.keys) for _, e in emitted] == [("chord", ("dot1", "dot2", "dot4"))]
+    latency = emitted[0][0] - 0.12  # first release makes the chord unambiguous
+    assert latency == 0.0
+    assert emitted[0][0] < 0.16  # an all-released recognizer would only know at 0.16
+
+
+def test_hold_timeout_commits_then_autorepeats_until_release():
+    rec = ChordRecognizer("d", hold_seconds=0.3, repeat_delay=0.2, repeat_interval=0.1)
+    emitted = run(rec, [(0.0, state(0b0100)), (0.95, state(0))])
+    times = [t for t, _ in emitted]
+    assert times == [0.3, 0.5, 0.6, 0.7, 0.8, 0.9]
+    assert all(e.keys == ("dot3",) for _, e in emitted)
+    assert rec.deadline is None and not rec.held
+
+
+def test_space_combos_and_rolling_input():
+    rec = ChordRecognizer("d", hold_seconds=1.0)
+    out = rec.on_report(state(space=True), 0.0) + rec.on_report(state(0b0001, space=True), 0.02) + rec.on_report(state(), 0.08)
+    assert [(e.type, e.keys) for e in out] == [("chord", ("dot1", "space"))]
+    out = rec.on_report(state(space=True), 0.2) + rec.on_report(state(), 0.25)
+    assert [(e.type, e.keys) for e in out] == [("nav", ("space",))]
+    # Rolling: dot1 held past its chord's release point does not leak into the next chord.
+    out = rec.on_report(state(0b0011), 0.3) + rec.on_report(state(0b0001), 0.35)
+    out += rec.on_report(state(0b0101), 0.4) + rec.on_report(state(0b0001), 0.45) + rec.on_report(state(), 0.5)
+    assert [e.keys for e in out] == [("dot1", "dot2"), ("dot3",)]
+
+
+def test_driver_key_state_reports_flow_through_back_translation_and_manager_timer():
+    driver = HandyTechDriver()
+    driver.open(DeviceInfo(id="ht", transport="usb"))
+    events = list(driver.on_packet(state(0b0011))) + list(driver.on_packet(state(0)))
+    assert [(e.type, e.keys, e.device_id) for e in events] == [("chord", ("dot1", "dot2"), "ht")]
+    sessions = BackTranslationSessions(trie_for=lambda table: get_translator(table).reverse_trie(), table_for=lambda device_id: "ueb_grade1")
+    assert [e.text for e in sessions.process("ht", events)][-1] == "b"
+    command = [e for p in (state(0b1, True), state()) for e in driver.on_packet(p)]
+    assert [e.type for e in sessions.process("ht", command)] == ["chord"]  # space+dot1 is a command, not text
+
+    manager = BrailleDeviceManager(BrailleDeviceDriverRegistry(), writer_factory=lambda d: None, trace_dir=None)
+    manager.attach(DeviceInfo(id="focus:1", transport="usb", capabilities={"driver_key": "focus-generic"}))
+    assert manager.on_packet("focus:1", state(0b1)) == []
+    deadline = manager.next_input_deadline()
+    assert deadline is not None and manager.poll_input(deadline - 0.01) == {}
+    polled = manager.poll_input(deadline)
+    assert [e.keys for e in polled["focus:1"]] == [("dot1",)]
+    manager.close_all()
+
+
+def test_input_timer_survives_a_failing_tick(monkeypatch):
+    import asyncio
+
+    from unison_io_braille import server
+
+    manager = BrailleDeviceManager(BrailleDeviceDriverRegistry(), writer_factory=lambda d: None, trace_dir=None)
+    calls = []
+
+    def flaky_poll(now=None):
+        calls.append(now)
+        if len(calls) == 1:
+            raise RuntimeError("back-translation table vanished")
+        return {}
+
+    monkeypatch.setattr(manager, "poll_input", flaky_poll)
+    monkeypatch.setattr(server, "_manager", manager)
+    monkeypatch.setattr(server, "_INPUT_TIMER_IDLE_SECONDS", 0.005)
+
+    async def run_timer():
+        task = asyncio.create_task(server._input_timer_loop())
+        await asyncio.sleep(0.1)
+        assert not task.done()
+        task.cancel()
+
+    asyncio.run(run_timer())
+    assert len(calls) > 2
@@ -0,0 +1,67 @@
+from fastapi.testclient import TestClient
+
+from unison_io_braille import server
+from unison_io_braille.coalescer import EventCoalescer
+from unison_io_braille.driver_registry import BrailleDeviceDriverRegistry
+from unison_io_braille.ingest import encode_batch
+from unison_io_braille.interfaces import BrailleEvent, DeviceInfo
+from unison_io_braille.manager import BrailleDeviceManager
+
+
+def nav(key):
+    return BrailleEvent(type="nav", keys=(key,), device_id="d")
+
+
+def text(ch):
+    return BrailleEvent(type="text", keys=(), text=ch, device_id="d")
+
+
+def routing(cell):
+    return BrailleEvent(type="routing", keys=(f"cell-{cell}",), device_id="d")
+
+
+def test_held_nav_key_becomes_one_event_per_window_with_repeat_count():
+    co = EventCoalescer(window=0.05)
+    # Device autorepeat every 10 ms for 200 ms.
+    out = []
+    for i in range(20):
+        now = i * 0.01
+        out += [(now, e) for e in co.push("d", [nav("down")], now)]
+        out += [(now, e) for e in co.flush(now).get("d", [])]
+    out += [(1.0, e) for e in co.flush(1.0).get("d", [])]
+    assert out[0][0] == 0.0 and out[0][1].repeat == 1  # first press is not delayed
+    assert sum(e.repeat for _, e in out) == 20
+    assert len(out) <= 5 and all(e.keys == ("down",) for _, e in out)
+    assert co.stats == {"in": 20, "out": len(out)} and co.deadline is None
+
+
+def test_text_concatenates_and_routing_sweep_keeps_last_press():
+    co = EventCoalescer(window=0.05)
+    assert [e.text for e in co.push("d", [text("h"), text("e"), text("l"), text("l"), text("o")], 0.0)] == ["h"]
+    assert co.deadline == 0.05
+    out = co.push("d", [routing(3), routing(4), routing(5), routing(6)], 0.01)
+    assert [(e.type, e.text or e.keys) for e in out] == [("text", "ello"), ("routing", ("cell-3",))]
+    assert [e.keys for e in co.flush(0.07)["d"]] == [("cell-6",)]
+    # A chord flushes pending events first, so ordering is preserved.
+    chord = BrailleEvent(type="chord", keys=("dot1",), device_id="d")
+    out = co.push("d", [nav("up"), nav("up"), nav("up"), chord, nav("up")], 1.0)
+    assert [(e.type, e.repeat) for e in out] == [("nav", 1), ("nav", 2), ("chord", 1), ("nav", 1)]
+    assert EventCoalescer(window=0).push("d", [nav("up")] * 3, 0.0) == [nav("up")] * 3
+
+
+def test_service_forwards_coalesced_batches(monkeypatch):
+    manager = BrailleDeviceManager(BrailleDeviceDriverRegistry(), writer_factory=lambda d: None, trace_dir=None)
+    manager.attach(DeviceInfo(id="ht:1", transport="usb", capabilities={"driver_key": "handytech"}))
+    monkeypatch.setattr(server, "_manager", manager)
+    monkeypatch.setattr(server, "_coalescer", EventCoalescer(window=10.0))
+    sent = []
+    monkeypatch.setattr(server, "forward_events", lambda events, person_id=None: sent.extend(events))
+    client = TestClient(server.app)
+    body = encode_batch([("ht:1", b"\x01\x0d")] * 8 + [("ht:1", bytes([0x02, cell])) for cell in range(10)])
+    resp = client.post("/braille/input/batch", content=body, headers={"X-Test-Bypass": "1"})
+    assert resp.json()["events"] == 18
+    assert [(e.type, e.keys, e.repeat) for e in sent] == [("nav", ("enter",), 1), ("nav", ("enter",), 7), ("routing", ("cell-0",), 1)]
+    sent.clear()
+    server._forward_polled({}, server._coalescer.flush(force=True))
+    assert [e.keys for e in sent] == [("cell-9",)]
+    manager.close_all()
@@ -0,0 +1,118 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from unison_io_braille import server
+from unison_io_braille.discovery import DiscoveryService
+from unison_io_braille.interfaces import DeviceInfo
+
+
+def _usb(pid: str) -> DeviceInfo:
+    return DeviceInfo(id=f"usb:0x05f3:{pid}", transport="usb", vid="0x05f3", pid=pid, capabilities={"driver_key": "focus-generic"})
+
+
+def test_scan_merges_usb_and_bt_and_tracks_changes():
+    usb_devices = [_usb("0x0007")]
+    bt_devices = [DeviceInfo(id="bt:AA", transport="bt", name="Focus 40")]
+    seen = []
+
+    async def bt_scan(timeout):
+        return list(bt_devices)
+
+    svc = DiscoveryService(interval=0, bt_stale_after=60, usb_scan=lambda: list(usb_devices), bt_scan=bt_scan)
+    svc.add_listener(lambda added, removed: seen.append(([d.id for d in added], [d.id for d in removed])))
+
+    async def run():
+        assert await svc.scan_once() is True
+        assert {d.id for d in svc.devices()} == {"usb:0x05f3:0x0007", "bt:AA"}
+        assert await svc.scan_once() is False  # unchanged table, no version bump
+        usb_devices[:] = [_usb("0x0008")]
+        bt_devices.clear()  # BT keeps stale entries until bt_stale_after
+        assert await svc.scan_once() is True
+
+    asyncio.run(run())
+    assert svc.version == 2
+    assert {d.id for d in svc.devices()} == {"usb:0x05f3:0x0008", "bt:AA"}
+    assert seen[-1] == (["usb:0x05f3:0x0008"], ["usb:0x05f3:0x0007"])
+    entry = svc.snapshot()["devices"][0]
+    assert entry["first_seen"] <= entry["last_seen"]
+
+
+def test_failed_scan_keeps_cached_devices():
+    calls = {"n": 0}
+
+    def usb_scan():
+        calls["n"] += 1
+        if calls["n"] > 1:
+            raise RuntimeError("hid busy")
+        return [_usb("0x0007")]
+
+    async def bt_scan(timeout):
+        return []
+
+    svc = DiscoveryService(interval=0, usb_scan=usb_scan, bt_scan=bt_scan)
+
+    async def run():
+        await svc.scan_once()
+        assert await svc.scan_once() is False
+
+    asyncio.run(run())
+    assert [d.id for d in svc.devices()] == ["usb:0x05f3:0x0007"]
+
+
+def test_scan_requested_mid_scan_runs_again_afterwards():
+    devices = []
+    calls = []
+
+    async def bt_scan(timeout):
+        calls.append("bt")
+        await asyncio.sleep(0.05)
+        return []
+
+    def usb_scan():
+        calls.append("usb")
+        return list(devices)
+
+    svc = DiscoveryService(interval=0, usb_scan=usb_scan, bt_scan=bt_scan)
+
+    async def run():
+        first = asyncio.create_task(svc.scan_once())
+        await asyncio.sleep(0.01)
+        devices.append(_usb("0x000A"))  # plugged in after the running scan enumerated USB
+        hotplug = [asyncio.create_task(svc.scan_once(bt=False)) for _ in range(3)]
+        assert await first is False
+        assert await asyncio.gather(*hotplug) == [True, True, True]  # all see the rescan's result
+
+    asyncio.run(run())
+    assert [d.id for d in svc.devices()] == ["usb:0x05f3:0x000A"]
+    assert calls == ["usb", "bt", "usb"]  # one shared rescan, USB only
+
+
+def test_long_poll_wakes_on_change_and_times_out():
+    devices = []
+
+    async def bt_scan(timeout):
+        return []
+
+    svc = DiscoveryService(interval=0, usb_scan=lambda: list(devices), bt_scan=bt_scan)
+
+    async def run():
+        assert await svc.wait_for_change(0, timeout=0.01) is False
+        waiter = asyncio.create_task(svc.wait_for_change(0, timeout=1.0))
+        await asyncio.sleep(0)
+        devices.append(_usb("0x0009"))
+        await svc.refresh()
+        assert await waiter is True
+
+    asyncio.run(run())
+
+
+def test_discover_endpoint_answers_from_cache(monkeypatch):
+    async def bt_scan(timeout):
+        raise AssertionError("endpoint must not scan without refresh")
+
+    svc = DiscoveryService(interval=0, usb_scan=lambda: [], bt_scan=bt_scan)
+    monkeypatch.setattr(server, "_discovery", svc)
+    client = TestClient(server.app)
+    data = client.get("/braille/devices/discover", headers={"X-Test-Bypass": "1"}).json()
+    assert data == {"version": 0, "scanned_at": None, "devices": []}
@@ -0,0 +1,44 @@
+from unison_io_braille.drivers.focus import FocusBrailleDriver
+from unison_io_braille.drivers.hims import HimsBrailleDriver
+from unison_io_braille.drivers.parsing import CHORD_KEYS, ROUTING_TABLE, ReportParser, key_table
+from unison_io_braille.interfaces import DeviceInfo
+
+
+def test_key_table_precedence_and_interning():
+    table = key_table({0x0D: ("nav", ["enter"]), 0x41: ("nav", ["custom"])}, chords=True)
+    assert len(table) == 256
+    assert table[0x0D] == ("nav", ("enter",), None)
+    assert table[0x41][1] == ("custom",)  # nav wins over ASCII 'A'
+    assert table[0x62] == ("text", (), "b")
+    assert table[0x8D] == ("chord", ("dot1", "dot3", "dot4"), None)
+    assert table[0x80] is None and table[0x00] is None
+    assert table[0x81][1] is CHORD_KEYS[1]
+
+
+def test_parser_accepts_memoryview_and_returns_fresh_events():
+    parser = ReportParser({0x01: key_table({}), 0x02: ROUTING_TABLE})
+    parser.bind("dev1")
+    data = bytearray([0x00, 0x01, ord("a"), 0x07, ord("a")])
+    events = parser.parse(memoryview(data)[1:])
+    assert [e.text for e in events] == ["a", "a"]
+    assert events[0] is not events[1]
+    assert events[0].device_id == "dev1"
+    events[0].timestamp = 1.0  # callers own the events they get back
+    assert parser.parse(b"\x01a")[0].timestamp is None
+    assert parser.parse(b"") == []
+    assert parser.parse(bytes([0x7F, 1, 2])) == []
+    routing = parser.parse(bytes([0x02, 0, 255]))
+    assert [e.keys for e in routing] == [("cell-0",), ("cell-255",)]
+
+
+def test_drivers_bind_device_id_on_open_and_close():
+    drv = FocusBrailleDriver()
+    drv.open(DeviceInfo(id="focus1", transport="usb"))
+    assert drv.on_packet(bytes([0x02, 1]))[0].device_id == "focus1"
+    drv.close()
+    assert drv.on_packet(bytes([0x02, 1]))[0].device_id is None
+    hims = HimsBrailleDriver()
+    hims.open(DeviceInfo(id="hims1", transport="usb"))
+    # HIMS maps space to a nav key rather than text
+    events = hims.on_packet(bytes([0x01, 0x20]))
+    assert events[0].type == "nav" and events[0].keys == ("space",)
@@ -0,0 +1,30 @@
+import json
+from datetime import datetime, timezone
+
+from unison_io_braille.events import _ts, braille_input_event, encode_input_event
+from unison_io_braille.interfaces import BrailleEvent
+from unison_io_braille.uplink import _frame
+
+
+def test_encoded_envelope_matches_dict_builder():
+    for evt, person in [
+        (BrailleEvent(type="chord", keys=("dot1", "dot2"), text=None, device_id="focus1"), "alice"),
+        (BrailleEvent(type="text", keys=(), text='say "hé"', device_id=None), None),
+        (BrailleEvent(type="text", keys=[], text="x" * 100, device_id="sim"), "bob"),
+        (BrailleEvent(type="nav", keys=("down",), device_id="sim", repeat=6), "bob"),
+    ]:
+        encoded = json.loads(encode_input_event(evt, person_id=person))
+        expected = braille_input_event(evt, person_id=person)
+        assert datetime.fromisoformat(encoded.pop("timestamp")).tzinfo is not None
+        expected.pop("timestamp")
+        assert encoded == expected
+
+
+def test_fast_timestamp_tracks_wall_clock():
+    ts = datetime.fromisoformat(_ts())
+    assert abs((datetime.now(timezone.utc) - ts).total_seconds()) < 1.0
+
+
+def test_uplink_frames_splice_serialized_envelopes():
+    raw = encode_input_event(BrailleEvent(type="text", keys=(), text="a"), person_id="p")
+    assert json.loads(_frame(7, raw)) == {"seq": 7, "event": json.loads(raw)}
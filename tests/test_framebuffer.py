@@ -0,0 +1,84 @@
+import asyncio
+import struct
+
+import pytest
+
+from unison_io_braille.driver_registry import BrailleDeviceDriverRegistry
+from unison_io_braille.framebuffer import Frame, FramebufferClient, FramebufferError, FramebufferWatcher
+from unison_io_braille.interfaces import DeviceInfo
+from unison_io_braille.manager import BrailleDeviceManager
+from unison_io_braille.translator_loader import get_translator
+
+
+def test_renderer_frames_reach_the_driver(tmp_path):
+    manager = BrailleDeviceManager(BrailleDeviceDriverRegistry(), writer_factory=lambda d: None, trace_dir=None)
+    driver = manager.attach(DeviceInfo(id="focus:1", transport="usb", capabilities={"driver_key": "focus-generic"}))
+    watcher = FramebufferWatcher(str(tmp_path), manager.send_cells, interval=0.001)
+    path = watcher.add("focus:1", 40)
+    packed = get_translator("ueb_grade1").text_to_cells("hello").packed
+    with FramebufferClient(path) as client:
+        assert client.capacity == 40
+        assert watcher.poll_once() == 0  # nothing written yet
+        client.write(b"\x01" * 3)
+        seq = client.write(packed, cursor=2)
+        assert seq == 4
+        assert watcher.poll_once() == 1 and watcher.poll_once() == 0  # only the latest frame, once
+        assert driver.last_output == bytes([0x08, len(packed), 2]) + packed
+
+        async def live():
+            task = asyncio.create_task(watcher.run())
+            client.write(b"\x07" * 50)  # longer than the display: truncated
+            await asyncio.sleep(0.05)
+            task.cancel()
+
+        asyncio.run(live())
+        assert driver.last_output == bytes([0x08, 40, 0xFF]) + b"\x07" * 40
+    watcher.close()
+    assert not list(tmp_path.iterdir())
+    manager.close_all()
+
+
+def test_reader_skips_frames_mid_write(tmp_path):
+    sent = []
+    watcher = FramebufferWatcher(str(tmp_path), lambda device_id, cells: sent.append(cells.packed))
+    path = watcher.add("d", 4)
+    client = FramebufferClient(path)
+    client.write(b"\x01\x02")
+    with open(path, "r+b") as fh:  # a writer that died after marking the frame in progress
+        fh.seek(8)
+        fh.write(struct.pack("<I", 3))
+    assert watcher.poll_once() == 0
+    client.write(b"\x03")  # the next writer recovers
+    assert watcher.poll_once() == 1 and sent == [b"\x03"]
+    (tmp_path / "junk.fb").write_bytes(b"nope" * 10)
+    with pytest.raises(FramebufferError):
+        FramebufferClient(str(tmp_path / "junk.fb"))
+    client.close()
+    watcher.close()
+
+
+def test_watcher_sends_frames_off_the_event_loop(tmp_path):
+    import threading
+
+    threads = []
+    watcher = FramebufferWatcher(str(tmp_path), lambda device_id, cells: threads.append(threading.current_thread()), interval=0.001)
+    path = watcher.add("d", 4)
+
+    async def live():
+        task = asyncio.create_task(watcher.run())
+        with FramebufferClient(path) as client:
+            assert watcher.changed() == []
+            client.write(b"\x01")
+            assert watcher.changed() == ["d"]
+            await asyncio.sleep(0.05)
+        task.cancel()
+
+    asyncio.run(live())
+    assert len(threads) == 1 and threads[0] is not threading.main_thread()
+    watcher.close()
+
+
+def test_frame_cells_keep_the_renderer_layout():
+    cells = Frame(sequence=2, cells=b"\x01\x02\x03\x04", cursor=1, cols=2, rows=2).to_cells()
+    assert (cells.cols, cells.rows, cells.cursor_position) == (2, 2, 1)
+    assert Frame(sequence=2, cells=b"\x01\x02", cursor=None, cols=0, rows=0).to_cells().cols == 2
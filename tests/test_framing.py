@@ -0,0 +1,115 @@
+import random
+import time
+
+import pytest
+
+from unison_io_braille.driver_registry import BrailleDeviceDriverRegistry
+from unison_io_braille.drivers.focus import FocusBrailleDriver
+from unison_io_braille.drivers.framing import Delimited, FixedSize, FrameAssembler, LengthPrefixed
+from unison_io_braille.drivers.handytech import HandyTechDriver
+from unison_io_braille.drivers.hims import HimsBrailleDriver
+from unison_io_braille.interfaces import DeviceInfo
+from unison_io_braille.manager import BrailleDeviceManager
+
+
+def encode(rule, report: bytes) -> bytes:
+    if isinstance(rule, LengthPrefixed):
+        return bytes([len(report)]) + report
+    if isinstance(rule, Delimited):
+        return rule.encode(report)
+    return report
+
+
+def random_reports(rng: random.Random, driver_cls, count: int):
+    reports = []
+    for _ in range(count):
+        kind = rng.choice([0x01, 0x02, 0x03])
+        if kind == 0x03:
+            reports.append(bytes([0x03, rng.randrange(256), rng.randrange(2)]))
+        elif isinstance(driver_cls.STREAM_FRAMING, FixedSize):
+            reports.append(bytes([kind, rng.randrange(256)]))
+        else:
+            reports.append(bytes([kind]) + bytes(rng.randrange(256) for _ in range(rng.randrange(1, 6))))
+    return reports
+
+
+def split(rng: random.Random, data: bytes):
+    i = 0
+    while i < len(data):
+        n = rng.choice([1, 1, 2, 3, 7, 16, 64, 300])
+        yield data[i : i + n]
+        i += n
+
+
+def test_rules_frame_in_place_and_resynchronise():
+    fixed = FrameAssembler(FixedSize({0x01: 2, 0x03: 3}))
+    frames = list(fixed.feed(b"\x01\x61\xee\x03\x01"))
+    assert [bytes(f) for f in frames] == [b"\x01\x61"]
+    assert isinstance(frames[0], memoryview) and frames[0].obj is fixed._buf
+    assert fixed.stats["skipped"] == 1 and fixed.pending == 2
+    assert [bytes(f) for f in fixed.feed(b"\x00")] == [b"\x03\x01\x00"]
+
+    prefixed = FrameAssembler(LengthPrefixed(length_size=2))
+    assert [bytes(f) for f in prefixed.feed(b"\x02\x00\x01\x61\x00\x00\x01")] == [b"\x01\x61"]
+    assert [bytes(f) for f in prefixed.feed(b"\x00\x0d")] == [b"\x0d"]
+    with pytest.raises(ValueError):
+        LengthPrefixed(length_size=3)
+
+    slip = Delimited()
+    delimited = FrameAssembler(slip)
+    wire = slip.encode(b"\x02\xc0\xdb") + slip.encode(b"\x01\x61")
+    assert wire.count(0xC0) == 2
+    assert [bytes(f) for f in delimited.feed(wire)] == [b"\x02\xc0\xdb", b"\x01\x61"]
+
+
+def test_partial_frame_larger_than_the_buffer_is_dropped():
+    assembler = FrameAssembler(Delimited(end=0x0A, escape=None), capacity=8)
+    assert list(assembler.feed(b"0123456789abc")) == []
+    assert assembler.stats["overflows"] == 1
+    assert [bytes(f) for f in assembler.feed(b"\nok\n")] == [b"89abc", b"ok"]
+
+
+@pytest.mark.parametrize("driver_cls", [FocusBrailleDriver, HandyTechDriver, HimsBrailleDriver])
+@pytest.mark.parametrize("seed", range(5))
+def test_fuzzed_stream_splits_yield_the_same_reports_and_events(driver_cls, seed):
+    rng = random.Random(seed)
+    rule = driver_cls.STREAM_FRAMING
+    reports = random_reports(rng, driver_cls, 400)
+    wire = b"".join(encode(rule, r) for r in reports)
+    # A small buffer makes the write position wrap many times.
+    assembler = FrameAssembler(rule, capacity=32)
+    streamed, whole = driver_cls(), driver_cls()
+    received, streamed_events = [], []
+    for chunk in split(rng, wire):
+        for frame in assembler.feed(chunk):
+            received.append(bytes(frame))
+            streamed_events.extend((e.type, e.keys, e.text) for e in streamed.on_packet(frame))
+    assert received == reports
+    assert assembler.pending == 0 and assembler.stats["frames"] == len(reports)
+    assert streamed_events == [(e.type, e.keys, e.text) for r in reports for e in whole.on_packet(r)]
+
+
+def test_manager_reassembles_stream_input_for_the_driver(tmp_path):
+    manager = BrailleDeviceManager(BrailleDeviceDriverRegistry(), writer_factory=lambda d: None, trace_dir=str(tmp_path))
+    manager.attach(DeviceInfo(id="ht:1", transport="serial", capabilities={"driver_key": "handytech"}))
+    assert manager.on_stream("ht:1", b"\x02\x01") == []
+    events = manager.on_stream("ht:1", b"\x61\x02\x02\x05")
+    assert [(e.type, e.text, e.keys) for e in events] == [("text", "a", ()), ("routing", None, ("cell-5",))]
+    assert manager.get("ht:1").recorder.packets == 2
+    assert manager.on_stream("ghost", b"\x01") is None
+    manager.close_all()
+
+
+def test_reassembly_throughput():
+    rng = random.Random(7)
+    rule = Delimited()
+    reports = random_reports(rng, HimsBrailleDriver, 2000)
+    wire = b"".join(rule.encode(r) for r in reports) * 25
+    chunks = list(split(rng, wire))
+    assembler = FrameAssembler(rule)
+    start = time.perf_counter()
+    frames = sum(1 for chunk in chunks for _ in assembler.feed(chunk))
+    elapsed = time.perf_counter() - start
+    assert frames == len(reports) * 25
+    # Generous floor: well above any display's report rate, even on a slow CI box.
+    assert frames / elapsed > 50_000
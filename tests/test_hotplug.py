@@ -0,0 +1,58 @@
+import asyncio
+
+from unison_io_braille.device_db import DeviceDatabase, default_database
+from unison_io_braille.discovery import DiscoveryService
+from unison_io_braille.driver_registry import BrailleDeviceDriverRegistry
+from unison_io_braille.drivers.focus import FocusBrailleDriver
+from unison_io_braille.hotplug import HotplugWatcher
+from unison_io_braille.interfaces import DeviceInfo
+from unison_io_braille.manager import BrailleDeviceManager
+
+
+def test_device_db_exact_match_and_vendor_fallback():
+    db = DeviceDatabase([
+        {"vid": "0x05f3", "pid": "0x0008", "driver": "focus-generic", "cells": 40},
+        {"vid": 0x05F3, "driver": "focus-generic"},
+        {"pid": "0x0001", "driver": "broken"},
+    ])
+    assert len(db) == 2
+    exact = db.lookup("0x05f3", 0x0008)
+    assert exact.driver_key == "focus-generic" and exact.capabilities == {"cells": 40, "rows": 1, "cols": 40}
+    assert db.lookup(0x05F3, 0x1234).capabilities == {}
+    assert db.lookup("0x1234", "0x0001") is None
+    assert db.lookup(None) is None
+
+
+def test_bundled_device_db_covers_known_vendors():
+    db = default_database()
+    assert db.lookup("0x05f3", "0x0009").capabilities["cells"] == 80
+    assert db.lookup("0x1fe4", "0xffff").driver_key == "handytech"
+    assert db.lookup("0x2001", "0x2003").driver_key == "hims"
+
+
+def test_hotplug_attaches_and_detaches_known_usb_devices():
+    usb = []
+
+    async def bt_scan(timeout):
+        return []
+
+    discovery = DiscoveryService(interval=0, usb_scan=lambda: list(usb), bt_scan=bt_scan)
+    manager = BrailleDeviceManager(BrailleDeviceDriverRegistry())
+    events = []
+    watcher = HotplugWatcher(manager, discovery, use_udev=False, on_attach=lambda d: events.append(("+", d.id)), on_detach=lambda i: events.append(("-", i)))
+    focus = DeviceInfo(id="usb:0x05f3:0x0008", transport="usb", capabilities={"driver_key": "focus-generic", "cells": 40})
+    unknown = DeviceInfo(id="usb:0x046d:0xc52b", transport="usb", capabilities={"driver_key": None})
+
+    async def run():
+        usb[:] = [focus, unknown]
+        await discovery.scan_once(bt=False)
+        assert isinstance(manager.active.get(focus.id), FocusBrailleDriver)
+        assert unknown.id not in manager.active
+        await discovery.scan_once(bt=False)  # no change, no re-attach
+        usb.clear()
+        await discovery.scan_once(bt=False)
+        assert focus.id not in manager.active
+
+    asyncio.run(run())
+    assert events == [("+", focus.id), ("-", focus.id)]
+    assert watcher.attached == {}
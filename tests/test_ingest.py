@@ -0,0 +1,94 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from unison_io_braille import server
+from unison_io_braille.coalescer import EventCoalescer
+from unison_io_braille.driver_registry import BrailleDeviceDriverRegistry
+from unison_io_braille.ingest import BatchFormatError, decode_batch, decode_device_batch, encode_batch, group_by_device
+from unison_io_braille.interfaces import DeviceInfo
+from unison_io_braille.manager import BrailleDeviceManager
+
+HEADERS = {"X-Test-Bypass": "1"}
+
+
+def test_batch_codec_round_trip_and_truncation():
+    packets = [("focus:1", b"\x01\x61"), ("ht:2", b"\x02\x05"), ("focus:1", bytes([0x01, 0x8B]))]
+    data = encode_batch(packets)
+    assert decode_batch(data) == packets
+    assert group_by_device(packets) == {"focus:1": [b"\x01\x61", bytes([0x01, 0x8B])], "ht:2": [b"\x02\x05"]}
+    assert decode_device_batch("d", b"\x02\x00\x01\x61\x01\x00\x0d") == [("d", b"\x01\x61"), ("d", b"\x0d")]
+    with pytest.raises(BatchFormatError):
+        decode_batch(data[:-1])
+    with pytest.raises(BatchFormatError):
+        decode_device_batch("d", b"\x05\x00\x01")
+    with pytest.raises(BatchFormatError):
+        decode_batch(b"\x01\xff\x01\x00A")
+
+
+@pytest.fixture
+def forwarded(monkeypatch):
+    manager = BrailleDeviceManager(BrailleDeviceDriverRegistry(), writer_factory=lambda d: None)
+    manager.attach(DeviceInfo(id="focus:1", transport="usb", capabilities={"driver_key": "focus-generic"}))
+    monkeypatch.setattr(server, "_manager", manager)
+    monkeypatch.setattr(server, "_coalescer", EventCoalescer(window=0))  # see test_coalescer.py
+    sent = []
+    monkeypatch.setattr(server, "forward_events", lambda events, person_id=None: sent.extend(events))
+    yield sent
+    manager.close_all()
+
+
+def test_bulk_endpoint_parses_binary_reports_with_the_driver(forwarded):
+    client = TestClient(server.app)
+    body = encode_batch([("focus:1", bytes([0x01, 0x8B])), ("focus:1", b"\x02\x05"), ("ghost", b"\x01\x61")])
+    resp = client.post("/braille/input/batch", content=body, headers={**HEADERS, "Content-Type": "application/octet-stream"})
+    assert resp.status_code == 200
+    assert resp.json() == {"ok": False, "packets": 2, "events": 3, "rejected": {"ghost": 1}}
+    assert [(e.type, e.text) for e in forwarded] == [("chord", None), ("text", "f"), ("routing", None)]  # back-translated
+    assert forwarded[0].keys == ("dot1", "dot2", "dot4")
+    assert client.post("/braille/input/batch", content=b"\x09", headers=HEADERS).status_code == 400
+    assert client.post("/braille/input/batch", content=b"\x01\xff\x01\x00A", headers=HEADERS).status_code == 400
+
+    forwarded.clear()
+    resp = client.post("/braille/input/batch?device_id=focus:1", content=b"\x02\x00\x01\x61", headers=HEADERS)
+    assert resp.json()["events"] == 1 and forwarded[0].text == "a"
+
+
+def test_single_input_accepts_binary_encodings(forwarded):
+    client = TestClient(server.app)
+    resp = client.post("/braille/input", json={"device_id": "focus:1", "data": "018b", "encoding": "hex"}, headers=HEADERS)
+    assert resp.json() == {"ok": True}
+    assert forwarded[0].type == "chord"
+    resp = client.post("/braille/input", json={"device_id": "focus:1", "data": "AYs=", "encoding": "base64"}, headers=HEADERS)
+    assert resp.json() == {"ok": True} and [e.type for e in forwarded[2:]] == ["chord", "text"]
+    assert client.post("/braille/input", json={"device_id": "focus:1", "data": "x", "encoding": "rot13"}, headers=HEADERS).status_code == 400
+
+
+def test_websocket_binary_frames_go_through_drivers(forwarded):
+    client = TestClient(server.app)
+    with client.websocket_connect("/braille/output", headers=HEADERS) as ws:
+        assert ws.receive_json()["event"] == "connected"
+        ws.send_bytes(encode_batch([("focus:1", bytes([0x01, 0x8B])), ("focus:1", b"\x01\x62")]))
+        ws.send_bytes(b"\x07abc")
+        assert ws.receive_json()["event"] == "error"
+        ws.send_text("hello")
+        ws.send_bytes(b"\x07abc")
+        ws.receive_json()
+    assert [(e.type, e.text) for e in forwarded] == [("chord", None), ("text", "f"), ("text", "b"), ("text", "hello")]
+
+
+def test_websocket_text_frames_are_coalesced_on_the_input_thread(forwarded, monkeypatch):
+    import threading
+
+    pushed = []
+    coalescer = server._coalescer
+    push = coalescer.push
+    monkeypatch.setattr(coalescer, "push", lambda device_id, events: (pushed.append(threading.current_thread().name), push(device_id, events))[1])
+    client = TestClient(server.app)
+    with client.websocket_connect("/braille/output", headers=HEADERS) as ws:
+        assert ws.receive_json()["event"] == "connected"
+        ws.send_bytes(encode_batch([("focus:1", b"\x01\x62")]))
+        ws.send_text("hello")
+        ws.send_bytes(b"\x07abc")
+        ws.receive_json()
+    assert [(e.type, e.text) for e in forwarded] == [("text", "b"), ("text", "hello")]
+    assert len(pushed) == 2 and all(name.startswith("braille-input") for name in pushed)
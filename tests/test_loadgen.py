@@ -0,0 +1,51 @@
+import random
+
+from unison_io_braille.driver_registry import BrailleDeviceDriverRegistry
+from unison_io_braille.interfaces import DeviceInfo
+from unison_io_braille import loadgen
+from unison_io_braille.loadgen import VENDORS, OpStats, request_headers, spawn_service, vendor_reports
+
+
+def test_vendor_reports_parse_into_events():
+    registry = BrailleDeviceDriverRegistry()
+    rng = random.Random(7)
+    for key in VENDORS:
+        driver = registry.get(key)()
+        driver.open(DeviceInfo(id=f"load-{key}", transport="sim"))
+        types = set()
+        for _ in range(300):
+            events = [e for report in vendor_reports(key, rng) for e in driver.on_packet(report)]
+            assert events, key
+            types.update(e.type for e in events)
+        if key == "sim":
+            assert types == {"text"}
+        else:
+            assert {"text", "nav", "routing", "chord"} <= types
+
+
+def test_auth_bypass_is_opt_in():
+    assert request_headers() == {}
+    assert request_headers(test_bypass=True) == {"X-Test-Bypass": "1"}
+    assert request_headers(token="t") == {"Authorization": "Bearer t"}
+
+
+def test_op_stats_summary():
+    stats = OpStats()
+    for ms in range(1, 101):
+        stats.record(float(ms))
+    stats.errors = 5
+    summary = stats.summary(seconds=2.0)
+    assert summary["requests"] == 105 and summary["per_second"] == 50.0
+    assert summary["p50_ms"] == 50.5 and summary["p99_ms"] == 99.0
+    assert summary["error_rate"] == round(5 / 105, 4)
+
+
+def test_multi_worker_service_shares_state(monkeypatch):
+    spawned = []
+    monkeypatch.delenv("UNISON_BRAILLE_STATE_SOCKET", raising=False)
+    monkeypatch.setattr(loadgen.subprocess, "Popen", lambda cmd, env: spawned.append((cmd, env)))
+    spawn_service(9999)
+    spawn_service(9999, workers=4)
+    (single_cmd, single_env), (multi_cmd, multi_env) = spawned
+    assert "--workers" not in single_cmd and "UNISON_BRAILLE_STATE_SOCKET" not in single_env
+    assert multi_cmd[-2:] == ["--workers", "4"] and multi_env["UNISON_BRAILLE_STATE_SOCKET"].endswith("state.sock")
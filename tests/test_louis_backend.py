@@ -0,0 +1,68 @@
+import types
+
+import pytest
+
+from unison_io_braille import louis_backend
+from unison_io_braille.translator_loader import TableTranslator
+
+
+class FakeLouis(types.SimpleNamespace):
+    dotsIO = 4
+
+    def __init__(self, known=("en-ueb-g1.ctb",)):
+        super().__init__(known=set(known), checks=0, calls=0)
+
+    def checkTable(self, tables):
+        self.checks += 1
+        if not set(tables) <= self.known:
+            raise RuntimeError("table not found")
+
+    def translateString(self, tables, text, mode=0):
+        self.calls += 1
+        assert mode == self.dotsIO
+        # 'a' -> dots 1, 'b' -> dots 1-2, anything else -> dots 7+8 (must be masked for 6-dot)
+        masks = {"a": 0x01, "b": 0x03}
+        return "".join(chr(0x8000 | masks.get(ch, 0xC0)) for ch in text)
+
+
+@pytest.fixture
+def fake_louis(monkeypatch):
+    fake = FakeLouis()
+    monkeypatch.setattr(louis_backend, "louis", fake)
+    monkeypatch.setattr(louis_backend, "_BACKENDS", {})
+    return fake
+
+
+def test_backend_decodes_dots_io_in_bulk(fake_louis):
+    backend = louis_backend.LouisBackend(["en-ueb-g1.ctb"])
+    assert backend.translate_packed("abz") == bytes([0x01, 0x03, 0x00])
+    eight = louis_backend.LouisBackend(["en-ueb-g1.ctb"], eight_dot=True)
+    assert eight.translate_packed("z") == bytes([0xC0])
+    assert backend.translate_many(["a", "ba"]) == [b"\x01", b"\x03\x01"]
+
+
+def test_backend_resolved_once_and_missing_table_degrades(fake_louis):
+    assert louis_backend.get_backend("en-ueb-g1.ctb") is louis_backend.get_backend(["en-ueb-g1.ctb"])
+    assert louis_backend.get_backend("missing.ctb") is None
+    louis_backend.get_backend("missing.ctb")
+    assert fake_louis.checks == 2  # one per distinct table list
+
+
+def test_table_translator_uses_louis_when_available(fake_louis):
+    tr = TableTranslator("ueb_grade1")
+    cells = tr.text_to_cells("ab")
+    assert fake_louis.calls == 1
+    assert cells.packed == bytes([0x01, 0x03])
+    assert cells.cells[1].dots[:2] == (True, True) and len(cells.cells[1].dots) == 6
+    assert [c.packed for c in tr.translate_many(["a", "b"])] == [b"\x01", b"\x03"]
+    # grade 2 names a table the fake does not have: YAML mapping is used instead
+    grade2 = TableTranslator("ueb_grade2")
+    assert len(grade2.text_to_cells("and").cells) == 1
+    assert fake_louis.calls == 3
+
+
+def test_table_translator_without_louis(monkeypatch):
+    monkeypatch.setattr(louis_backend, "louis", None)
+    tr = TableTranslator("ueb_grade1")
+    assert tr._louis is None
+    assert tr.translate_many(["ab"])[0].packed == bytes([0x01, 0x03])
@@ -0,0 +1,143 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from unison_io_braille.driver_registry import BrailleDeviceDriverRegistry
+from unison_io_braille.hid_io import HIDWriter
+from unison_io_braille.interfaces import BrailleCells, DeviceInfo
+from unison_io_braille.io_worker import DeviceIOWorker
+from unison_io_braille.manager import BrailleDeviceManager
+
+
+class FakeHIDDevice:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.frames = []
+        self.closed = False
+
+    def write(self, data) -> None:
+        if self.delay:
+            time.sleep(self.delay)
+        self.frames.append(bytes(data))
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _frame(seq: int) -> BrailleCells:
+    return BrailleCells(rows=1, cols=2, cells=[], packed=bytes([seq >> 8, seq & 0xFF]))
+
+
+def _seq(frame: bytes) -> int:
+    return (frame[3] << 8) | frame[4]
+
+
+def test_worker_drops_oldest_when_full_and_flushes_on_close():
+    gate = threading.Event()
+    written = []
+    worker = DeviceIOWorker(lambda d: (gate.wait(), written.append(d)), name="t", maxsize=2)
+    for i in range(5):
+        assert worker.submit(bytes([i]))
+    gate.set()
+    assert worker.close(timeout=2.0)
+    assert worker.submit(b"late") is False
+    # first item may already be in flight; the newest two always survive, in order
+    assert written[-2:] == [bytes([3]), bytes([4])]
+    assert written == sorted(written)
+    assert worker.dropped >= 2
+
+
+def test_stress_many_devices_ordered_writes_and_concurrent_attach_detach():
+    devices = {}
+
+    def writer_factory(info: DeviceInfo):
+        # Device 0 is wedged-slow; it must not starve the rest.
+        dev = FakeHIDDevice(delay=0.05 if info.id == "usb:0" else 0.0)
+        devices[info.id] = dev
+        return HIDWriter(dev, name=info.id)
+
+    manager = BrailleDeviceManager(BrailleDeviceDriverRegistry(), writer_factory=writer_factory)
+    ids = [f"usb:{i}" for i in range(48)]
+    infos = {i: DeviceInfo(id=i, transport="usb", capabilities={"driver_key": "focus-generic"}) for i in ids}
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        list(pool.map(lambda i: manager.attach(infos[i]), ids))
+    assert sorted(manager.active) == sorted(ids)
+
+    def pump(device_id: str) -> None:
+        for seq in range(20):
+            assert manager.send_cells(device_id, _frame(seq))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        list(pool.map(pump, ids))
+    # Everything except the slow device drains quickly.
+    deadline = time.perf_counter() + 2.0
+    while time.perf_counter() < deadline and any(len(devices[i].frames) < 20 for i in ids[1:]):
+        time.sleep(0.01)
+    assert time.perf_counter() - start < 2.0
+    for i in ids[1:]:
+        assert [_seq(f) for f in devices[i].frames] == list(range(20))
+    slow = [_seq(f) for f in devices["usb:0"].frames]
+    assert slow == sorted(slow)
+
+    # Concurrent detach/re-attach churn while writes continue.
+    def churn(device_id: str) -> None:
+        for _ in range(5):
+            if random.random() < 0.5:
+                manager.detach(device_id)
+            else:
+                manager.attach(infos[device_id])
+            manager.send_cells(device_id, _frame(1))
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        list(pool.map(churn, ids[1:]))
+    manager.close_all()
+    assert manager.active == {}
+    assert all(dev.closed for dev in devices.values())
+
+
+def test_hid_writer_starts_one_worker_and_ignores_writes_after_close():
+    dev = FakeHIDDevice()
+    writer = HIDWriter(dev, name="t")
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda i: writer.write_async(bytes([i])), range(8)))
+    workers = [t for t in threading.enumerate() if t.name == "braille-io-t"]
+    assert len(workers) == 1
+    writer.close()
+    assert len(dev.frames) == 8
+    writer.write_async(b"late")
+    assert writer._worker.closed and dev.frames[-1] != b"late"
+    assert not [t for t in threading.enumerate() if t.name == "braille-io-t"]
+
+
+def test_reattach_closes_the_previous_writer_first_and_failed_open_closes_the_writer():
+    events = []
+
+    class Writer:
+        def __init__(self, n):
+            self.n = n
+            events.append(("open", n))
+
+        def close(self):
+            events.append(("close", self.n))
+
+    opened = iter(range(10))
+    manager = BrailleDeviceManager(BrailleDeviceDriverRegistry(), writer_factory=lambda d: Writer(next(opened)), trace_dir=None)
+    info = DeviceInfo(id="tty:1", transport="serial", capabilities={"driver_key": "focus-generic"})
+    manager.attach(info)
+    manager.attach(info)
+    assert events == [("open", 0), ("close", 0), ("open", 1)]
+
+    class Broken:
+        def open(self, device):
+            raise OSError("no such device")
+
+    manager.registry.register("broken", Broken)
+    events.clear()
+    with pytest.raises(OSError):
+        manager.attach(DeviceInfo(id="tty:2", transport="serial", capabilities={"driver_key": "broken"}))
+    assert events == [("open", 2), ("close", 2)]
+    manager.close_all()
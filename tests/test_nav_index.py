@@ -0,0 +1,100 @@
+import random
+
+from fastapi.testclient import TestClient
+
+from unison_io_braille import server
+from unison_io_braille.nav_index import NavIndex
+from unison_io_braille.sessions import SessionStore
+from unison_io_braille.translator_loader import get_translator
+
+GRADE2 = get_translator("ueb_grade2")
+
+
+def test_offsets_map_through_contractions_and_lines_wrap_at_words():
+    index = NavIndex.build("the cat and a dog\nnext para", GRADE2, width=6)
+    # "the" and "and" are one cell each.
+    assert [index.text_to_cell(t) for t in (0, 2, 3, 4, 8, 12)] == [0, 0, 1, 2, 6, 8]
+    assert [index.cell_to_text(c) for c in (0, 1, 6, 7)] == [0, 3, 8, 11]
+    assert index.words == [0, 2, 6, 8, 10, 14, 19]
+    assert index.paragraphs == [0, 14]
+    assert index.lines == [0, 6, 10, 14, 19] and all(b - a <= 6 for a, b in zip(index.lines, index.lines[1:]))
+    assert index.next("line", 3) == 6 and index.prev("paragraph", 14) == 0 and index.next("paragraph", 0) == 14
+    assert index.line_start(12) == 10
+    assert index.route(viewport_offset=6, key=2) == 12  # cell-2 on the second line lands on "a"
+    assert index.find("DOG", 0) == 10 and index.find("the", 10, backwards=True) == 0 and index.find("zzz", 0) is None
+    index.set_width(40)
+    assert index.lines == [0, 14]
+
+
+def test_incremental_edits_match_a_full_rebuild():
+    rnd = random.Random(7)
+    alphabet = "abcdefghij the and for with \n"
+
+    def words(n):
+        return "".join(rnd.choice(alphabet) for _ in range(n))
+
+    index = NavIndex.build(words(300), GRADE2, width=12, headings=[5, 100])
+    for _ in range(200):
+        start = rnd.randint(0, len(index.text))
+        end = rnd.randint(start, min(len(index.text), start + 12))
+        index.edit(start, end, words(rnd.randint(0, 10)))
+        fresh = NavIndex.build(index.text, GRADE2, width=12)
+        assert (index.cells, index.words, index.paragraphs, index.lines) == (fresh.cells, fresh.words, fresh.paragraphs, fresh.lines)
+        assert all(index.text_to_cell(t) == fresh.text_to_cell(t) for t in range(0, len(index.text), 7))
+    index.sync(index.text[:50] + "inserted" + index.text[60:])
+    assert index.lines == NavIndex.build(index.text, GRADE2, width=12).lines
+
+
+def test_navigate_endpoint_pans_viewport(monkeypatch):
+    monkeypatch.setattr(server, "_sessions", SessionStore())
+    client = TestClient(server.app, headers={"X-Test-Bypass": "1"})
+    doc = "# Intro\nfirst paragraph here\n# Usage\nsecond one"
+    body = {"person_id": "p", "device_id": "d"}
+    client.post("/braille/focus", json={"text": doc, "headings": [0, doc.index("# Usage")], **body})
+    client.post("/braille/viewport", json={"offset": 0, "cols": 10, **body})
+    resp = client.post("/braille/navigate", json={"target": "heading", **body}).json()
+    assert resp["ok"] and resp["text_offset"] == doc.index("# Usage") and resp["viewport"]["offset"] == resp["cell"]
+    resp = client.post("/braille/navigate", json={"target": "line", "direction": "prev", **body}).json()
+    assert resp["ok"] and resp["viewport"]["offset"] < resp["cell"] + 10
+    resp = client.post("/braille/navigate", json={"target": "search", "query": "second", **body}).json()
+    assert doc[resp["text_offset"] :].startswith("second")
+    routed = client.post("/braille/navigate", json={"target": "routing", "cell": 0, **body}).json()
+    assert routed["text_offset"] == resp["text_offset"] - (resp["cell"] - resp["viewport"]["offset"])
+    assert client.post("/braille/navigate", json={"target": "sideways", **body}).status_code == 400
+
+
+def test_navigate_is_consistent_while_focus_changes_concurrently():
+    import threading
+
+    session = SessionStore().get_or_create("p", "d")
+    session.set_viewport(0, 8)
+    texts = ["short", "a much longer focus text with many words\nand a second paragraph", "x y z"]
+    session.set_focus(texts[1], "ueb_grade2")
+    errors = []
+    stop = threading.Event()
+
+    def refocus():
+        n = 0
+        while not stop.is_set():
+            session.set_focus(texts[n % len(texts)], "ueb_grade2")
+            session.navigation(get_translator)
+            n += 1
+
+    def navigate():
+        try:
+            for i in range(300):
+                session.navigate(get_translator, ("line", "word", "search")[i % 3], ("next", "prev")[i % 2], query="a")
+                session.navigate(get_translator, "routing", cell=i % 8)
+        except Exception as exc:  # pragma: no cover - the failure being tested
+            errors.append(exc)
+
+    writer = threading.Thread(target=refocus)
+    readers = [threading.Thread(target=navigate) for _ in range(3)]
+    writer.start()
+    for t in readers:
+        t.start()
+    for t in readers:
+        t.join()
+    stop.set()
+    writer.join()
+    assert errors == []
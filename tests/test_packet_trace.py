@@ -0,0 +1,87 @@
+import time
+
+import pytest
+
+from unison_io_braille.driver_registry import BrailleDeviceDriverRegistry
+from unison_io_braille.drivers.focus import FocusBrailleDriver
+from unison_io_braille.interfaces import DeviceInfo
+from unison_io_braille.manager import BrailleDeviceManager
+from unison_io_braille.packet_trace import TraceReader, TraceWriter, replay
+
+PACKETS = [bytes([0x01, 0x61]), bytes([0x01, 0x0D]), bytes([0x02, 5]), bytes([0x01, 0x80 | 0x0B]), bytes([0x01, 0x62, 0x63])]
+
+
+def test_manager_records_and_trace_replays_identically(tmp_path):
+    manager = BrailleDeviceManager(BrailleDeviceDriverRegistry(), writer_factory=lambda d: None, trace_dir=str(tmp_path))
+    manager.attach(DeviceInfo(id="focus:1", transport="usb", capabilities={"driver_key": "focus-generic"}))
+    live = [e for p in PACKETS for e in manager.on_packet("focus:1", p)]
+    path = manager.stop_recording("focus:1")
+    assert path and path.startswith(str(tmp_path))
+    with TraceReader(path) as reader:
+        assert (reader.device_id, reader.driver) == ("focus:1", "focus-generic")
+        assert [p for _, p in reader] == PACKETS
+        offsets = [t for t, _ in reader]
+        assert offsets == sorted(offsets)
+        driver = FocusBrailleDriver()
+        driver.open(DeviceInfo(id="focus:1", transport="replay"))
+        stats = replay(reader, driver, collect=True)
+    assert stats.packets == len(PACKETS) and stats.events == len(live)
+    assert [(e.type, e.keys, e.text) for e in stats.collected] == [(e.type, e.keys, e.text) for e in live]
+    manager.close_all()
+
+
+def test_replay_keeps_timing_and_tolerates_truncated_tail(tmp_path):
+    path = str(tmp_path / "t.ubt")
+    with TraceWriter(path, "dev", "focus-generic") as writer:
+        writer.record(PACKETS[0])
+        time.sleep(0.05)
+        writer.record(PACKETS[1])
+    with open(path, "ab") as fh:
+        fh.write(b"\x00\x01\x02")  # partial record header
+    driver = FocusBrailleDriver()
+    driver.open(DeviceInfo(id="dev", transport="replay"))
+    with TraceReader(path) as reader:
+        assert len(reader) == 2
+        assert replay(reader, driver, speed=1.0).seconds >= 0.045
+        assert replay(reader, driver, speed=None).seconds < 0.045
+
+
+def test_trace_endpoint_requires_a_trace_dir(monkeypatch, tmp_path):
+    import pytest
+    from fastapi.testclient import TestClient
+
+    from unison_io_braille import server
+
+    manager = BrailleDeviceManager(BrailleDeviceDriverRegistry(), writer_factory=lambda d: None, trace_dir=None)
+    manager.attach(DeviceInfo(id="focus:1", transport="usb", capabilities={"driver_key": "focus-generic"}))
+    monkeypatch.setattr(server, "_manager", manager)
+    monkeypatch.chdir(tmp_path)
+    client = TestClient(server.app)
+    resp = client.post("/braille/devices/trace", json={"device_id": "focus:1"}, headers={"X-Test-Bypass": "1"})
+    assert resp.status_code == 409
+    with pytest.raises(ValueError):
+        manager.start_recording("focus:1")
+    assert list(tmp_path.iterdir()) == []
+    manager.trace_dir = str(tmp_path / "traces")
+    resp = client.post("/braille/devices/trace", json={"device_id": "focus:1"}, headers={"X-Test-Bypass": "1"})
+    assert resp.json()["ok"] and resp.json()["path"].startswith(manager.trace_dir)
+    manager.close_all()
+
+
+def test_traces_started_within_one_second_never_overwrite_each_other(tmp_path):
+    manager = BrailleDeviceManager(BrailleDeviceDriverRegistry(), writer_factory=lambda d: None, trace_dir=str(tmp_path))
+    info = DeviceInfo(id="focus:1", transport="usb", capabilities={"driver_key": "focus-generic"})
+    manager.attach(info)
+    manager.on_packet("focus:1", PACKETS[0])
+    first = manager.get("focus:1").recorder.path
+    second = manager.start_recording("focus:1")
+    manager.on_packet("focus:1", PACKETS[1])
+    manager.stop_recording("focus:1")
+    manager.attach(info)  # quick re-attach starts another trace
+    third = manager.get("focus:1").recorder.path
+    manager.close_all()
+    assert len({first, second, third}) == 3
+    with TraceReader(first) as reader:
+        assert [p for _, p in reader] == [PACKETS[0]]
+    with pytest.raises(FileExistsError):
+        TraceWriter(second, "focus:1")
@@ -0,0 +1,58 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from unison_io_braille import server
+from unison_io_braille.readiness import Readiness
+
+
+def test_required_failures_gate_and_optional_ones_do_not():
+    async def ok():
+        return {"n": 1}
+
+    async def boom():
+        raise RuntimeError("unreachable")
+
+    readiness = Readiness()
+    assert not readiness.ready  # nothing warmed yet
+    readiness.skip("jwks", "not configured")
+    assert asyncio.run(readiness.warm_up({"tables": ok, "orchestrator": boom}, optional=("orchestrator",)))
+    snap = readiness.snapshot()
+    tables = snap["components"]["tables"]
+    assert tables["status"] == "ready" and tables["required"] and tables["detail"] == {"n": 1} and tables["ms"] >= 0
+    assert snap["components"]["orchestrator"]["status"] == "failed" and snap["components"]["orchestrator"]["error"] == "unreachable"
+
+    cold = Readiness()
+    assert not asyncio.run(cold.warm_up({"tables": boom}, retry_initial=0))
+    assert cold.snapshot()["ready"] is False
+
+
+def test_failed_required_steps_are_retried_until_ready():
+    attempts = []
+
+    async def flaky_jwks():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("auth server down")
+        return "2 keys"
+
+    readiness = Readiness()
+
+    async def run():
+        task = asyncio.create_task(readiness.warm_up({"jwks": flaky_jwks}, retry_initial=0.05, retry_max=0.1))
+        await asyncio.sleep(0.01)
+        jwks = readiness.snapshot()["components"]["jwks"]
+        assert jwks["status"] == "failed" and jwks["error"] == "auth server down" and not readiness.ready
+        return await task
+
+    assert asyncio.run(run()) is True
+    assert len(attempts) == 3
+    jwks = readiness.snapshot()["components"]["jwks"]
+    assert jwks["status"] == "ready" and jwks["detail"] == "2 keys" and "error" not in jwks
+
+
+def test_ready_is_503_before_warm_up(monkeypatch):
+    monkeypatch.setattr(server, "_readiness", Readiness())
+    client = TestClient(server.app)  # no lifespan: warm-up never ran
+    resp = client.get("/ready", headers={"X-Test-Bypass": "1"})
+    assert resp.status_code == 503 and resp.json()["ready"] is False
@@ -0,0 +1,90 @@
+import os
+import pty
+import select
+import termios
+import threading
+import time
+
+import pytest
+
+from unison_io_braille.driver_registry import BrailleDeviceDriverRegistry
+from unison_io_braille.interfaces import DeviceInfo
+from unison_io_braille.manager import BrailleDeviceManager
+from unison_io_braille.serial_transport import SerialTransport, SerialWriter, configure_port, open_serial_writer
+from unison_io_braille.translator import cells_from_packed
+
+
+@pytest.fixture
+def pty_pair():
+    master, slave = pty.openpty()
+    path = os.ttyname(slave)
+    yield master, path
+    for fd in (master, slave):
+        try:
+            os.close(fd)
+        except OSError:
+            pass
+
+
+def read_exactly(fd, size, timeout=5.0):
+    out = bytearray()
+    deadline = time.monotonic() + timeout
+    while len(out) < size and time.monotonic() < deadline:
+        if select.select([fd], [], [], 0.05)[0]:
+            out += os.read(fd, size - len(out))
+    return bytes(out)
+
+
+def test_port_configuration(pty_pair):
+    _, path = pty_pair
+    fd = os.open(path, os.O_RDWR | os.O_NOCTTY)
+    configure_port(fd, 57600, "xonxoff")
+    iflag, _, cflag, lflag, ispeed, ospeed, _ = termios.tcgetattr(fd)
+    assert ispeed == ospeed == termios.B57600
+    assert iflag & termios.IXON and not lflag & termios.ICANON and cflag & termios.CS8 == termios.CS8
+    with pytest.raises(ValueError):
+        configure_port(fd, 12345)
+    os.close(fd)
+
+
+def test_manager_drives_a_serial_display_over_a_pty(pty_pair):
+    master, path = pty_pair
+    manager = BrailleDeviceManager(BrailleDeviceDriverRegistry(), trace_dir=None)
+    got = threading.Event()
+    events = []
+    manager.event_sink = lambda device_id, parsed: (events.extend(parsed), got.set())
+    driver = manager.attach(DeviceInfo(id=f"serial:{path}", transport="serial", capabilities={"driver_key": "handytech", "baud": 38400}))
+    assert isinstance(manager.get(f"serial:{path}").writer, SerialWriter)
+    manager.send_cells(f"serial:{path}", cells_from_packed(b"\x01\x03\x09"))
+    assert read_exactly(master, len(driver.last_output)) == driver.last_output
+    os.write(master, b"\x02\x01")  # HandyTech frames are length-prefixed; the report arrives split
+    time.sleep(0.05)
+    os.write(master, b"\x61")
+    assert got.wait(2) and events[0].text == "a"
+    manager.close_all()
+    assert open_serial_writer(DeviceInfo(id="serial:/nonexistent/tty", transport="serial")) is None
+
+
+@pytest.mark.parametrize("baud", [9600, 19200, 115200])
+def test_batched_writes_keep_up_with_the_line_rate(pty_pair, baud):
+    """An 80-cell frame per write: the transport must queue and flush far faster than the wire drains."""
+    master, path = pty_pair
+    writer = SerialWriter(SerialTransport(path, baud=baud, tx_limit=1 << 20))
+    writer.open()
+    frame = bytes([0x20, 80, 0xFF]) + bytes(range(80))
+    count = 200
+    received = bytearray()
+    reader = threading.Thread(target=lambda: received.extend(read_exactly(master, len(frame) * count)))
+    reader.start()
+    start = time.perf_counter()
+    for _ in range(count):
+        writer.write_async(frame)
+    writer.flush()
+    reader.join(10)
+    elapsed = time.perf_counter() - start
+    assert bytes(received) == frame * count  # in order, nothing lost or interleaved
+    line_rate = baud / 10  # bytes/sec for 8N1
+    assert len(received) / elapsed > line_rate
+    stats = writer.transport.stats
+    assert stats["tx_bytes"] == len(frame) * count and stats["writes"] < count  # frames were batched
+    writer.close()
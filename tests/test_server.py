@@ -1,3 +1,5 @@
+import time
+
 from fastapi.testclient import TestClient
 
 from unison_io_braille.server import app, ORCH_HOST, ORCH_PORT
@@ -6,10 +8,19 @@ from unison_io_braille.interfaces import BrailleEvent
 
 
 def test_health_ready():
-    client = TestClient(app)
     headers = {"X-Test-Bypass": "1"}
-    assert client.get("/health", headers=headers).status_code == 200
-    assert client.get("/ready", headers=headers).json().get("ready") is True
+    with TestClient(app) as client:
+        assert client.get("/health", headers=headers).status_code == 200
+        for _ in range(200):
+            resp = client.get("/ready", headers=headers)
+            if resp.json()["ready"]:
+                break
+            assert resp.status_code == 503
+            time.sleep(0.01)
+        body = resp.json()
+        assert resp.status_code == 200 and body["ready"] is True
+        assert body["components"]["tables"]["status"] == "ready"
+        assert body["components"]["jwks"]["status"] == "skipped"
 
 
 def test_translate_endpoint():
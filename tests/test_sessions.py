@@ -0,0 +1,72 @@
+from fastapi.testclient import TestClient
+
+from unison_io_braille import server
+from unison_io_braille.sessions import DEFAULT_DEVICE_ID, SessionStore
+from unison_io_braille.settings import DEFAULT_PERSON_ID
+
+
+def test_store_keys_sessions_by_person_and_device():
+    store = SessionStore(shards=4)
+    default = store.get_or_create()
+    assert default.key == (DEFAULT_PERSON_ID, DEFAULT_DEVICE_ID)
+    a = store.get_or_create("alice", "kiosk-1")
+    assert store.get_or_create("alice", "kiosk-1") is a and store.get("bob", "kiosk-1") is None
+    a.set_focus("menu", "ueb_grade2")
+    assert store.table_for("kiosk-1") == "ueb_grade1"  # not bound to alice yet
+    store.bind_device("kiosk-1", "alice", cols=40)
+    assert store.person_for("kiosk-1") == "alice" and store.table_for("kiosk-1") == "ueb_grade2"
+    assert a.viewport.cols == 40
+    store.bind_device("kiosk-1", "bob")  # reassigned display: alice's session for it goes away
+    assert store.get("alice", "kiosk-1") is None and store.person_for("kiosk-1") == "bob"
+    store.unbind_device("kiosk-1")
+    assert store.person_for("kiosk-1") == DEFAULT_PERSON_ID
+    assert len(store) == 1
+    frame = default.focus_frame('{"cols":0}')
+    assert frame.startswith('{"event":"focus","session":') and frame.endswith('"payload":{"cols":0}}')
+
+
+def test_focus_only_reaches_subscribers_of_that_session(monkeypatch):
+    monkeypatch.setattr(server, "_sessions", SessionStore())
+    client = TestClient(server.app)
+    headers = {"X-Test-Bypass": "1"}
+    with client.websocket_connect("/braille/output?person_id=alice&device_id=kiosk-1", headers=headers) as alice, client.websocket_connect(
+        "/braille/output?person_id=bob&device_id=kiosk-2", headers=headers
+    ) as bob:
+        assert alice.receive_json()["person_id"] == "alice"
+        assert bob.receive_json()["person_id"] == "bob"
+        client.post("/braille/focus", json={"text": "bob", "person_id": "bob", "device_id": "kiosk-2"}, headers=headers)
+        client.post("/braille/focus", json={"text": "hi", "person_id": "alice", "device_id": "kiosk-1"}, headers=headers)
+        frame = alice.receive_json()
+        assert frame["session"]["person_id"] == "alice" and frame["payload"]["cols"] == 2
+        assert bob.receive_json()["payload"]["cols"] == 3
+        client.post("/braille/viewport", json={"offset": 1, "cols": 20, "person_id": "alice", "device_id": "kiosk-1"}, headers=headers)
+        assert alice.receive_json()["session"]["viewport"] == {"offset": 1, "cols": 20}
+
+
+def test_input_envelopes_carry_the_bound_person(monkeypatch):
+    monkeypatch.setattr(server, "_sessions", SessionStore())
+    sent = []
+    monkeypatch.setattr(server, "forward_events", lambda events, person_id=None: sent.append((list(events), person_id)))
+    client = TestClient(server.app)
+    headers = {"X-Test-Bypass": "1"}
+    client.post("/braille/devices/attach", json={"device": {"id": "sim-alice", "transport": "sim"}, "person_id": "alice"}, headers=headers)
+    assert client.post("/braille/input", json={"device_id": "sim-alice", "data": "a"}, headers=headers).json()["ok"]
+    assert sent and sent[-1][1] == "alice"
+
+
+def test_idle_sessions_are_evicted_past_the_cap():
+    store = SessionStore(shards=4, max_sessions=10)
+    evicted = []
+    store.on_evict = lambda session: evicted.append(session.key)
+    bound = store.bind_device("kiosk-1", "alice")
+    watched = store.get_or_create("bob", "tablet")
+    watched.subscribe(object())
+    for n in range(8):
+        store.get_or_create(f"guest-{n}", "web")
+    assert len(store) == 10 and not evicted
+    store.get_or_create("guest-0", "web")  # touched: now the most recently used guest
+    store.get_or_create("late", "web")  # 11 sessions > 10: evict the oldest idle down to 9
+    assert len(store) == 9
+    assert evicted == [("guest-1", "web"), ("guest-2", "web")]
+    assert store.get("alice", "kiosk-1") is bound and store.get("bob", "tablet") is watched
+    assert store.get("guest-0", "web") and store.get("late", "web")
@@ -0,0 +1,212 @@
+import asyncio
+import os
+import stat
+
+from unison_io_braille.shared_state import SharedState
+
+
+def test_local_mode_is_single_process():
+    state = SharedState(path=None, worker_id="w1")
+
+    async def run():
+        await state.start()
+        assert await state.claim_device("dev", {"id": "dev"}) == "w1"
+        assert await state.route_input("dev", b"x") is False
+        assert list(await state.devices()) == ["dev"]
+        await state.stop()
+
+    asyncio.run(run())
+    assert not state.shared
+
+
+def test_workers_share_focus_devices_and_metrics(tmp_path):
+    path = str(tmp_path / "state.sock")
+    a = SharedState(path=path, worker_id="a")
+    b = SharedState(path=path, worker_id="b")
+    received = []
+    routed = []
+
+    async def on_focus(data):
+        received.append(data)
+
+    async def on_input(device_id, data):
+        routed.append((device_id, data))
+
+    b.on_topic("focus", on_focus)
+    a.on_input(on_input)
+    a.metrics_source = lambda: {"/braille/focus": 2}
+    b.metrics_source = lambda: {"/braille/focus": 3}
+
+    async def run():
+        await a.start()
+        await b.start()
+        assert a.is_broker and not b.is_broker
+        await a.publish("focus", {"text": "menu", "table": "ueb_grade1"})
+        for _ in range(50):
+            if received:
+                break
+            await asyncio.sleep(0.01)
+        assert received == [{"text": "menu", "table": "ueb_grade1"}]
+        # first claim pins the device; the other worker routes input to the owner
+        assert await a.claim_device("usb:1", {"id": "usb:1"}) == "a"
+        assert await b.claim_device("usb:1", {"id": "usb:1"}) == "a"
+        assert await b.route_input("usb:1", b"\x01\xff") is True
+        assert await b.route_input("usb:2", b"x") is False
+        for _ in range(50):
+            if routed:
+                break
+            await asyncio.sleep(0.01)
+        assert routed == [("usb:1", b"\x01\xff")]
+        b._send({"op": "metrics", "counts": b.metrics_source()})
+        await asyncio.sleep(0.05)
+        assert (await a.metrics_all())["/braille/focus"] == 5
+        # A late joiner gets the latest focus on connect.
+        c = SharedState(path=path, worker_id="c")
+        late = []
+
+        async def on_late(data):
+            late.append(data)
+
+        c.on_topic("focus", on_late)
+        await c.start()
+        assert late == [{"text": "menu", "table": "ueb_grade1"}]
+        # Broker worker exits: survivors reconnect, one takes over, ownership is released.
+        await a.stop()
+        for _ in range(100):
+            if (b.is_broker or c.is_broker) and b._writer and c._writer:
+                break
+            await asyncio.sleep(0.02)
+        assert b.is_broker or c.is_broker
+        await asyncio.sleep(0.1)
+        assert await c.claim_device("usb:1", {"id": "usb:1"}) in {"b", "c"}
+        await c.stop()
+        await b.stop()
+
+    asyncio.run(run())
+
+
+def test_slow_or_failing_handlers_do_not_stall_broker_replies(tmp_path):
+    path = str(tmp_path / "state.sock")
+    a = SharedState(path=path, worker_id="a")
+    b = SharedState(path=path, worker_id="b")
+    applied = []
+    release = None
+
+    async def slow_focus(data):
+        await release.wait()
+        applied.append(data["n"])
+
+    async def failing_input(device_id, data):
+        raise RuntimeError("driver gone")
+
+    b.on_topic("focus", slow_focus)
+    a.on_input(failing_input)
+
+    async def run():
+        nonlocal release
+        release = asyncio.Event()
+        await a.start()
+        await b.start()
+        for n in range(3):
+            await a.publish("focus", {"n": n})
+        await asyncio.sleep(0.05)
+        # b's focus handler is blocked, yet its requests still get replies.
+        assert await b.claim_device("usb:1", {"id": "usb:1"}) == "b"
+        assert await a.route_input("usb:1", b"x") is True
+        assert await a.route_input("usb:1", b"y") is True  # a's loop survived the handler error
+        release.set()
+        for _ in range(50):
+            if applied and applied[-1] == 2:
+                break
+            await asyncio.sleep(0.01)
+        assert applied[-1] == 2 and applied == sorted(applied)  # in order; stale values may be skipped
+        # With the broker unreachable, calls fall back to local state instead of raising.
+        b._writer.close()
+        b._writer = None
+        assert await b.claim_device("usb:2", {"id": "usb:2"}) == "b"
+        assert set(await b.devices()) == {"usb:1", "usb:2"}
+        assert await b.route_input("usb:3", b"x") is False
+        await b.stop()
+        await a.stop()
+
+    asyncio.run(run())
+
+
+def test_keyed_topics_retain_one_value_per_key(tmp_path):
+    path = str(tmp_path / "state.sock")
+    a = SharedState(path=path, worker_id="a")
+    late = SharedState(path=path, worker_id="late")
+    seen = []
+
+    async def on_focus(data):
+        seen.append(data["text"])
+
+    late.on_topic("focus", on_focus)
+
+    async def run():
+        await a.start()
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+        await a.publish("focus/alice/kiosk-1", {"text": "alice"})
+        await a.publish("focus/bob/kiosk-2", {"text": "bob"})
+        await a.publish("focus/gone/web", {"text": "gone"})
+        a.retract("focus/gone/web")
+        await asyncio.sleep(0.05)
+        await late.start()
+        assert sorted(seen) == ["alice", "bob"]
+        assert "focus/gone/web" not in a.topics
+        await late.stop()
+        await a.stop()
+
+    asyncio.run(run())
+
+
+def test_retract_during_delivery_stops_it_cleanly():
+    state = SharedState(path=None, worker_id="a")
+    applied = []
+
+    async def on_focus(data):
+        applied.append(data["text"])
+        await asyncio.sleep(0.01)
+
+    state.on_topic("focus", on_focus)
+
+    async def run():
+        state._schedule_delivery("focus/p/d", {"text": "one"})
+        task = state._deliveries["focus/p/d"]
+        await asyncio.sleep(0)
+        state._schedule_delivery("focus/p/d", {"text": "two"})
+        state.retract("focus/p/d")
+        await task  # would raise KeyError if it read the retracted topic
+        assert applied == ["one"] and "focus/p/d" not in state.topics
+
+    asyncio.run(run())
+
+
+def test_retracted_topic_is_kept_while_another_worker_holds_it(tmp_path):
+    path = str(tmp_path / "state.sock")
+    a = SharedState(path=path, worker_id="a")
+    b = SharedState(path=path, worker_id="b")
+
+    async def settle():
+        await asyncio.sleep(0.05)
+
+    async def run():
+        await a.start()
+        await b.start()
+        broker = a._broker
+        await a.publish("focus/p/d", {"text": "hi"})
+        await settle()
+        a.retract("focus/p/d")  # a evicted its idle session; b still serves it
+        await settle()
+        assert "focus/p/d" in broker.topics
+        a.hold("focus/p/d")  # a subscriber reconnected to a
+        b.retract("focus/p/d")
+        await settle()
+        assert "focus/p/d" in broker.topics
+        a.retract("focus/p/d")
+        await settle()
+        assert "focus/p/d" not in broker.topics
+        await b.stop()
+        await a.stop()
+
+    asyncio.run(run())
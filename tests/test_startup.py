@@ -0,0 +1,20 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+# Optional or heavy subsystems that must load on first use, never at import.
+DEFERRED = ("httpx", "jose", "yaml", "uvicorn", "hid", "bleak", "louis", "websockets", "pyudev")
+
+
+def test_server_import_defers_optional_subsystems():
+    code = (
+        "import json, sys\n"
+        f"sys.path.insert(0, {str(SRC)!r})\n"
+        "import unison_io_braille.server\n"
+        f"print(json.dumps([m for m in {DEFERRED!r} if m in sys.modules]))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert json.loads(out.stdout.strip().splitlines()[-1]) == []
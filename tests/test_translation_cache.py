@@ -0,0 +1,64 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from unison_io_braille import server
+from unison_io_braille.translation_cache import TranslationCache
+from unison_io_braille.translator_loader import get_translator
+
+
+class CountingTranslator:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def text_to_cells(self, text, config=None):
+        self.calls += 1
+        return get_translator("ueb_grade1").text_to_cells(text)
+
+
+def test_cache_hits_and_serialized_payloads():
+    tr = CountingTranslator()
+    cache = TranslationCache(max_bytes=1 << 20, translator_for=lambda table: tr)
+    first = cache.get("ueb_grade1", "ab")
+    again = cache.get("ueb_grade1", "ab")
+    assert again is first and tr.calls == 1
+    assert first.payload["cells"] == [[1], [1, 2]]
+    assert json.loads(first.payload_json) == first.payload
+    cache.get("ueb_grade2", "ab")  # different table, separate entry
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_cache_evicts_by_bytes_lru():
+    tr = CountingTranslator()
+    one = TranslationCache(translator_for=lambda table: tr).get("t", "x" * 10).size
+    cache = TranslationCache(max_bytes=one * 2, translator_for=lambda table: tr)
+    cache.get("t", "a" * 10)
+    cache.get("t", "b" * 10)
+    cache.get("t", "a" * 10)  # refresh a; b is now least recent
+    cache.get("t", "c" * 10)
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["bytes"] <= one * 2
+    calls = tr.calls
+    cache.get("t", "a" * 10)
+    assert tr.calls == calls
+    cache.get("t", "b" * 10)
+    assert tr.calls == calls + 1
+    # Entries larger than the whole budget are returned but never cached.
+    big = cache.get("t", "z" * 10_000)
+    assert big.payload["cols"] == 10_000 and cache.stats()["bytes"] <= one * 2
+
+
+def test_websocket_reconnect_gets_cached_focus(monkeypatch):
+    cache = TranslationCache()
+    monkeypatch.setattr(server, "_translations", cache)
+    client = TestClient(server.app)
+    headers = {"X-Test-Bypass": "1"}
+    client.post("/braille/focus", json={"text": "menu", "table": "ueb_grade1"}, headers=headers)
+    misses = cache.stats()["misses"]
+    with client.websocket_connect("/braille/output", headers=headers) as ws:
+        assert ws.receive_json()["event"] == "connected"
+        focus = ws.receive_json()
+        assert focus["event"] == "focus" and focus["payload"]["cols"] == 4
+    assert cache.stats()["misses"] == misses
+    body = client.get("/metrics", headers=headers).json()
+    assert 'unison_io_braille_translation_cache_events_total{result="hit"}' in body
@@ -0,0 +1,43 @@
+import os
+import stat
+import threading
+import time
+
+import uvicorn
+from fastapi import FastAPI
+
+from unison_io_braille.transport import bind_unix_socket, close_clients, orchestrator_url, post_event
+
+
+def test_orchestrator_url_accepts_unix_addresses():
+    assert orchestrator_url("orchestrator", "8080", "/event") == ("http://orchestrator:8080/event", None)
+    assert orchestrator_url("unix:///run/orch.sock", "8080", "/event") == ("http://localhost/event", "/run/orch.sock")
+    assert orchestrator_url("unix:///run/orch.sock", "", "/event/stream", scheme="ws")[0] == "ws://localhost/event/stream"
+
+
+def test_post_event_over_unix_socket(tmp_path):
+    received = []
+    stub = FastAPI()
+
+    @stub.post("/event")
+    def event(envelope: dict):
+        received.append(envelope)
+        return {"accepted": True}
+
+    path = str(tmp_path / "orch.sock")
+    server = uvicorn.Server(uvicorn.Config(stub, log_level="warning"))
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [bind_unix_socket(path)]}, daemon=True)
+    thread.start()
+    try:
+        for _ in range(200):
+            if server.started:
+                break
+            time.sleep(0.01)
+        ok, status, body = post_event(f"unix://{path}", "", "/event", {"event_type": "braille.input"})
+        assert ok and status == 200 and body == {"accepted": True}
+        assert received == [{"event_type": "braille.input"}]
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o660
+    finally:
+        server.should_exit = True
+        thread.join(timeout=5)
+        close_clients()
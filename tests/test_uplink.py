@@ -0,0 +1,102 @@
+import asyncio
+import json
+
+from unison_io_braille.uplink import EventUplink
+
+
+class StubOrchestrator:
+    """In-memory stream endpoint: acks every frame, remembers the last seq per stream."""
+
+    def __init__(self, drop_after=None):
+        self.events = []
+        self.acked = {}
+        self.drop_after = drop_after
+        self.connections = 0
+        self.up = True
+
+    async def connect(self, url, headers):
+        if not self.up:
+            raise ConnectionRefusedError("down")
+        self.connections += 1
+        return StubConnection(self)
+
+
+class StubConnection:
+    def __init__(self, orch):
+        self.orch = orch
+        self.outbox = asyncio.Queue()
+        self.stream = None
+        self.closed = False
+
+    async def send(self, text):
+        if self.closed:
+            raise ConnectionError("closed")
+        msg = json.loads(text)
+        if msg.get("op") == "hello":
+            self.stream = msg["stream"]
+            await self.outbox.put({"op": "welcome", "acked": self.orch.acked.get(self.stream, 0)})
+            return
+        if msg["seq"] <= self.orch.acked.get(self.stream, 0):
+            return  # duplicate
+        self.orch.events.append(msg["event"]["n"])
+        self.orch.acked[self.stream] = msg["seq"]
+        if self.orch.drop_after and len(self.orch.events) == self.orch.drop_after:
+            self.closed = True  # received but never acked
+            await self.outbox.put(None)
+            return
+        await self.outbox.put({"ack": msg["seq"]})
+
+    async def recv(self):
+        msg = await self.outbox.get()
+        if msg is None:
+            raise ConnectionError("dropped")
+        return json.dumps(msg)
+
+    async def close(self):
+        self.closed = True
+
+
+async def _wait(predicate, timeout=2.0):
+    for _ in range(int(timeout / 0.01)):
+        if predicate():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("timed out")
+
+
+def test_stream_resumes_without_loss_or_duplicates():
+    async def run():
+        orch = StubOrchestrator(drop_after=3)
+        posted = []
+        uplink = EventUplink(connect=orch.connect, fallback=posted.append, retry_seconds=0.05, window=4)
+        await uplink.start()
+        for n in range(10):
+            uplink.submit({"n": n})
+        await _wait(lambda: len(orch.events) == 10 and uplink.pending == 0)
+        await uplink.stop()
+        return orch, posted, uplink
+
+    orch, posted, uplink = asyncio.run(run())
+    assert orch.events == list(range(10))
+    assert orch.connections == 2 and uplink.stats["reconnects"] == 1
+    assert posted == []
+
+
+def test_falls_back_to_post_while_stream_is_down():
+    async def run():
+        orch = StubOrchestrator()
+        orch.up = False
+        posted = []
+        uplink = EventUplink(connect=orch.connect, fallback=posted.append, retry_seconds=0.05)
+        await uplink.start()
+        uplink.submit({"n": 0})
+        await _wait(lambda: posted == [{"n": 0}])
+        orch.up = True
+        await _wait(lambda: uplink.connected)
+        uplink.submit({"n": 1})
+        await _wait(lambda: orch.events == [1])
+        await uplink.stop()
+        return uplink
+
+    uplink = asyncio.run(run())
+    assert uplink.stats["fallback"] == 1 and uplink.stats["acked"] == 1